@@ -0,0 +1,96 @@
+"""
+Perfil de conexión a la base de datos.
+
+- `sqlite_options()` arma los OPTIONS de SQLite: pragmas que se aplican al abrir
+  cada conexión (init_command) y transacciones IMMEDIATE, que toman el lock de
+  escritura al empezar en vez de fallar con "database is locked" a mitad de camino.
+- WAL es opcional (`sqlite_options(wal=True)`, en settings con STOCK_SQLITE_WAL=1):
+  journal_mode=WAL queda grabado en el archivo, así que la primera conexión
+  reescribe el db.sqlite3 versionado y deja los archivos -wal y -shm al lado.
+  Conviene en un servidor con varios procesos escribiendo, no en una copia de
+  trabajo. Desactivarlo después no vuelve el archivo atrás: hace falta
+  `PRAGMA journal_mode=DELETE` a mano.
+- `ReportsRouter` manda las lecturas hechas dentro de `use_reports_db()` a la
+  réplica de reportes (alias REPORTS_DB) cuando está configurada.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+REPORTS_DB = 'reports'
+
+# Valores por defecto para la base principal
+SQLITE_PRAGMAS = {
+    # Espera (ms) antes de devolver "database is locked"
+    'busy_timeout': 5000,
+    # Páginas en caché por conexión (negativo = KiB): 64 MiB
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+# Con wal=True
+WAL_PRAGMAS = {
+    # Lectores y un escritor a la vez sin bloquearse entre sí
+    'journal_mode': 'WAL',
+    # En WAL, NORMAL no pierde integridad; solo puede perder la última transacción ante un corte de luz
+    'synchronous': 'NORMAL',
+}
+
+_use_reports = ContextVar('use_reports_db', default=False)
+
+
+def sqlite_options(pragmas=None, transaction_mode='IMMEDIATE', wal=False, **overrides):
+    """
+    OPTIONS para una base SQLite. `wal` suma WAL_PRAGMAS; `overrides` pisa
+    pragmas puntuales (p. ej. sqlite_options(query_only='ON') para la réplica de reportes).
+    """
+    pragmas = {**(SQLITE_PRAGMAS if pragmas is None else pragmas), **(WAL_PRAGMAS if wal else {}), **overrides}
+    options = {
+        'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in pragmas.items()),
+    }
+    if transaction_mode:
+        options['transaction_mode'] = transaction_mode
+    return options
+
+
+def reports_db_configured():
+    return REPORTS_DB in settings.DATABASES
+
+
+@contextmanager
+def use_reports_db():
+    """
+    Las lecturas dentro del bloque van a la réplica de reportes (si existe).
+    Se usa para consultas pesadas que toleran datos de hasta un
+    `sync_report_replica` de antigüedad. Funciona también en vistas async.
+    """
+    token = _use_reports.set(True)
+    try:
+        yield
+    finally:
+        _use_reports.reset(token)
+
+
+class ReportsRouter:
+    """
+    - Lecturas: a la réplica solo dentro de use_reports_db().
+    - Escrituras y migraciones: siempre a la base principal; la réplica es una
+      copia que se regenera con `manage.py sync_report_replica`.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_reports.get() and reports_db_configured():
+            return REPORTS_DB
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Los objetos leídos de la réplica representan las mismas filas que los de la principal
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPORTS_DB
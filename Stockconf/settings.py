@@ -2,6 +2,8 @@ from pathlib import Path
 import os
 from django.contrib.messages import constants as messages
 
+from .db import REPORTS_DB, sqlite_options
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = 'django-insecure-xem)a)qyn=_93h=okr+tm&a*@#zy^*bjywo%x^e#yj)3m$ewge'
@@ -26,9 +28,14 @@ INSTALLED_APPS = [
     'management',
     'products',
     'staff',
+    'shipping',
+    'sales',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    # Medición por petición: solo actúa con PERFORMANCE_MONITORING = True
+    'management.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,14 +66,58 @@ WSGI_APPLICATION = 'Stockconf.wsgi.application'
 
 
 # Database
+# Pragmas y modo de transacción en Stockconf/db.py; STOCK_SQLITE_WAL=1 activa WAL
+# (convierte el archivo de forma permanente). Las conexiones se reutilizan
+# durante CONN_MAX_AGE segundos (0 = una por petición) y se validan antes de usarlas.
+# Con STOCK_REPORTS_DB (ruta a una copia generada por `manage.py sync_report_replica`)
+# los reportes pesados leen de la réplica; ver Stockconf.db.use_reports_db.
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('STOCK_DB_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': sqlite_options(wal=os.environ.get('STOCK_SQLITE_WAL') == '1'),
+        'CONN_MAX_AGE': int(os.environ.get('STOCK_DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+if os.environ.get('STOCK_REPORTS_DB'):
+    DATABASES[REPORTS_DB] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['STOCK_REPORTS_DB'],
+        # Solo lectura: lo que llegue a escribirse acá se perdería en la próxima sincronización
+        'OPTIONS': sqlite_options(transaction_mode=None, query_only='ON'),
+        'CONN_MAX_AGE': int(os.environ.get('STOCK_DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # En los tests apunta a la base de prueba principal
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['Stockconf.db.ReportsRouter']
+
+
+# Cache
+# LocMem es por proceso: con varios workers la invalidación llega solo al propio
+# proceso y el resto se actualiza al vencer el TTL (STATS_CACHE_TTL).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'stockconf',
+    }
+}
+
+# Segundos que se cachean las estadísticas del panel
+STATS_CACHE_TTL = 60
+
+
+# Medición de rendimiento (management.middleware.PerformanceMiddleware)
+# Se activa con la variable de entorno STOCK_PERF_MONITORING=1; el log lo resume `manage.py perf_report`.
+
+PERFORMANCE_MONITORING = os.environ.get('STOCK_PERF_MONITORING') == '1'
+PERFORMANCE_LOG = os.path.join(BASE_DIR, 'logs', 'performance.jsonl')
+
 
 # Password validation
 
@@ -105,6 +156,16 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Hojas de ruta en PDF: caché en disco y procesos para generarlas
+MANIFEST_CACHE_DIR = os.path.join(MEDIA_ROOT, 'manifests')
+MANIFEST_WORKERS = None  # None = cantidad de CPUs
+
+# Ubicación del local (lat, lng): de acá salen los recorridos de reparto (shipping/routing.py)
+STORE_LOCATION = (
+    float(os.environ.get('STOCK_STORE_LAT', -34.6037)),
+    float(os.environ.get('STOCK_STORE_LNG', -58.3816)),
+)
+
 # Default primary key field type
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -12,6 +12,9 @@ urlpatterns = [
     path('management/', include('management.urls')),
     path('products/', include('products.urls')),
     path('staff/', include('staff.urls')),
+    path('shipping/', include('shipping.urls')),
+    path('sales/', include('sales.urls')),
+    path('jobs/', include('jobs.urls')),
 ]
 
 if settings.DEBUG:
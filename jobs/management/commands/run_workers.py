@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.models import Job
+from jobs.queue import expire_overdue, fail_or_retry, new_worker_id
+from jobs.worker import wait_for, worker_main
+
+# Cada cuánto se buscan tareas vencidas de workers que ya no existen (otro supervisor caído)
+STALE_CHECK_INTERVAL = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Levanta N procesos worker que ejecutan las tareas en cola (jobs.Job), con reintentos, "
+        "límite de tiempo por intento y reemplazo de workers caídos. Ctrl+C termina ordenadamente."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=min(os.cpu_count() or 1, 4),
+                            help="Cantidad de procesos worker.")
+        parser.add_argument('--poll', type=float, default=1.0, help="Segundos entre consultas con la cola vacía.")
+        parser.add_argument('--burst', action='store_true',
+                            help="Procesar lo que haya en cola y salir (útil en cron o pruebas).")
+        parser.add_argument('--grace', type=int, default=60,
+                            help="Segundos de gracia antes de reintentar tareas vencidas de otros supervisores.")
+        parser.add_argument('--shutdown-timeout', type=int, default=30,
+                            help="Segundos que se espera a las tareas en curso al terminar.")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency debe ser mayor que cero.")
+        self.options = options
+        # spawn: cada worker arranca con su propia conexión a la base (igual en Linux y Windows)
+        self.context = multiprocessing.get_context('spawn')
+        self.stop = self.context.Event()
+        self.workers = {}  # worker_id -> (proceso, tarea en curso, última tarea informada)
+        for _ in range(options['concurrency']):
+            self.spawn()
+        self.stdout.write(f"{options['concurrency']} workers iniciados (pid {os.getpid()}).")
+
+        def request_stop(signum, frame):
+            if not self.stop.is_set():
+                self.stdout.write("Terminando: se esperan las tareas en curso...")
+                self.stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        last_stale_check = 0.0
+        try:
+            while self.workers and not self.stop.is_set():
+                self.report_progress()
+                self.enforce_timeouts()
+                self.replace_dead_workers()
+                if time.monotonic() - last_stale_check > STALE_CHECK_INTERVAL:
+                    for job_id, worker in expire_overdue(grace=options['grace']):
+                        self.stdout.write(self.style.WARNING(f"Tarea #{job_id} vencida del worker {worker}: reintentada."))
+                    last_stale_check = time.monotonic()
+                time.sleep(0.5)
+        finally:
+            self.shutdown()
+
+    def spawn(self):
+        worker_id = new_worker_id()
+        current = self.context.Value('q', 0)
+        process = self.context.Process(
+            target=worker_main,
+            args=(worker_id, self.stop, current, self.options['poll'], self.options['burst']),
+            name=worker_id,
+            # No daemon: las tareas pueden usar su propio pool de procesos (p. ej. las hojas de ruta)
+        )
+        process.start()
+        self.workers[worker_id] = [process, current, 0]
+
+    def report_progress(self):
+        for worker_id, state in self.workers.items():
+            current = state[1].value
+            if current == state[2]:
+                continue
+            if state[2]:
+                job = Job.objects.filter(pk=state[2]).only('status', 'task', 'label', 'error').first()
+                if job is not None:
+                    self.stdout.write(f"[{worker_id}] #{job.pk} {job}: {job.get_status_display()}")
+            if current:
+                self.stdout.write(f"[{worker_id}] #{current} iniciada")
+            state[2] = current
+
+    def enforce_timeouts(self):
+        for job_id, worker_id in expire_overdue(worker_ids=list(self.workers)):
+            process = self.workers[worker_id][0]
+            self.stdout.write(self.style.WARNING(
+                f"[{worker_id}] #{job_id} superó su tiempo límite: se reinicia el worker y se reintenta la tarea."
+            ))
+            process.terminate()
+            process.join(5)
+            self.workers[worker_id][1].value = 0
+
+    def replace_dead_workers(self):
+        for worker_id, (process, current, _) in list(self.workers.items()):
+            if process.is_alive():
+                continue
+            del self.workers[worker_id]
+            if current.value:
+                # Murió con una tarea en curso: el filtro por worker evita pisar un reintento ya tomado por otro
+                fail_or_retry(
+                    Job(pk=current.value, worker=worker_id),
+                    f"El worker terminó inesperadamente (código {process.exitcode}).",
+                )
+                self.stdout.write(self.style.ERROR(f"[{worker_id}] terminó con la tarea #{current.value} en curso."))
+            if not self.options['burst'] and not self.stop.is_set():
+                self.spawn()
+
+    def shutdown(self):
+        self.stop.set()
+        processes = [process for process, _, _ in self.workers.values()]
+        wait_for(processes, self.options['shutdown_timeout'])
+        for worker_id, (process, current, _) in self.workers.items():
+            if process.is_alive():
+                process.terminate()
+                process.join(5)
+                if current.value:
+                    fail_or_retry(Job(pk=current.value, worker=worker_id), "Interrumpida al detener los workers.")
+        self.report_progress()
+        self.stdout.write("Workers detenidos.")
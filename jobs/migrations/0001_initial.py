@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100, verbose_name='Tarea')),
+                ('label', models.CharField(blank=True, max_length=200, verbose_name='Descripción')),
+                ('kwargs', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'En cola'), ('running', 'En curso'), ('done', 'Terminada'), ('failed', 'Fallida')], default='queued', max_length=10, verbose_name='Estado')),
+                ('priority', models.SmallIntegerField(default=0, help_text='Menor número = se ejecuta antes.')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3)),
+                ('timeout', models.PositiveIntegerField(default=600, help_text='Segundos por intento.')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('deadline', models.DateTimeField(blank=True, null=True)),
+                ('progress_done', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.PositiveIntegerField(blank=True, null=True)),
+                ('progress_message', models.CharField(blank=True, max_length=200)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('started', models.DateTimeField(blank=True, null=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Tarea',
+                'verbose_name_plural': 'Tareas',
+                'ordering': ['-created', '-id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['priority', 'run_after', 'id'], name='job_queued_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['deadline'], name='job_running_deadline_idx'), models.Index(fields=['-created', '-id'], name='job_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.db import connections, models, router
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    Tarea en segundo plano (ver jobs/queue.py).
+    - La toma un worker de `manage.py run_workers` con un UPDATE condicional.
+    - `deadline` es el límite de la ejecución actual: pasado ese momento se
+      considera colgada y se reintenta o se marca como fallida.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'En cola'
+        RUNNING = 'running', 'En curso'
+        DONE = 'done', 'Terminada'
+        FAILED = 'failed', 'Fallida'
+
+    task = models.CharField(max_length=100, verbose_name="Tarea")
+    label = models.CharField(max_length=200, blank=True, verbose_name="Descripción")
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED, verbose_name="Estado")
+    priority = models.SmallIntegerField(default=0, help_text="Menor número = se ejecuta antes.")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    timeout = models.PositiveIntegerField(default=600, help_text="Segundos por intento.")
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    deadline = models.DateTimeField(null=True, blank=True)
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    progress_message = models.CharField(max_length=200, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs',
+    )
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Tarea"
+        verbose_name_plural = "Tareas"
+        ordering = ['-created', '-id']
+        indexes = [
+            # Lo que recorre el worker al buscar la próxima tarea
+            models.Index(fields=['priority', 'run_after', 'id'], condition=Q(status='queued'), name='job_queued_idx'),
+            # Tareas en curso vencidas (reintento de las colgadas)
+            models.Index(fields=['deadline'], condition=Q(status='running'), name='job_running_deadline_idx'),
+            # Últimas tareas del panel
+            models.Index(fields=['-created', '-id'], name='job_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.label or f"{self.task} #{self.pk}"
+
+    @property
+    def percent(self):
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.progress_total:
+            return None
+        return min(100, int(self.progress_done * 100 / self.progress_total))
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.DONE, self.Status.FAILED)
+
+    def set_progress(self, done, total=None, message=''):
+        """
+        Guarda el avance (lo llama la tarea). Va por una conexión propia: una
+        tarea que recorre un cursor abierto (iterator()) mantiene una lectura en
+        curso y, en SQLite con WAL, esa conexión no puede escribir si otro
+        proceso escribió mientras tanto ("database is locked" sin esperar).
+        """
+        self.progress_done, self.progress_total, self.progress_message = done, total, message[:200]
+        if getattr(self, '_progress_db', None) is None:
+            self._progress_db = connections.create_connection(router.db_for_write(Job))
+        db = self._progress_db
+        table = db.ops.quote_name(self._meta.db_table)
+        with db.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET progress_done = %s, progress_total = %s, progress_message = %s WHERE id = %s",
+                [done, total, message[:200], self.pk],
+            )
+
+    def close_progress(self):
+        if getattr(self, '_progress_db', None) is not None:
+            self._progress_db.close()
+            self._progress_db = None
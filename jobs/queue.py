@@ -0,0 +1,163 @@
+"""
+Cola de tareas en la base de datos, sin broker externo.
+
+- Las tareas se declaran en <app>/tasks.py con @task y reciben el Job como
+  primer argumento (para informar avance con job.set_progress).
+- enqueue() guarda un Job; los workers de `manage.py run_workers` lo toman con
+  claim_next(), un UPDATE condicional: si dos workers eligen la misma fila,
+  solo a uno le devuelve 1 fila actualizada.
+- Un error o un intento que supera su `timeout` se reintenta con espera
+  creciente hasta `max_attempts`; después queda como fallido.
+"""
+import datetime
+import logging
+import traceback
+import uuid
+
+from django.db import connection
+from django.db.models import F, Q, Subquery
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Espera antes del reintento n: RETRY_DELAY * 2 ** (n - 1) segundos
+RETRY_DELAY = 10
+
+_registry = {}
+
+
+class UnknownTask(Exception):
+    pass
+
+
+def task(name=None, timeout=600, max_attempts=3):
+    """
+    Registra una función como tarea. `name` por defecto es "<módulo>.<función>".
+    La función recibe (job, **kwargs); kwargs tiene que ser serializable en JSON.
+    """
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        func.task_name = task_name
+        func.task_options = {'timeout': timeout, 'max_attempts': max_attempts}
+        _registry[task_name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownTask(f"No hay una tarea registrada con el nombre {name!r}")
+
+
+def enqueue(func, label='', user=None, priority=0, run_after=None, **kwargs):
+    """Encola una tarea (función decorada con @task o su nombre) y devuelve el Job."""
+    func = get_task(func) if isinstance(func, str) else func
+    options = func.task_options
+    job = Job(
+        task=func.task_name,
+        label=label[:200],
+        kwargs=kwargs,
+        priority=priority,
+        timeout=options['timeout'],
+        max_attempts=options['max_attempts'],
+        run_after=run_after or timezone.now(),
+        created_by=user if getattr(user, 'is_authenticated', False) else None,
+    )
+    job.save()
+    return job
+
+
+def new_worker_id():
+    return f"w-{uuid.uuid4().hex[:12]}"
+
+
+def claim_next(worker_id):
+    """
+    Toma la próxima tarea lista (por prioridad y antigüedad) para `worker_id`.
+    Devuelve el Job o None si no hay ninguna.
+    """
+    now = timezone.now()
+    candidate = (
+        Job.objects.filter(status=Job.Status.QUEUED, run_after__lte=now)
+        .order_by('priority', 'run_after', 'id')
+        .values('pk')[:1]
+    )
+    # El status=QUEUED del UPDATE es la garantía: si otro worker ganó la fila, no se actualiza nada
+    claimed = Job.objects.filter(pk=Subquery(candidate), status=Job.Status.QUEUED).update(
+        status=Job.Status.RUNNING,
+        worker=worker_id,
+        attempts=F('attempts') + 1,
+        started=now,
+        progress_done=0,
+        progress_total=None,
+        progress_message='',
+    )
+    if not claimed:
+        return None
+    job = Job.objects.filter(status=Job.Status.RUNNING, worker=worker_id).order_by('-started', '-id').first()
+    # La fila ya es de este worker: el límite del intento se puede fijar sin carreras
+    job.deadline = now + datetime.timedelta(seconds=job.timeout)
+    Job.objects.filter(pk=job.pk).update(deadline=job.deadline)
+    return job
+
+
+def _finish(job, **fields):
+    # Solo si el intento sigue siendo de este worker (no lo reclamó el supervisor por tiempo)
+    return Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, worker=job.worker).update(
+        finished=timezone.now(), deadline=None, **fields
+    )
+
+
+def fail_or_retry(job, error):
+    """Reencola la tarea con espera creciente o la marca como fallida si no quedan intentos."""
+    job.refresh_from_db(fields=['attempts', 'max_attempts'])
+    if job.attempts < job.max_attempts:
+        delay = RETRY_DELAY * 2 ** (job.attempts - 1)
+        return _finish(
+            job, status=Job.Status.QUEUED, error=error, worker='',
+            run_after=timezone.now() + datetime.timedelta(seconds=delay),
+        )
+    return _finish(job, status=Job.Status.FAILED, error=error)
+
+
+def run_job(job):
+    """Ejecuta la tarea y guarda el resultado o el error. Devuelve el estado final."""
+    try:
+        func = get_task(job.task)
+        result = func(job, **job.kwargs)
+    except Exception:
+        logger.exception("Falló la tarea %s (#%s, intento %s)", job.task, job.pk, job.attempts)
+        fail_or_retry(job, traceback.format_exc())
+    else:
+        _finish(job, status=Job.Status.DONE, result=result, error='')
+    finally:
+        job.close_progress()
+        # Una tarea que rompió la conexión no debe arrastrar el error a la siguiente
+        connection.close_if_unusable_or_obsolete()
+    job.refresh_from_db(fields=['status'])
+    return job.status
+
+
+def expire_overdue(worker_ids=None, grace=0):
+    """
+    Reintenta (o da por fallidas) las tareas en curso cuyo intento venció hace
+    más de `grace` segundos. Con `worker_ids` solo las de esos workers.
+    Devuelve la lista de (job_id, worker) afectados.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=grace)
+    overdue = Job.objects.filter(
+        # Sin deadline: el worker murió entre tomar la tarea y fijar el límite
+        Q(deadline__lt=cutoff) | Q(deadline__isnull=True, started__lt=cutoff - datetime.timedelta(minutes=1)),
+        status=Job.Status.RUNNING,
+    )
+    if worker_ids is not None:
+        overdue = overdue.filter(worker__in=worker_ids)
+    expired = []
+    for job in overdue:
+        fail_or_retry(job, f"Tiempo agotado: el intento {job.attempts} superó los {job.timeout} s.")
+        expired.append((job.pk, job.worker))
+    return expired
@@ -0,0 +1,46 @@
+// Avance de las tareas en segundo plano: consulta jobs:job_status hasta que terminan
+const INTERVALO_TAREAS = 2000;
+
+function actualizarTarea(elemento) {
+    fetch(elemento.dataset.statusUrl, { cache: 'no-cache', credentials: 'same-origin' })
+        .then((response) => response.ok ? response.json() : null)
+        .then((estado) => {
+            if (!estado) {
+                return;
+            }
+            const campo = (nombre) => elemento.querySelector(`[data-job="${nombre}"]`);
+            const badge = campo('status');
+            badge.textContent = estado.status_display;
+            badge.className = 'badge ' + ({ done: 'bg-success', failed: 'bg-danger', running: 'bg-primary' }[estado.status] || 'bg-secondary');
+            campo('message').textContent = estado.error || estado.message;
+            campo('count').textContent = estado.total ? `${estado.done} / ${estado.total}` : (estado.done || '');
+            const barra = campo('bar');
+            barra.style.width = `${estado.percent ?? 100}%`;
+            barra.classList.toggle('progress-bar-striped', !estado.finished && estado.percent === null);
+            barra.classList.toggle('progress-bar-animated', !estado.finished && estado.percent === null);
+            barra.classList.toggle('bg-danger', estado.status === 'failed');
+            if (estado.finished) {
+                elemento.dataset.finished = 'true';
+                // En el detalle se recarga para mostrar el resultado o la descarga
+                if (elemento.closest('[data-reload-on-finish]')) {
+                    window.location.reload();
+                }
+            }
+        })
+        .catch(() => {});
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+    const pendientes = () => document.querySelectorAll('.job-progress[data-finished="false"]');
+    if (!pendientes().length) {
+        return;
+    }
+    const temporizador = setInterval(() => {
+        const elementos = pendientes();
+        if (!elementos.length) {
+            clearInterval(temporizador);
+            return;
+        }
+        elementos.forEach(actualizarTarea);
+    }, INTERVALO_TAREAS);
+});
@@ -0,0 +1,66 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import Job
+from .queue import RETRY_DELAY, UnknownTask, claim_next, enqueue, expire_overdue, run_job, task
+
+
+@task(name='jobs.tests.add', timeout=30)
+def add(job, a, b):
+    return {'total': a + b}
+
+
+@task(name='jobs.tests.broken', max_attempts=2)
+def broken(job):
+    raise ValueError("falla a propósito")
+
+
+class JobQueueTests(TestCase):
+
+    def test_claims_by_priority_and_runs_once(self):
+        later = enqueue(add, a=1, b=1)
+        first = enqueue('jobs.tests.add', label='Suma', priority=-1, a=2, b=3)
+        enqueue(add, run_after=timezone.now() + datetime.timedelta(hours=1), a=0, b=0)
+
+        job = claim_next('w-1')
+        self.assertEqual((job.pk, job.status, job.attempts, job.worker), (first.pk, Job.Status.RUNNING, 1, 'w-1'))
+        self.assertIsNotNone(job.deadline)
+        self.assertEqual(run_job(job), Job.Status.DONE)
+        self.assertEqual(Job.objects.get(pk=first.pk).result, {'total': 5})
+
+        self.assertEqual(claim_next('w-2').pk, later.pk)
+        # La tarea programada para más tarde todavía no se toma
+        self.assertIsNone(claim_next('w-3'))
+
+    def test_errors_are_retried_with_backoff_then_fail(self):
+        job = enqueue(broken)
+        before = timezone.now()
+
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            self.assertEqual(run_job(claim_next('w-1')), Job.Status.QUEUED)
+        job.refresh_from_db()
+        self.assertIn('ValueError', job.error)
+        self.assertGreaterEqual(job.run_after, before + datetime.timedelta(seconds=RETRY_DELAY))
+        self.assertIsNone(claim_next('w-1'))
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('jobs.queue', 'ERROR'):
+            self.assertEqual(run_job(claim_next('w-1')), Job.Status.FAILED)
+        self.assertEqual(Job.objects.get(pk=job.pk).attempts, 2)
+
+    def test_overdue_attempts_are_expired(self):
+        job = enqueue(add, a=1, b=2)
+        claim_next('w-1')
+        Job.objects.filter(pk=job.pk).update(deadline=timezone.now() - datetime.timedelta(seconds=5))
+
+        self.assertEqual(expire_overdue(worker_ids=['w-2']), [])
+        self.assertEqual(expire_overdue(), [(job.pk, 'w-1')])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker), (Job.Status.QUEUED, ''))
+        self.assertIn('Tiempo agotado', job.error)
+
+    def test_unknown_task(self):
+        with self.assertRaises(UnknownTask):
+            enqueue('jobs.tests.no_existe')
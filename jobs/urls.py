@@ -0,0 +1,10 @@
+from django.urls import path
+from . import views
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('<int:pk>/', views.job_detail, name='job_detail'),
+    path('<int:pk>/estado/', views.job_status, name='job_status'),
+    path('<int:pk>/descargar/', views.job_download, name='job_download'),
+]
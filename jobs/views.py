@@ -0,0 +1,56 @@
+from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.cache import never_cache
+
+from .models import Job
+
+
+@login_required
+def job_detail(request, pk):
+    """
+    Estado de una tarea en segundo plano. La página consulta job_status cada
+    pocos segundos hasta que termina (ver jobs/js/progreso_tareas.js).
+    """
+    job = get_object_or_404(Job, pk=pk)
+    return render(request, 'jobs/job_detail.html', {'job': job})
+
+
+@login_required
+@never_cache
+def job_status(request, pk):
+    """Estado y avance de una tarea en JSON (una consulta, sin el resultado completo)."""
+    job = get_object_or_404(
+        Job.objects.only(
+            'status', 'attempts', 'max_attempts', 'progress_done', 'progress_total', 'progress_message', 'error',
+        ),
+        pk=pk,
+    )
+    return JsonResponse({
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'finished': job.is_finished,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'done': job.progress_done,
+        'total': job.progress_total,
+        'percent': job.percent,
+        'message': job.progress_message,
+        # Solo la última línea del traceback: el detalle completo queda en job_detail
+        'error': job.error.strip().splitlines()[-1] if job.error.strip() else '',
+    })
+
+
+@login_required
+def job_download(request, pk):
+    """Descarga el archivo generado por la tarea (result['file'] en default_storage)."""
+    job = get_object_or_404(Job, pk=pk, status=Job.Status.DONE)
+    result = job.result if isinstance(job.result, dict) else {}
+    if not result.get('file') or not default_storage.exists(result['file']):
+        raise Http404("La tarea no generó un archivo o ya no está disponible.")
+    return FileResponse(
+        default_storage.open(result['file'], 'rb'),
+        as_attachment=True,
+        filename=result.get('filename') or result['file'].rsplit('/', 1)[-1],
+    )
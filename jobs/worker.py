@@ -0,0 +1,47 @@
+"""
+Procesos worker de `manage.py run_workers`.
+
+Cada worker es un proceso aparte (spawn: igual en Linux y Windows) que toma
+tareas de a una con claim_next() y las ejecuta. El supervisor (el comando)
+vigila los tiempos: si un intento vence, termina el proceso, reintenta la
+tarea y levanta un worker nuevo en su lugar.
+"""
+import os
+import time
+
+
+def worker_main(worker_id, stop_event, current_job, poll_interval=1.0, burst=False):
+    """
+    Bucle de un worker. `current_job` (multiprocessing.Value) publica la tarea
+    en curso para el supervisor (0 = ninguna). Con `burst` termina apenas la cola queda vacía.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Stockconf.settings')
+    import django
+    django.setup()
+
+    from django.db import connections
+
+    from .queue import claim_next, run_job
+
+    parent = os.getppid()
+    try:
+        # Si el supervisor desaparece sin avisar, el worker no queda huérfano tomando tareas
+        while not stop_event.is_set() and os.getppid() == parent:
+            job = claim_next(worker_id)
+            if job is None:
+                if burst:
+                    return
+                stop_event.wait(poll_interval)
+                continue
+            current_job.value = job.pk
+            run_job(job)
+            current_job.value = 0
+    finally:
+        connections.close_all()
+
+
+def wait_for(processes, timeout):
+    """Espera a que terminen los procesos hasta `timeout` segundos en total."""
+    limit = time.monotonic() + timeout
+    for process in processes:
+        process.join(max(limit - time.monotonic(), 0))
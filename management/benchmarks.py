@@ -0,0 +1,255 @@
+import statistics
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from jobs.models import Job
+
+from products.models import Category, Combo, Product
+from shipping.models import Shipment
+from staff.models import Chofer, Vendedor
+
+
+@contextmanager
+def benchmark_database(path=None, verbosity=0):
+    """
+    Crea una base descartable con todas las migraciones y apunta la conexión
+    'default' a ella mientras dura el bloque. Nunca toca db.sqlite3.
+    - `path`: archivo para la base de prueba (por defecto, en memoria en SQLite).
+    """
+    if path:
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = str(path)
+    old_name = connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db() and connection.connection is not None:
+            # SQLite ignora close() en bases en memoria: sin esto la base (y sus
+            # datos) sobrevive para el próximo benchmark_database del proceso
+            connection.connection.close()
+            connection.connection = None
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+
+
+def time_call(func, repeat=5):
+    """Ejecuta `func` varias veces y devuelve (mediana en ms, último resultado)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+# --- Suite de vistas (manage.py run_benchmarks) ---
+
+# URLconfs cubiertas: cada URL con nombre tiene que tener un caso o estar en SKIPPED_URLS
+BENCHMARK_URLCONFS = ['products.urls', 'staff.urls', 'management.urls', 'shipping.urls', 'sales.urls', 'jobs.urls']
+
+# Solo aceptan POST o modifican datos al pedirlas
+SKIPPED_URLS = {
+    'products:product_delete', 'products:product_restore', 'products:product_delete_permanently',
+    'products:category_delete', 'products:combo_delete', 'products:combo_reserve',
+    'products:product_bulk_action',
+    'staff:desactivar_staff', 'staff:reactivar_staff', 'staff:eliminar_staff',
+    'management:logout',
+    'sales:sale_status',
+    'shipping:prepare_manifests',
+}
+
+# Consultas por caso medidas en caliente (con sesión y usuario), iguales para
+# todas las escalas. Si una vista suma una consulta a propósito se actualiza
+# acá (las vistas que usan el árbol de categorías consultan su versión una vez
+# por petición, ver products/cache.py).
+QUERY_BASELINE = {
+    'products:product_list': 4,
+    'products:product_list?search': 4,
+    'products:product_list?category': 4,
+    'products:product_list?status': 4,
+    'products:product_trash': 4,
+    'products:product_create': 3,
+    'products:product_import': 2,
+    'products:catalog_export': 3,
+    'products:product_reprice': 4,
+    'products:product_edit': 4,
+    'products:category_list': 3,
+    'products:category_create': 2,
+    'products:category_edit': 5,
+    'products:subcategories_api': 3,
+    'products:category_tree_api': 3,
+    'products:product_autocomplete': 3,
+    'products:combo_list': 4,
+    'products:combo_create': 2,
+    'products:combo_edit': 5,
+    'staff:vendedor_list': 4,
+    'staff:vendedor_create': 2,
+    'staff:vendedor_edit': 3,
+    'staff:vendedor_detail': 3,
+    'staff:chofer_list': 4,
+    'staff:chofer_create': 2,
+    'staff:chofer_edit': 3,
+    'staff:chofer_detail': 3,
+    'management:login': 0,
+    'management:panel': 8,
+    'management:panel_stats': 2,
+    'shipping:shipment_list': 4,
+    'shipping:shipment_create': 3,
+    'shipping:shipment_edit': 4,
+    'shipping:manifest_pdf': 4,
+    'shipping:manifests_zip': 4,
+    'sales:sale_list': 5,
+    'sales:sale_list?filters': 5,
+    'jobs:job_detail': 3,
+    'jobs:job_status': 3,
+    'jobs:job_download': 3,
+}
+
+# Margen sobre la medición: una consulta extra puntual (una versión de caché, un
+# permiso) no rompe la suite, pero una consulta por fila (N+1) sí, porque con
+# 1k filas suma cientos. El margen es chico para que el límite siga significando algo.
+QUERY_HEADROOM = 2
+QUERY_BUDGETS = {name: queries + QUERY_HEADROOM for name, queries in QUERY_BASELINE.items()}
+
+
+def view_cases(data):
+    """
+    Casos (nombre, url_name, kwargs, querystring) a medir. `data` trae ids de
+    ejemplo de la base sembrada (ver sample_ids).
+    """
+    return [
+        ('products:product_list', 'products:product_list', {}, ''),
+        ('products:product_list?search', 'products:product_list', {}, 'search=yerba'),
+        ('products:product_list?category', 'products:product_list', {}, f"category={data['root_category']}"),
+        ('products:product_list?status', 'products:product_list', {}, 'status=in_stock'),
+        ('products:product_trash', 'products:product_trash', {}, ''),
+        ('products:product_create', 'products:product_create', {}, ''),
+        ('products:product_import', 'products:product_import', {}, ''),
+        ('products:catalog_export', 'products:catalog_export', {}, 'format=csv'),
+        ('products:product_reprice', 'products:product_reprice', {}, f"category={data['root_category']}"),
+        ('products:product_edit', 'products:product_edit', {'pk': data['product']}, ''),
+        ('products:category_list', 'products:category_list', {}, ''),
+        ('products:category_create', 'products:category_create', {}, ''),
+        ('products:category_edit', 'products:category_edit', {'pk': data['root_category']}, ''),
+        ('products:subcategories_api', 'products:subcategories_api', {}, f"parent={data['root_category']}"),
+        ('products:category_tree_api', 'products:category_tree_api', {}, ''),
+        ('products:product_autocomplete', 'products:product_autocomplete', {}, 'q=yerba'),
+        ('products:combo_list', 'products:combo_list', {}, ''),
+        ('products:combo_create', 'products:combo_create', {}, ''),
+        ('products:combo_edit', 'products:combo_edit', {'pk': data['combo']}, ''),
+        ('staff:vendedor_list', 'staff:vendedor_list', {}, ''),
+        ('staff:vendedor_create', 'staff:vendedor_create', {}, ''),
+        ('staff:vendedor_edit', 'staff:vendedor_edit', {'pk': data['vendedor']}, ''),
+        ('staff:vendedor_detail', 'staff:vendedor_detail', {'pk': data['vendedor']}, ''),
+        ('staff:chofer_list', 'staff:chofer_list', {}, ''),
+        ('staff:chofer_create', 'staff:chofer_create', {}, ''),
+        ('staff:chofer_edit', 'staff:chofer_edit', {'pk': data['chofer']}, ''),
+        ('staff:chofer_detail', 'staff:chofer_detail', {'pk': data['chofer']}, ''),
+        ('management:login', 'management:login', {}, ''),
+        ('management:panel', 'management:panel', {}, ''),
+        ('management:panel_stats', 'management:panel_stats', {}, ''),
+        ('shipping:shipment_list', 'shipping:shipment_list', {}, ''),
+        ('shipping:shipment_create', 'shipping:shipment_create', {}, ''),
+        ('shipping:shipment_edit', 'shipping:shipment_edit', {'pk': data['shipment']}, ''),
+        ('shipping:manifest_pdf', 'shipping:manifest_pdf', {'chofer_pk': data['chofer']}, ''),
+        ('shipping:manifests_zip', 'shipping:manifests_zip', {}, ''),
+        ('sales:sale_list', 'sales:sale_list', {}, ''),
+        ('sales:sale_list?filters', 'sales:sale_list', {}, 'status=delivery&client=a'),
+        ('jobs:job_detail', 'jobs:job_detail', {'pk': data['job']}, ''),
+        ('jobs:job_status', 'jobs:job_status', {'pk': data['job']}, ''),
+        ('jobs:job_download', 'jobs:job_download', {'pk': data['job']}, ''),
+    ]
+
+
+def uncovered_urls(cases):
+    """Nombres de URL de BENCHMARK_URLCONFS sin caso ni motivo para saltearlos."""
+    covered = {url_name for _, url_name, _, _ in cases} | SKIPPED_URLS
+    missing = []
+    for urlconf in BENCHMARK_URLCONFS:
+        module = import_module(urlconf)
+        for pattern in module.urlpatterns:
+            name = f"{module.app_name}:{pattern.name}"
+            if pattern.name and name not in covered:
+                missing.append(name)
+    return missing
+
+
+def sample_job():
+    """
+    Tarea terminada con un archivo exportado, para las vistas de jobs (la
+    siembra no crea tareas). Escribe en default_storage: usar con un MEDIA_ROOT temporal.
+    """
+    path = default_storage.save('jobs/exports/benchmark.csv', ContentFile(b'id,name\n1,Benchmark\n'))
+    job = Job.objects.create(
+        task='products.tasks.export_catalog', label='Benchmark', status=Job.Status.DONE,
+        result={'file': path, 'filename': 'benchmark.csv', 'lines': 2},
+        progress_done=2, progress_total=2, finished=timezone.now(),
+    )
+    return job.pk
+
+
+def sample_ids():
+    """Ids de ejemplo para las URLs con parámetros (los más cargados cuando importa)."""
+    return {
+        'job': sample_job(),
+        'product': Product.objects.filter(category__isnull=False).values_list('pk', flat=True).first(),
+        'root_category': Category.objects.filter(parent__isnull=True).values_list('pk', flat=True).first(),
+        'combo': Combo.objects.annotate(n=Count('items')).order_by('-n').values_list('pk', flat=True).first(),
+        'vendedor': Vendedor.objects.annotate(n=Count('sales')).order_by('-n').values_list('pk', flat=True).first(),
+        'chofer': Chofer.objects.filter(activo=True).annotate(n=Count('shipments')).order_by('-n')
+        .values_list('pk', flat=True).first(),
+        'shipment': Shipment.objects.values_list('pk', flat=True).first(),
+    }
+
+
+class QueryCounter:
+    """Cuenta consultas con execute_wrapper (no depende de DEBUG ni del log de consultas)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _request(client, url):
+    response = client.get(url)
+    if getattr(response, 'streaming', False):
+        # Consumir el cuerpo: el costo de las respuestas en streaming está ahí
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def run_view_benchmarks(client, cases, repeat=5):
+    """
+    Mide cada caso con el cliente de prueba: mediana de `repeat` pedidos (tras
+    uno de calentamiento) y cantidad de consultas de un pedido en caliente.
+    Devuelve {nombre: {'url', 'status', 'median_ms', 'queries', 'budget'}}.
+    """
+    results = {}
+    for name, url_name, kwargs, query in cases:
+        url = reverse(url_name, kwargs=kwargs) + (f"?{query}" if query else '')
+        _request(client, url)  # calentamiento (cachés, archivos generados)
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = _request(client, url)
+        median_ms, _ = time_call(lambda: _request(client, url), repeat)
+        results[name] = {
+            'url': url,
+            'status': response.status_code,
+            'median_ms': round(median_ms, 2),
+            'queries': counter.count,
+            'budget': QUERY_BUDGETS.get(name),
+        }
+    return results
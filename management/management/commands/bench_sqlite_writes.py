@@ -0,0 +1,131 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from Stockconf.db import sqlite_options
+
+# "default": Django sin OPTIONS (journal DELETE, BEGIN diferido, timeout de 5 s)
+# "tuned": los OPTIONS con que se configura la base (Stockconf.db.sqlite_options)
+# "wal": los mismos con STOCK_SQLITE_WAL=1
+PROFILES = {
+    'default': {},
+    'tuned': sqlite_options(),
+    'wal': sqlite_options(wal=True),
+}
+PRODUCTS = 1_000
+
+
+def _register(path, profile):
+    """Alias de Django para el archivo temporal con los OPTIONS del perfil."""
+    alias = f'bench-{profile}'
+    connections.settings[alias] = {
+        **connections['default'].settings_dict, 'NAME': path, 'OPTIONS': PROFILES[profile],
+    }
+    return alias
+
+
+def _prepare(alias):
+    with connections[alias].cursor() as cursor:
+        cursor.execute('CREATE TABLE product (id INTEGER PRIMARY KEY, stock INTEGER NOT NULL)')
+        cursor.execute("""
+            CREATE TABLE movement (
+                id INTEGER PRIMARY KEY, product_id INTEGER NOT NULL, delta INTEGER NOT NULL, created REAL NOT NULL
+            )
+        """)
+        cursor.execute('CREATE INDEX movement_product ON movement(product_id)')
+        cursor.executemany('INSERT INTO product (id, stock) VALUES (%s, %s)',
+                           [(pk, 1_000_000) for pk in range(1, PRODUCTS + 1)])
+    connections[alias].close()
+
+
+def _writer(alias, transactions, offset, start, result):
+    # Cada hilo abre su propia conexión de Django para el alias
+    connection = connections[alias]
+    connection.ensure_connection()
+    start.wait()
+    for number in range(transactions):
+        product_id = (offset * 7919 + number) % PRODUCTS + 1
+        began = time.perf_counter()
+        try:
+            # Misma forma que apply_movements: UPDATE condicional del stock y registro del
+            # movimiento, en una transacción de Django (BEGIN según el perfil)
+            with transaction.atomic(using=alias), connection.cursor() as cursor:
+                cursor.execute('UPDATE product SET stock = stock - 1 WHERE id = %s AND stock >= 1', [product_id])
+                cursor.execute('INSERT INTO movement (product_id, delta, created) VALUES (%s, -1, %s)',
+                               [product_id, time.time()])
+        except OperationalError:
+            result['locked'] += 1
+        else:
+            result['latencies'].append(time.perf_counter() - began)
+    connection.close()
+
+
+def run_profile(profile, writers, transactions):
+    with tempfile.TemporaryDirectory() as directory:
+        alias = _register(os.path.join(directory, 'bench.sqlite3'), profile)
+        try:
+            _prepare(alias)
+            start = threading.Barrier(writers + 1)
+            results = [{'locked': 0, 'latencies': []} for _ in range(writers)]
+            threads = [
+                threading.Thread(target=_writer, args=(alias, transactions, index, start, results[index]))
+                for index in range(writers)
+            ]
+            for thread in threads:
+                thread.start()
+            start.wait()
+            began = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - began
+        finally:
+            # La próxima corrida usa otro archivo: se descarta la conexión y su configuración
+            del connections[alias]
+            del connections.settings[alias]
+    latencies = sorted(latency for result in results for latency in result['latencies'])
+    return {
+        'committed': len(latencies),
+        'locked': sum(result['locked'] for result in results),
+        'elapsed': elapsed,
+        'per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide transacciones de escritura por segundo y errores \"database is locked\" con N "
+        "escritores concurrentes, con conexiones de Django sin OPTIONS y con los de "
+        "Stockconf.db.sqlite_options() (con y sin WAL). "
+        "Trabaja sobre archivos temporales, no toca la base configurada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', default='1,4,8,16', help="Cantidades de escritores separadas por coma.")
+        parser.add_argument('--transactions', type=int, default=300, help="Transacciones por escritor.")
+        parser.add_argument('--profiles', default=','.join(PROFILES))
+
+    def handle(self, *args, **options):
+        try:
+            writer_counts = [int(value) for value in options['writers'].split(',')]
+        except ValueError:
+            raise CommandError("--writers debe ser una lista de enteros, p. ej. 1,4,8.")
+        profiles = [name.strip() for name in options['profiles'].split(',')]
+        unknown = set(profiles) - set(PROFILES)
+        if unknown:
+            raise CommandError(f"Perfiles desconocidos: {', '.join(sorted(unknown))}.")
+
+        self.stdout.write(f"{'perfil':<8} {'escr.':>5} {'ok':>7} {'locked':>7} {'tx/s':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        for writers in writer_counts:
+            for name in profiles:
+                stats = run_profile(name, writers, options['transactions'])
+                self.stdout.write(
+                    f"{name:<8} {writers:>5} {stats['committed']:>7} {stats['locked']:>7} "
+                    f"{stats['per_second']:>9.0f} {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}"
+                )
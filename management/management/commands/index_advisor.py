@@ -0,0 +1,88 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from management.benchmarks import _request, benchmark_database, sample_ids, view_cases
+from management.query_plans import QueryRecorder, analyze
+from management.seeding import SCALES, DemoSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra una base descartable, pide cada vista con el cliente de prueba, corre "
+        "EXPLAIN QUERY PLAN sobre sus consultas y propone Meta.indexes para los recorridos "
+        "completos de tabla y los ordenamientos en B-tree temporal."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=list(SCALES), default='10k')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--min-rows', type=int, default=1000,
+                            help="Ignorar tablas más chicas que esto (ahí un SCAN es lo más barato).")
+        parser.add_argument('--view', action='append', dest='views', metavar='CASO',
+                            help="Analizar solo estos casos (p. ej. products:product_list); se puede repetir.")
+        parser.add_argument('--sql', action='store_true', help="Mostrar el SQL de cada consulta señalada.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("index_advisor interpreta planes de SQLite.")
+        setup_test_environment(debug=False)
+        try:
+            with benchmark_database(), \
+                    override_settings(MANIFEST_CACHE_DIR=tempfile.mkdtemp(prefix='advisor-manifests-')):
+                cache.clear()
+                DemoSeeder(seed=options['seed']).run(**SCALES[options['scale']])
+                # Sin estadísticas el planificador de SQLite no elige igual que en producción
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE')
+                captured = self.capture(options['views'])
+                problems, proposals = analyze(captured, min_rows=options['min_rows'])
+        finally:
+            teardown_test_environment()
+        self.report(problems, proposals, options['sql'])
+
+    def capture(self, views):
+        cases = view_cases(sample_ids())
+        if views:
+            unknown = set(views) - {name for name, *_ in cases}
+            if unknown:
+                raise CommandError(f"Casos desconocidos: {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case[0] in views]
+        client = Client()
+        client.force_login(User.objects.create_user('advisor'))
+        captured = {}
+        for name, url_name, kwargs, query in cases:
+            url = reverse(url_name, kwargs=kwargs) + (f"?{query}" if query else '')
+            _request(client, url)  # calentamiento: las cachés no deben ocultar consultas repetidas
+            recorder = QueryRecorder()
+            with connection.execute_wrapper(recorder):
+                _request(client, url)
+            captured[name] = recorder.queries
+        return captured
+
+    def report(self, problems, proposals, show_sql):
+        if not problems:
+            self.stdout.write(self.style.SUCCESS("Ninguna consulta recorre tablas grandes ni ordena en B-tree temporal."))
+            return
+        self.stdout.write(self.style.MIGRATE_HEADING("Consultas señaladas"))
+        for problem in problems:
+            self.stdout.write(
+                f"  {problem['case']:<36} {problem['kind']:<12} {problem['table']} "
+                f"({problem['rows']} filas): {problem['detail']}"
+            )
+            if show_sql:
+                self.stdout.write(f"      {problem['sql']}")
+        if not proposals:
+            self.stdout.write("Sin índices para proponer (las consultas señaladas no filtran ni ordenan por columnas).")
+            return
+        self.stdout.write(self.style.MIGRATE_HEADING("Índices propuestos (Meta.indexes)"))
+        for (model, fields), cases in proposals.items():
+            self.stdout.write(
+                f"  {model._meta.label}: models.Index(fields={list(fields)!r}, ...)  ← {', '.join(cases)}"
+            )
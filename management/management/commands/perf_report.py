@@ -0,0 +1,83 @@
+import glob
+import json
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SORT_KEYS = ('p95', 'p50', 'p99', 'count', 'queries')
+
+
+def percentile(values, percent):
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = "Resume el log de PerformanceMiddleware: p50/p95/p99 de tiempo total y consultas por URL."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help="Archivo JSONL (por defecto PERFORMANCE_LOG, con sus rotaciones).")
+        parser.add_argument('--sort', choices=SORT_KEYS, default='p95')
+        parser.add_argument('--limit', type=int, default=30, help="Cantidad de URLs a mostrar.")
+
+    def read_entries(self, path):
+        # El log actual y los rotados (performance.jsonl.1, .2, ...)
+        files = [path] + sorted(glob.glob(f"{glob.escape(path)}.*"))
+        for filename in files:
+            with open(filename, encoding='utf-8') as log:
+                for line in log:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def handle(self, *args, **options):
+        path = options['log'] or getattr(settings, 'PERFORMANCE_LOG', None)
+        if not path or not glob.glob(glob.escape(path) + '*'):
+            raise CommandError(f"No existe el log de rendimiento: {path}")
+
+        groups = defaultdict(list)
+        for entry in self.read_entries(path):
+            groups[entry.get('url_name') or entry.get('path')].append(entry)
+        if not groups:
+            self.stdout.write("El log está vacío.")
+            return
+
+        rows = []
+        for name, entries in groups.items():
+            totals = sorted(entry['total_ms'] for entry in entries)
+            rows.append({
+                'name': name,
+                'count': len(entries),
+                'p50': percentile(totals, 50),
+                'p95': percentile(totals, 95),
+                'p99': percentile(totals, 99),
+                'db': sum(entry['db_ms'] for entry in entries) / len(entries),
+                'tpl': sum(entry['template_ms'] for entry in entries) / len(entries),
+                'queries': sum(entry['queries'] for entry in entries) / len(entries),
+                'max_queries': max(entry['queries'] for entry in entries),
+                'duplicates': max(entry['duplicates'] for entry in entries),
+            })
+        rows.sort(key=lambda row: row[options['sort']], reverse=True)
+
+        header = (
+            f"{'URL':<40} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'db ms':>8} {'tpl ms':>8} {'consultas':>10} {'máx':>5} {'repet.':>7}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for row in rows[:options['limit']]:
+            self.stdout.write(
+                f"{str(row['name'])[:40]:<40} {row['count']:>6} {row['p50']:>9.1f} {row['p95']:>9.1f} "
+                f"{row['p99']:>9.1f} {row['db']:>8.1f} {row['tpl']:>8.1f} {row['queries']:>10.1f} "
+                f"{row['max_queries']:>5} {row['duplicates']:>7}"
+            )
+        # Repeticiones altas suelen indicar N+1: vale la pena mirar el SQL en el log
+        suspects = [row['name'] for row in rows if row['duplicates'] >= 5]
+        if suspects:
+            self.stdout.write(self.style.WARNING(f"Posibles N+1 (5+ consultas repetidas): {', '.join(map(str, suspects))}"))
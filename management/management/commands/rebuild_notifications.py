@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from management.notifications import rebuild_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Sincroniza los avisos del panel con todo el catálogo. Normalmente no hace falta: "
+        "se mantienen solos con las señales de stock; sirve tras cargas masivas con bulk_create."
+    )
+
+    def handle(self, *args, **options):
+        total = rebuild_notifications()
+        self.stdout.write(self.style.SUCCESS(f"Avisos abiertos: {total}"))
@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from management.benchmarks import (
+    benchmark_database, run_view_benchmarks, sample_ids, uncovered_urls, view_cases,
+)
+from management.seeding import SCALES, DemoSeeder
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Siembra bases descartables a escalas fijas (1k/10k/100k productos), mide todas las vistas "
+        "de products, staff, management, shipping y sales con el cliente de prueba y controla "
+        "la cantidad máxima de consultas por vista."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES))
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--db-path', help="Archivo para la base de prueba (por defecto en memoria).")
+        parser.add_argument('--output', help="JSON de resultados (por defecto benchmarks/<commit>.json).")
+        parser.add_argument('--compare', help="JSON de una corrida anterior para comparar tiempos.")
+        parser.add_argument(
+            '--no-budgets', action='store_true',
+            help="No fallar si una vista supera su presupuesto de consultas.",
+        )
+
+    def handle(self, *args, **options):
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as stream:
+                    previous = json.load(stream)
+            except (OSError, ValueError) as error:
+                raise CommandError(f"No se pudo leer {options['compare']}: {error}")
+
+        commit = _git_commit()
+        report = {'commit': commit, 'created': timezone.now().isoformat(), 'scales': {}}
+        over_budget = []
+
+        # DEBUG apagado: el registro de consultas de DEBUG distorsiona los tiempos
+        setup_test_environment(debug=False)
+        try:
+            for scale in options['scales']:
+                report['scales'][scale] = self.run_scale(scale, options)
+                over_budget += [
+                    (scale, name, result['queries'], result['budget'])
+                    for name, result in report['scales'][scale].items()
+                    if result['budget'] is not None and result['queries'] > result['budget']
+                ]
+        finally:
+            teardown_test_environment()
+
+        output = options['output'] or os.path.join(settings.BASE_DIR, 'benchmarks', f"{commit or 'local'}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as stream:
+            json.dump(report, stream, indent=2, ensure_ascii=False)
+        self.stdout.write(f"Resultados guardados en {output}")
+
+        if previous:
+            self.compare(previous, report)
+        if over_budget:
+            for scale, name, queries, budget in over_budget:
+                self.stdout.write(self.style.ERROR(f"[{scale}] {name}: {queries} consultas (máximo {budget})"))
+            if not options['no_budgets']:
+                raise CommandError(f"{len(over_budget)} vistas superan su presupuesto de consultas.")
+
+    def run_scale(self, scale, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Escala {scale}: {SCALES[scale]}"))
+        with benchmark_database(path=options['db_path']), \
+                override_settings(
+                    MANIFEST_CACHE_DIR=tempfile.mkdtemp(prefix='bench-manifests-'),
+                    MEDIA_ROOT=tempfile.mkdtemp(prefix='bench-media-'),
+                ):
+            cache.clear()
+            start = time.perf_counter()
+            DemoSeeder(seed=options['seed']).run(**SCALES[scale])
+            self.stdout.write(f"  datos sembrados en {time.perf_counter() - start:.1f}s")
+
+            cases = view_cases(sample_ids())
+            missing = uncovered_urls(cases)
+            if missing:
+                raise CommandError(f"URLs sin caso de benchmark: {', '.join(missing)}")
+
+            client = Client()
+            client.force_login(User.objects.create_user('benchmark'))
+            results = run_view_benchmarks(client, cases, repeat=options['repeat'])
+
+        self.stdout.write(f"  {'vista':<36} {'estado':>6} {'mediana ms':>11} {'consultas':>10} {'máx':>5}")
+        for name, result in results.items():
+            line = (
+                f"  {name:<36} {result['status']:>6} {result['median_ms']:>11.2f} "
+                f"{result['queries']:>10} {result['budget'] if result['budget'] is not None else '-':>5}"
+            )
+            over = result['budget'] is not None and result['queries'] > result['budget']
+            self.stdout.write(self.style.ERROR(line) if over else line)
+        return results
+
+    def compare(self, previous, report):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Comparación con {previous.get('commit') or 'corrida anterior'}"))
+        for scale, results in report['scales'].items():
+            before = previous.get('scales', {}).get(scale, {})
+            for name, result in results.items():
+                old = before.get(name)
+                if not old or not old['median_ms']:
+                    continue
+                change = (result['median_ms'] - old['median_ms']) / old['median_ms'] * 100
+                queries = result['queries'] - old['queries']
+                line = (
+                    f"  [{scale}] {name:<36} {old['median_ms']:>9.2f} → {result['median_ms']:>9.2f} ms "
+                    f"({change:+.0f} %)  consultas {queries:+d}"
+                )
+                if change > 25 or queries > 0:
+                    line = self.style.WARNING(line)
+                self.stdout.write(line)
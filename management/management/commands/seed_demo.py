@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from management.seeding import DemoSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos (categorías, productos, combos, staff, ventas y envíos) con "
+        "bulk_create por lotes, en la base configurada. Con la misma semilla sobre una base "
+        "vacía genera siempre los mismos datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=10_000)
+        parser.add_argument('--categories', type=int, default=3, metavar='PROFUNDIDAD',
+                            help="Niveles del árbol de categorías.")
+        parser.add_argument('--branching', type=int, default=4, help="Subcategorías por categoría.")
+        parser.add_argument('--combos', type=int, default=100)
+        parser.add_argument('--items-per-combo', type=int, default=5)
+        parser.add_argument('--staff', type=int, default=50, help="Vendedores y choferes (de cada uno).")
+        parser.add_argument('--sales', type=int, default=0)
+        parser.add_argument('--shipments', type=int, default=0)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        for name in ('products', 'categories', 'branching', 'combos', 'items_per_combo', 'staff', 'sales',
+                     'shipments'):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} no puede ser negativo.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size debe ser mayor que cero.")
+        categories = sum(options['branching'] ** level for level in range(1, options['categories'] + 1))
+        if categories > 100_000:
+            raise CommandError(f"El árbol tendría {categories} categorías: bajá --categories o --branching.")
+
+        started = time.perf_counter()
+        last = {}
+
+        def progress(stage, done, total):
+            # Una línea por etapa cada ~10 % para no inundar la consola
+            step = max(total // 10, 1)
+            if done == total or done // step != last.get(stage, -1):
+                last[stage] = done // step
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"  [{elapsed:6.1f}s] {stage}: {done}/{total}")
+
+        seeder = DemoSeeder(seed=options['seed'], batch_size=options['batch_size'], progress=progress)
+        seeder.run(
+            products=options['products'],
+            category_depth=options['categories'],
+            category_branching=options['branching'],
+            combos=options['combos'],
+            items_per_combo=options['items_per_combo'],
+            staff=options['staff'],
+            sales=options['sales'],
+            shipments=options['shipments'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Datos generados en {time.perf_counter() - started:.1f}s: {categories} categorías, "
+            f"{options['products']} productos, {options['combos']} combos, {options['staff']} vendedores "
+            f"y {options['staff']} choferes."
+        ))
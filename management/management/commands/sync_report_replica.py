@@ -0,0 +1,47 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from Stockconf.db import REPORTS_DB
+
+
+class Command(BaseCommand):
+    help = (
+        "Copia la base principal a la réplica de reportes (STOCK_REPORTS_DB) con la API de "
+        "backup de SQLite: se puede correr con la aplicación funcionando, p. ej. desde cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', default=None,
+                            help="Archivo destino (por defecto el de DATABASES['reports']).")
+        parser.add_argument('--pages', type=int, default=1024,
+                            help="Páginas copiadas por paso; entre pasos los escritores pueden avanzar.")
+
+    def handle(self, *args, **options):
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError("La réplica de reportes solo está soportada sobre SQLite.")
+        target = options['target'] or settings.DATABASES.get(REPORTS_DB, {}).get('NAME')
+        if not target:
+            raise CommandError("No hay réplica configurada: definí STOCK_REPORTS_DB o pasá --target.")
+        if str(target) == str(source.settings_dict['NAME']):
+            raise CommandError("La réplica no puede ser la misma base principal.")
+
+        started = time.perf_counter()
+        source.ensure_connection()
+        destination = sqlite3.connect(target)
+        try:
+            # La copia se escribe dentro de una transacción del destino: los lectores de la
+            # réplica ven la versión anterior completa o la nueva, nunca una mezcla
+            source.connection.backup(destination, pages=options['pages'])
+        finally:
+            destination.close()
+        # Las conexiones abiertas a la réplica en este proceso vuelven a abrirse
+        if REPORTS_DB in connections:
+            connections[REPORTS_DB].close()
+        self.stdout.write(self.style.SUCCESS(
+            f"Réplica {target} actualizada en {time.perf_counter() - started:.2f}s."
+        ))
@@ -0,0 +1,140 @@
+"""
+Instrumentación por petición (opcional, ver PERFORMANCE_MONITORING en settings).
+
+Para cada vista registra cantidad de consultas SQL, consultas repetidas
+(posible N+1), tiempo en la base, tiempo de render de templates y tiempo total.
+Los agrega como encabezado Server-Timing (visible en las herramientas del
+navegador) y los escribe como una línea JSON en un log rotativo que resume
+`manage.py perf_report`.
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import ExitStack
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import Template
+from django.utils import timezone
+
+logger = logging.getLogger('stockconf.performance')
+
+# Métricas de la petición en curso (None fuera de una petición medida)
+_current = contextvars.ContextVar('performance_metrics', default=None)
+_original_render = Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    metrics = _current.get()
+    if metrics is None or metrics.template_depth:
+        return _original_render(self, context, request)
+    # Solo se mide el template de primer nivel (los include van adentro)
+    metrics.template_depth += 1
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        metrics.template_depth -= 1
+        metrics.template_ms += (time.perf_counter() - start) * 1000
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.queries = Counter()
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: mide cada consulta de la petición
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.query_count += 1
+            self.queries[sql] += 1
+
+    @property
+    def duplicates(self):
+        """Consultas con el mismo SQL (sin contar parámetros) ejecutadas más de una vez."""
+        return sum(count - 1 for count in self.queries.values() if count > 1)
+
+    def most_repeated(self):
+        if not self.duplicates:
+            return None
+        sql, count = self.queries.most_common(1)[0]
+        return {'sql': sql[:300], 'count': count}
+
+
+def _get_log_handler():
+    path = getattr(settings, 'PERFORMANCE_LOG', None)
+    if not path or logger.handlers:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handler = RotatingFileHandler(
+        path,
+        maxBytes=getattr(settings, 'PERFORMANCE_LOG_MAX_BYTES', 10 * 1024 * 1024),
+        backupCount=getattr(settings, 'PERFORMANCE_LOG_BACKUPS', 5),
+        encoding='utf-8',
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class PerformanceMiddleware:
+    """
+    Middleware de medición. Se activa con PERFORMANCE_MONITORING = True;
+    si no, Django lo descarta al arrancar (MiddlewareNotUsed) y no cuesta nada.
+    El total no incluye el envío de respuestas en streaming.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERFORMANCE_MONITORING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        Template.render = _timed_render
+        _get_log_handler()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.query_count} consultas, {metrics.duplicates} repetidas"',
+            f'tpl;dur={metrics.template_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+        match = request.resolver_match
+        logger.info(json.dumps({
+            'time': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'url_name': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(metrics.db_ms, 2),
+            'template_ms': round(metrics.template_ms, 2),
+            'queries': metrics.query_count,
+            'duplicates': metrics.duplicates,
+            'most_repeated': metrics.most_repeated(),
+        }, ensure_ascii=False))
+        return response
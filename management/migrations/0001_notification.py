@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0014_product_reorder_point'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('out_of_stock', 'Sin stock'), ('low_stock', 'Bajo punto de reposición'), ('combo_unavailable', 'Combo sin stock')], max_length=30, verbose_name='Tipo')),
+                ('level', models.CharField(choices=[('warning', 'Advertencia'), ('danger', 'Urgente')], default='warning', max_length=10, verbose_name='Nivel')),
+                ('message', models.CharField(max_length=255, verbose_name='Mensaje')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('resolved', models.DateTimeField(blank=True, null=True, verbose_name='Resuelto')),
+                ('combo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='products.combo', verbose_name='Combo')),
+                ('product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='products.product', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Aviso',
+                'verbose_name_plural': 'Avisos',
+                'ordering': ['-created', '-id'],
+                'indexes': [models.Index(condition=models.Q(('resolved__isnull', True)), fields=['-created', '-id'], name='notification_open_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('resolved__isnull', True)), fields=('key',), name='notification_open_key_uniq')],
+            },
+        ),
+    ]
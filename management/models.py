@@ -1,3 +1,54 @@
 from django.db import models
+from django.db.models import Q
 
-# Create your models here.
+from products.models import Combo, Product
+
+
+class Notification(models.Model):
+    """
+    Aviso del panel (sin stock, bajo punto de reposición, combo sin stock).
+    - Se abre y se resuelve de forma incremental desde las señales de stock
+      (ver management/notifications.py); el panel solo lee las abiertas.
+    - `key` identifica la situación: a lo sumo un aviso abierto por key.
+    """
+
+    class Kind(models.TextChoices):
+        OUT_OF_STOCK = 'out_of_stock', 'Sin stock'
+        LOW_STOCK = 'low_stock', 'Bajo punto de reposición'
+        COMBO_UNAVAILABLE = 'combo_unavailable', 'Combo sin stock'
+
+    class Level(models.TextChoices):
+        WARNING = 'warning', 'Advertencia'
+        DANGER = 'danger', 'Urgente'
+
+    key = models.CharField(max_length=100)
+    kind = models.CharField(max_length=30, choices=Kind.choices, verbose_name="Tipo")
+    level = models.CharField(max_length=10, choices=Level.choices, default=Level.WARNING, verbose_name="Nivel")
+    message = models.CharField(max_length=255, verbose_name="Mensaje")
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications',
+        verbose_name="Producto",
+    )
+    combo = models.ForeignKey(
+        Combo, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications',
+        verbose_name="Combo",
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Creado")
+    resolved = models.DateTimeField(null=True, blank=True, verbose_name="Resuelto")
+
+    class Meta:
+        verbose_name = "Aviso"
+        verbose_name_plural = "Avisos"
+        ordering = ['-created', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key'], condition=Q(resolved__isnull=True), name='notification_open_key_uniq',
+            ),
+        ]
+        indexes = [
+            # El panel lista solo las abiertas, las más nuevas primero
+            models.Index(fields=['-created', '-id'], condition=Q(resolved__isnull=True), name='notification_open_idx'),
+        ]
+
+    def __str__(self):
+        return self.message
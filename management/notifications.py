@@ -0,0 +1,90 @@
+"""
+Avisos del panel, mantenidos de forma incremental.
+
+Cada sincronización recibe solo los ids afectados (por una venta, una
+importación, una edición), calcula qué avisos deberían estar abiertos para
+ellos y abre o resuelve la diferencia. Nunca recorre el catálogo entero,
+salvo rebuild_notifications() (comando del mismo nombre).
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+from products.models import Combo, Product
+from products.utils import chunks
+
+from .models import Notification
+
+PRODUCT_KINDS = [Notification.Kind.OUT_OF_STOCK, Notification.Kind.LOW_STOCK]
+PANEL_LIMIT = 20
+
+
+def notification_key(kind, pk):
+    return f"{kind}:{pk}"
+
+
+def _sync(expected, queryset):
+    """
+    Abre los avisos de `expected` ({key: Notification sin guardar}) que no estén
+    abiertos y resuelve los abiertos de `queryset` que ya no correspondan.
+    """
+    open_keys = set(queryset.filter(resolved__isnull=True).values_list('key', flat=True))
+    stale = open_keys - set(expected)
+    if stale:
+        Notification.objects.filter(key__in=stale, resolved__isnull=True).update(resolved=timezone.now())
+    # ignore_conflicts: si otra transacción abrió el mismo aviso, gana la restricción única parcial
+    Notification.objects.bulk_create(
+        [notification for key, notification in expected.items() if key not in open_keys],
+        ignore_conflicts=True,
+    )
+
+
+def sync_product_notifications(product_ids):
+    """Sin stock y bajo punto de reposición, solo para estos productos (los no disponibles no avisan)."""
+    for chunk in chunks(product_ids):
+        expected = {}
+        rows = Product.objects.filter(pk__in=chunk, available=True).values_list('pk', 'name', 'stock', 'reorder_point')
+        for pk, name, stock, reorder_point in rows:
+            if stock <= 0:
+                kind, level, message = Notification.Kind.OUT_OF_STOCK, Notification.Level.DANGER, f"«{name}» sin stock"
+            elif stock <= reorder_point:
+                kind, level = Notification.Kind.LOW_STOCK, Notification.Level.WARNING
+                message = f"«{name}» llegó al punto de reposición ({reorder_point} unidades)"
+            else:
+                continue
+            key = notification_key(kind, pk)
+            expected[key] = Notification(key=key, kind=kind, level=level, message=message, product_id=pk)
+        _sync(expected, Notification.objects.filter(product_id__in=chunk, kind__in=PRODUCT_KINDS))
+
+
+def sync_combo_notifications(combo_ids):
+    """Combos disponibles que ya no se pueden armar ni tienen reservados."""
+    for chunk in chunks(combo_ids):
+        expected = {}
+        rows = (
+            Combo.objects.filter(pk__in=chunk, available=True, reserved=0)
+            .filter(Q(availability__isnull=True) | Q(availability__max_buildable=0))
+            .values_list('pk', 'name')
+        )
+        for pk, name in rows:
+            key = notification_key(Notification.Kind.COMBO_UNAVAILABLE, pk)
+            expected[key] = Notification(
+                key=key, kind=Notification.Kind.COMBO_UNAVAILABLE, level=Notification.Level.WARNING,
+                message=f"El combo «{name}» ya no se puede armar con el stock actual", combo_id=pk,
+            )
+        _sync(expected, Notification.objects.filter(combo_id__in=chunk, kind=Notification.Kind.COMBO_UNAVAILABLE))
+
+
+def rebuild_notifications():
+    """Sincroniza todo el catálogo (tras cargas masivas que no disparan señales)."""
+    sync_product_notifications(Product.objects.values_list('pk', flat=True))
+    sync_combo_notifications(Combo.objects.values_list('pk', flat=True))
+    return Notification.objects.filter(resolved__isnull=True).count()
+
+
+def open_notifications(limit=PANEL_LIMIT):
+    """Los `limit` avisos abiertos más nuevos y si hay más (una sola consulta)."""
+    rows = list(
+        Notification.objects.filter(resolved__isnull=True)
+        .only('kind', 'level', 'message', 'product_id', 'combo_id', 'created')[:limit + 1]
+    )
+    return rows[:limit], len(rows) > limit
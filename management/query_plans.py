@@ -0,0 +1,167 @@
+"""
+Análisis de planes de consulta para `manage.py index_advisor`.
+
+Se capturan las consultas que hace cada vista, se corre EXPLAIN QUERY PLAN
+sobre cada SELECT y se señalan los recorridos completos de tabla (SCAN sin
+índice) y los ordenamientos en B-tree temporal. Para cada problema se propone
+un índice con las columnas comparadas por igualdad primero, después las de
+rango y al final las del ORDER BY (el orden en que SQLite puede usarlas).
+"""
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import connection
+
+_SCAN = re.compile(
+    r'^SCAN (?:TABLE )?(?P<table>\w+)(?: AS \w+)?(?P<index> USING (?:COVERING )?INDEX \w+| VIRTUAL TABLE)?'
+)
+_TEMP = re.compile(r'USE TEMP B-TREE FOR (?P<what>.+)$')
+_COLUMN = r'"(?P<table>\w+)"\."(?P<column>\w+)"'
+_JOIN = re.compile(r'"\w+"\."\w+"\s*=\s*"\w+"\."\w+"')
+_RANGE = re.compile(_COLUMN + r'\s*(?:>=|<=|>|<|BETWEEN\b|LIKE\b)')
+_ORDER_BY = re.compile(r'\bORDER BY (?P<columns>.+?)(?:\bLIMIT\b|\bOFFSET\b|$)', re.S)
+
+
+class QueryRecorder:
+    """execute_wrapper que guarda (sql, params) de cada SELECT ejecutado."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+
+def explain(sql, params):
+    """Filas de EXPLAIN QUERY PLAN: lista de textos 'detail'."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def table_sizes():
+    sizes = {}
+    with connection.cursor() as cursor:
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            sizes[table] = cursor.fetchone()[0]
+    return sizes
+
+
+def _models_by_table():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def _field_name(model, column):
+    for field in model._meta.concrete_fields:
+        if field.column == column:
+            return field.name
+    return None
+
+
+def _where_clause(sql):
+    # Lo que va del primer WHERE al ORDER BY / LIMIT (suficiente para las consultas del ORM)
+    match = re.search(r'\bWHERE\b(?P<where>.+?)(?:\bGROUP BY\b|\bORDER BY\b|\bLIMIT\b|$)', sql, re.S)
+    return match.group('where') if match else ''
+
+
+def _orders_by_column(table, sql):
+    order = _ORDER_BY.search(sql)
+    return bool(order) and any(
+        match.group('table') == table for match in re.finditer(_COLUMN, order.group('columns'))
+    )
+
+
+def suggest_index(table, sql):
+    """
+    Campos (nombres de modelo) de un índice para `table` según la consulta, o
+    None si no hay columnas filtradas ni ordenadas de esa tabla.
+    """
+    model = _models_by_table().get(table)
+    if model is None:
+        return None
+    # Las condiciones de join no se indexan desde esta tabla
+    where = _JOIN.sub('', _where_clause(sql))
+    ranges = [match.group('column') for match in _RANGE.finditer(where) if match.group('table') == table]
+    # Todo lo demás se compara por igualdad (=, IN, IS NULL o un booleano solo: WHERE "available")
+    columns = []
+    for match in re.finditer(_COLUMN, where):
+        column = match.group('column')
+        if match.group('table') == table and column not in ranges and column not in columns:
+            columns.append(column)
+    if model._meta.pk.column in columns:
+        return None  # búsqueda por clave primaria: ya tiene índice
+    columns += [column for column in dict.fromkeys(ranges) if column not in columns]
+    order = _ORDER_BY.search(sql)
+    if order:
+        for match in re.finditer(_COLUMN, order.group('columns')):
+            if match.group('table') == table and match.group('column') not in columns:
+                columns.append(match.group('column'))
+    fields = [_field_name(model, column) for column in columns]
+    fields = [field for field in fields if field]
+    if not fields:
+        return None
+    return model, fields
+
+
+def _existing_indexes(model):
+    existing = [list(index.fields) for index in model._meta.indexes]
+    existing += [list(constraint.fields) for constraint in model._meta.constraints if getattr(constraint, 'fields', None)]
+    existing += [list(fields) for fields in model._meta.unique_together]
+    existing += [[field.name] for field in model._meta.concrete_fields if field.db_index or field.unique]
+    return existing
+
+
+def analyze(cases, min_rows=1000):
+    """
+    `cases`: {nombre del caso: [(sql, params), ...]}. Devuelve (problemas, propuestas):
+    - problemas: [{'case', 'table', 'rows', 'kind' ('scan' | 'temp b-tree'), 'detail', 'sql'}]
+    - propuestas: {(modelo, campos): [casos]} sin repetir índices ya declarados.
+    Las tablas con menos de `min_rows` filas se ignoran: ahí un SCAN es lo más barato.
+    """
+    sizes = table_sizes()
+    problems = []
+    proposals = defaultdict(list)
+    seen = set()
+    for case, queries in cases.items():
+        for sql, params in queries:
+            if (case, sql) in seen:
+                continue
+            seen.add((case, sql))
+            plan = explain(sql, params)
+            scanned, scans = [], set()
+            for detail in plan:
+                scan = _SCAN.match(detail)
+                if scan and not scan.group('index') and sizes.get(scan.group('table'), 0) >= min_rows:
+                    scanned.append(scan.group('table'))
+                    scans.add(scan.group('table'))
+                    problems.append({
+                        'case': case, 'table': scan.group('table'), 'rows': sizes[scan.group('table')],
+                        'kind': 'scan', 'detail': detail, 'sql': sql,
+                    })
+                temp = _TEMP.search(detail)
+                if temp and 'ORDER BY' in temp.group('what'):
+                    tables = [table for table in re.findall(r'FROM "(\w+)"', sql) if sizes.get(table, 0) >= min_rows]
+                    if tables:
+                        scanned.append(tables[0])
+                        problems.append({
+                            'case': case, 'table': tables[0], 'rows': sizes[tables[0]],
+                            'kind': 'temp b-tree', 'detail': detail, 'sql': sql,
+                        })
+            for table in dict.fromkeys(scanned):
+                if table not in scans and not _orders_by_column(table, sql):
+                    # Ordena por un agregado (ORDER BY 3 DESC): ningún índice lo evita
+                    continue
+                suggestion = suggest_index(table, sql)
+                if suggestion is None:
+                    continue
+                model, fields = suggestion
+                if any(existing[:len(fields)] == fields for existing in _existing_indexes(model)):
+                    continue
+                key = (model, tuple(fields))
+                if case not in proposals[key]:
+                    proposals[key].append(case)
+    return problems, dict(proposals)
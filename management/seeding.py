@@ -0,0 +1,261 @@
+"""
+Generador de datos sintéticos para benchmarks y pruebas de carga.
+
+Todo se inserta con bulk_create por lotes y a partir de un `random.Random`
+con semilla fija: la misma semilla sobre una base vacía genera siempre los
+mismos datos. Al no pasar por save(), al final se recalculan las tablas
+derivadas (disponibilidad de combos, resúmenes de ventas) y se invalidan
+las cachés.
+"""
+import datetime
+import random
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.text import slugify
+
+from products.availability import rebuild_combo_availability
+from products.models import Category, Combo, ComboItem, Product
+from products.search import drop_search_index, ensure_search_index
+from sales.models import Client, Sale, SaleLine
+from sales.services import rebuild_rollups
+from shipping.geocoding import geocode_shipments, load_geocodes
+from shipping.models import Shipment
+from shipping.routing import store_location, update_routes
+from staff.models import Chofer, Vendedor
+
+from .notifications import rebuild_notifications
+from .stats import invalidate_stats
+
+WORDS = [
+    'aceite', 'arroz', 'azucar', 'cafe', 'galletitas', 'harina', 'leche', 'mate',
+    'yerba', 'fideos', 'queso', 'jabon', 'detergente', 'shampoo', 'gaseosa', 'agua',
+    'vino', 'cerveza', 'chocolate', 'alfajor', 'pan', 'manteca', 'dulce', 'tomate',
+]
+BRANDS = ['Norte', 'Sur', 'Andes', 'Pampa', 'Litoral', 'Patagonia', 'Cuyo', 'Delta']
+FIRST_NAMES = ['Ana', 'Luis', 'Marta', 'Jorge', 'Lucía', 'Pablo', 'Sofía', 'Diego', 'Carla', 'Martín']
+LAST_NAMES = ['Gómez', 'Pérez', 'Díaz', 'López', 'Romero', 'Sosa', 'Torres', 'Ruiz', 'Álvarez', 'Benítez']
+STREETS = ['San Martín', 'Belgrano', 'Rivadavia', 'Mitre', 'Sarmiento', 'Moreno', 'Alem', 'Colón']
+
+# Desde esta cantidad de productos conviene reconstruir el índice de búsqueda
+# de una vez al final en lugar de actualizarlo fila por fila con los triggers
+REBUILD_SEARCH_INDEX_FROM = 50_000
+
+# Escalas fijas para run_benchmarks
+SCALES = {
+    '1k': dict(products=1_000, category_depth=3, combos=50, items_per_combo=5, staff=100, sales=500, shipments=200),
+    '10k': dict(products=10_000, category_depth=4, combos=200, items_per_combo=10, staff=1_000, sales=2_000, shipments=1_000),
+    '100k': dict(products=100_000, category_depth=5, combos=500, items_per_combo=20, staff=3_000, sales=5_000, shipments=3_000),
+}
+
+
+class DemoSeeder:
+    """
+    Inserta datos sintéticos coherentes entre sí.
+    - `progress(etapa, hechos, total)` se llama después de cada lote.
+    """
+
+    def __init__(self, seed=42, batch_size=5_000, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress
+        self.category_ids = []
+        self.product_ids = []
+        self.vendedor_ids = []
+        self.chofer_ids = []
+
+    def _report(self, stage, done, total):
+        if self.progress:
+            self.progress(stage, done, total)
+
+    def _bulk(self, model, objects, stage, total):
+        """bulk_create por lotes desde un generador; devuelve los ids creados."""
+        ids = []
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                ids.extend(item.pk for item in model.objects.bulk_create(batch))
+                batch = []
+                self._report(stage, len(ids), total)
+        if batch:
+            ids.extend(item.pk for item in model.objects.bulk_create(batch))
+            self._report(stage, len(ids), total)
+        return ids
+
+    def run(self, products=1_000, category_depth=3, category_branching=4, combos=50,
+            items_per_combo=5, staff=100, sales=0, shipments=0):
+        rebuild_index = products >= REBUILD_SEARCH_INDEX_FROM
+        if rebuild_index:
+            drop_search_index(connection)
+        try:
+            with transaction.atomic():
+                self.categories(category_depth, category_branching)
+                self.products(products)
+                self.combos(combos, items_per_combo)
+                self.staff(staff)
+                if sales:
+                    self.sales(sales)
+                if shipments:
+                    self.shipments(shipments)
+        finally:
+            if rebuild_index:
+                self._report('índice de búsqueda', 0, 1)
+                ensure_search_index(connection)
+                self._report('índice de búsqueda', 1, 1)
+        # Tablas derivadas y cachés (bulk_create no dispara señales)
+        rebuild_combo_availability()
+        rebuild_notifications()
+        if sales:
+            rebuild_rollups()
+        if shipments:
+            geocode_shipments()
+            update_routes()
+        invalidate_stats()
+
+    def categories(self, depth, branching=4):
+        """
+        Árbol de `depth` niveles con `branching` hijos por categoría.
+        Los ids se asignan acá para poder escribir el path materializado directo.
+        """
+        if depth <= 0:
+            return
+        next_id = (Category.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+        level = [(None, '/')]
+        nodes = []
+        for current_depth in range(depth):
+            next_level = []
+            for parent_id, parent_path in level:
+                for _ in range(branching):
+                    pk, next_id = next_id, next_id + 1
+                    name = f"{self.rng.choice(WORDS).title()} {pk}"
+                    path = f"{parent_path}{pk}/"
+                    nodes.append(Category(
+                        pk=pk, name=name, slug=slugify(name), parent_id=parent_id, path=path, depth=current_depth,
+                    ))
+                    next_level.append((pk, path))
+            level = next_level
+        self.category_ids = self._bulk(Category, iter(nodes), 'categorías', len(nodes))
+
+    def products(self, count):
+        start = Product.objects.count()
+        rng = self.rng
+        categories = self.category_ids or [None]
+        objects = (
+            Product(
+                code=f"DEMO-{start + index:07d}",
+                name=f"{rng.choice(WORDS).title()} {rng.choice(BRANDS)} {rng.randint(1, 999)}",
+                category_id=rng.choice(categories),
+                price=Decimal(rng.randint(100, 500_000)) / 100,
+                # ~10 % sin stock para que los filtros y combos tengan de todo
+                stock=0 if rng.random() < 0.1 else rng.randint(1, 500),
+                available=rng.random() < 0.95,
+            )
+            for index in range(count)
+        )
+        self.product_ids = self._bulk(Product, objects, 'productos', count)
+
+    def combos(self, count, items_per_combo):
+        if not count or not self.product_ids:
+            return
+        rng = self.rng
+        combo_ids = self._bulk(Combo, (
+            Combo(
+                name=f"Combo {rng.choice(WORDS).title()} {index + 1}",
+                special_price=Decimal(rng.randint(1_000, 90_000)) / 100 if rng.random() < 0.3 else None,
+            )
+            for index in range(count)
+        ), 'combos', count)
+        size = min(items_per_combo, len(self.product_ids))
+        self._bulk(ComboItem, (
+            ComboItem(combo_id=combo_id, product_id=product_id, quantity=rng.randint(1, 3))
+            for combo_id in combo_ids
+            for product_id in rng.sample(self.product_ids, size)
+        ), 'items de combos', count * size)
+
+    def _person(self, model, index, kind):
+        rng = self.rng
+        return model(
+            nombre=rng.choice(FIRST_NAMES),
+            apellido=rng.choice(LAST_NAMES),
+            dni=f"{kind[0].upper()}{index:08d}",
+            email=f"{kind}{index}@demo.local",
+            direccion=f"{rng.choice(STREETS)} {rng.randint(1, 5000)}",
+            telefono=f"11{rng.randint(10_000_000, 99_999_999)}",
+            activo=rng.random() < 0.9,
+        )
+
+    def staff(self, count):
+        """`count` vendedores y `count` choferes."""
+        start = Vendedor.objects.count()
+        self.vendedor_ids = self._bulk(Vendedor, (
+            self._person(Vendedor, start + index, 'vendedor') for index in range(count)
+        ), 'vendedores', count)
+        start = Chofer.objects.count()
+        self.chofer_ids = self._bulk(Chofer, (
+            self._person(Chofer, start + index, 'chofer') for index in range(count)
+        ), 'choferes', count)
+
+    def sales(self, count, days=60, max_lines=4):
+        """
+        Ventas de los últimos `days` días con sus líneas (sin descontar stock:
+        son datos de prueba). Los resúmenes diarios se recalculan en run().
+        """
+        if not self.product_ids:
+            return
+        rng = self.rng
+        client_ids = self._bulk(Client, (
+            Client(name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", phone=f"11{index:08d}")
+            for index in range(max(count // 5, 1))
+        ), 'clientes', max(count // 5, 1))
+        prices = dict(Product.objects.filter(pk__in=self.product_ids[:10_000]).values_list('pk', 'price'))
+        sample_ids = list(prices)
+        now = timezone.now()
+
+        sales, lines = [], []
+        for _ in range(count):
+            sale_lines = []
+            for product_id in rng.sample(sample_ids, min(rng.randint(1, max_lines), len(sample_ids))):
+                quantity = rng.randint(1, 5)
+                sale_lines.append(SaleLine(
+                    product_id=product_id, description=f"Producto {product_id}", quantity=quantity,
+                    unit_price=prices[product_id], line_total=prices[product_id] * quantity,
+                ))
+            sales.append(Sale(
+                date=now - datetime.timedelta(minutes=rng.randint(0, days * 24 * 60)),
+                client_id=rng.choice(client_ids),
+                vendedor_id=rng.choice(self.vendedor_ids) if self.vendedor_ids else None,
+                delivery_status=rng.choice(Sale.DeliveryStatus.values),
+                total=sum(line.line_total for line in sale_lines),
+            ))
+            lines.append(sale_lines)
+        sale_ids = self._bulk(Sale, iter(sales), 'ventas', count)
+        for sale_id, sale_lines in zip(sale_ids, lines):
+            for line in sale_lines:
+                line.sale_id = sale_id
+        self._bulk(SaleLine, (line for sale_lines in lines for line in sale_lines),
+                   'líneas de venta', sum(map(len, lines)))
+
+    def shipments(self, count):
+        rng = self.rng
+        today = timezone.localdate()
+        addresses = [f"{rng.choice(STREETS)} {rng.randint(1, 5000)}" for _ in range(count)]
+        self._bulk(Shipment, (
+            Shipment(
+                chofer_id=rng.choice(self.chofer_ids) if self.chofer_ids and rng.random() < 0.8 else None,
+                recipient=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                address=address,
+                status=rng.choice(Shipment.Status.values),
+                scheduled_date=today + datetime.timedelta(days=rng.randint(-3, 7)),
+            )
+            for address in addresses
+        ), 'envíos', count)
+        # Caché de direcciones a unos 15 km del local; una de cada diez queda sin coordenadas
+        latitude, longitude = store_location()
+        load_geocodes(
+            (address, latitude + rng.uniform(-0.13, 0.13), longitude + rng.uniform(-0.16, 0.16))
+            for address in dict.fromkeys(addresses) if rng.random() < 0.9
+        )
+
@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from products.models import Combo, ComboItem, Product
+from products.signals import combo_availability_changed, products_bulk_updated, stock_changed
+from sales.models import Sale
+
+from .notifications import sync_combo_notifications, sync_product_notifications
+from .stats import invalidate_stats
+
+
+@receiver(stock_changed)
+@receiver(products_bulk_updated)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Combo)
+@receiver(post_delete, sender=Combo)
+@receiver(post_save, sender=ComboItem)
+@receiver(post_delete, sender=ComboItem)
+@receiver(post_save, sender=Sale)
+def stats_data_changed(sender, **kwargs):
+    """
+    Invalida las estadísticas del panel al confirmar la transacción:
+    si se borraran antes, otra petición podría volver a cachear los datos viejos.
+    """
+    transaction.on_commit(invalidate_stats)
+
+
+@receiver(stock_changed)
+def stock_notifications(sender, product_ids, **kwargs):
+    """Abre o resuelve los avisos de stock solo de los productos que cambiaron."""
+    product_ids = list(product_ids)
+    transaction.on_commit(lambda: sync_product_notifications(product_ids))
+
+
+@receiver(products_bulk_updated)
+def bulk_update_notifications(sender, product_ids, fields, **kwargs):
+    # Al pasar a la papelera o volver (los no disponibles no avisan); precio o categoría no cambian los avisos
+    if 'available' in fields:
+        product_ids = list(product_ids)
+        transaction.on_commit(lambda: sync_product_notifications(product_ids))
+
+
+@receiver(post_save, sender=Product)
+def product_notifications(sender, instance, **kwargs):
+    # Alta, edición del punto de reposición o de la disponibilidad
+    transaction.on_commit(lambda: sync_product_notifications([instance.pk]))
+
+
+@receiver(combo_availability_changed)
+def combo_availability_notifications(sender, combo_ids, **kwargs):
+    combo_ids = list(combo_ids)
+    transaction.on_commit(lambda: sync_combo_notifications(combo_ids))
+
+
+@receiver(post_save, sender=Combo)
+def combo_notifications(sender, instance, created, **kwargs):
+    # Los combos nuevos se sincronizan al calcular su disponibilidad
+    if not created:
+        transaction.on_commit(lambda: sync_combo_notifications([instance.pk]))
@@ -0,0 +1,113 @@
+// Indicadores del panel: el endpoint responde 304 si los números no cambiaron
+const INTERVALO_INDICADORES = 60000;
+
+function cargarIndicadores(contenedor, moneda) {
+    fetch(contenedor.dataset.url, { cache: 'no-cache', credentials: 'same-origin' })
+        .then((response) => response.ok ? response.json() : null)
+        .then((stats) => {
+            if (!stats) {
+                return;
+            }
+            const campo = (nombre) => contenedor.querySelector(`[data-stat="${nombre}"]`);
+            campo('stock_value').textContent = moneda.format(parseFloat(stats.products.stock_value));
+            campo('out_of_stock').textContent = `${stats.products.out_of_stock} de ${stats.products.total}`;
+            campo('unbuildable_count').textContent = `${stats.combos.unbuildable_count} de ${stats.combos.total}`;
+            campo('unbuildable').textContent = stats.combos.unbuildable.map((combo) => combo.name).join(', ');
+            const lista = campo('top_sellers');
+            lista.replaceChildren(...stats.top_sellers.map((producto) => {
+                const item = document.createElement('li');
+                item.textContent = `${producto.name} (${producto.quantity})`;
+                return item;
+            }));
+        })
+        .catch(() => {});
+}
+
+// Gráficos del panel: los datos llegan ya agregados (resúmenes diarios de ventas)
+document.addEventListener('DOMContentLoaded', function () {
+    const moneda = new Intl.NumberFormat('es-AR', { style: 'currency', currency: 'ARS' });
+    const indicadores = document.getElementById('panelIndicadores');
+    if (indicadores) {
+        cargarIndicadores(indicadores, moneda);
+        setInterval(() => cargarIndicadores(indicadores, moneda), INTERVALO_INDICADORES);
+    }
+
+    const dataElement = document.getElementById('panel-data');
+    if (!dataElement || typeof Chart === 'undefined') {
+        return;
+    }
+    const data = JSON.parse(dataElement.textContent);
+    const colores = ['#0d6efd', '#198754', '#ffc107', '#dc3545', '#6f42c1', '#20c997', '#fd7e14', '#6c757d', '#0dcaf0', '#d63384'];
+
+    function opcionesMoneda(extra) {
+        return Object.assign({
+            responsive: true,
+            plugins: {
+                legend: { display: false },
+                tooltip: { callbacks: { label: (ctx) => moneda.format(ctx.parsed.y ?? ctx.parsed) } },
+            },
+        }, extra || {});
+    }
+
+    new Chart(document.getElementById('chartVentasDiarias'), {
+        type: 'line',
+        data: {
+            labels: data.daily.labels,
+            datasets: [{
+                label: 'Facturación',
+                data: data.daily.revenue,
+                borderColor: colores[0],
+                backgroundColor: 'rgba(13, 110, 253, 0.15)',
+                fill: true,
+                tension: 0.3,
+            }],
+        },
+        options: opcionesMoneda({ scales: { y: { beginAtZero: true } } }),
+    });
+
+    new Chart(document.getElementById('chartProductos'), {
+        type: 'bar',
+        data: {
+            labels: data.top_products.labels,
+            datasets: [{
+                label: 'Unidades',
+                data: data.top_products.quantity,
+                backgroundColor: colores[1],
+            }],
+        },
+        options: {
+            indexAxis: 'y',
+            responsive: true,
+            plugins: { legend: { display: false } },
+            scales: { x: { beginAtZero: true, ticks: { precision: 0 } } },
+        },
+    });
+
+    new Chart(document.getElementById('chartVendedores'), {
+        type: 'doughnut',
+        data: {
+            labels: data.vendedores.labels,
+            datasets: [{
+                data: data.vendedores.revenue,
+                backgroundColor: colores,
+            }],
+        },
+        options: opcionesMoneda({ plugins: {
+            legend: { position: 'bottom' },
+            tooltip: { callbacks: { label: (ctx) => `${ctx.label}: ${moneda.format(ctx.parsed)}` } },
+        } }),
+    });
+
+    new Chart(document.getElementById('chartMensual'), {
+        type: 'bar',
+        data: {
+            labels: data.monthly.labels,
+            datasets: [{
+                label: 'Facturación',
+                data: data.monthly.revenue,
+                backgroundColor: colores[4],
+            }],
+        },
+        options: opcionesMoneda({ scales: { y: { beginAtZero: true } } }),
+    });
+});
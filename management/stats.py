@@ -0,0 +1,71 @@
+"""
+Estadísticas del panel (valor del stock, productos sin stock, más vendidos,
+combos que no se pueden armar).
+
+Se calculan con pocas consultas agregadas y se guardan en la caché con un TTL
+corto. management/signals.py borra la entrada cuando cambian los datos.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.models import Combo, Product
+from sales.reports import top_products
+
+STATS_CACHE_KEY = 'management:panel-stats'
+STATS_CACHE_TTL = getattr(settings, 'STATS_CACHE_TTL', 60)
+TOP_SELLERS = 5
+UNBUILDABLE_COMBOS = 10
+
+
+def compute_stats():
+    """Arma el diccionario de estadísticas consultando la base."""
+    money = DecimalField(max_digits=14, decimal_places=2)
+    products = Product.objects.filter(available=True).aggregate(
+        total=Count('id'),
+        out_of_stock=Count('id', filter=Q(stock=0)),
+        units=Coalesce(Sum('stock'), 0),
+        stock_value=Coalesce(Sum(F('price') * F('stock'), output_field=money), 0, output_field=money),
+    )
+
+    combos = Combo.objects.filter(available=True).with_stored_availability()
+    unbuildable = combos.filter(max_buildable=0).order_by('name')
+    sellers = top_products(limit=TOP_SELLERS)
+
+    return {
+        'products': products,
+        'combos': {
+            'total': combos.count(),
+            'unbuildable_count': unbuildable.count(),
+            'unbuildable': list(unbuildable.values('id', 'name')[:UNBUILDABLE_COMBOS]),
+        },
+        'top_sellers': [
+            {'name': name, 'quantity': quantity}
+            for name, quantity in zip(sellers['labels'], sellers['quantity'])
+        ],
+        'generated': timezone.now(),
+    }
+
+
+def get_stats():
+    """
+    Devuelve {'data': ..., 'etag': ...} desde la caché, o lo calcula y lo guarda.
+    El ETag es el hash del JSON, así que solo cambia si cambian los números.
+    """
+    entry = cache.get(STATS_CACHE_KEY)
+    if entry is None:
+        data = compute_stats()
+        payload = json.dumps({k: v for k, v in data.items() if k != 'generated'}, cls=DjangoJSONEncoder, sort_keys=True)
+        entry = {'data': data, 'etag': hashlib.sha1(payload.encode()).hexdigest()}
+        cache.set(STATS_CACHE_KEY, entry, STATS_CACHE_TTL)
+    return entry
+
+
+def invalidate_stats():
+    cache.delete(STATS_CACHE_KEY)
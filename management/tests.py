@@ -1,3 +1,263 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.template.backends.django import Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from products.availability import refresh_combo_availability, verify_combo_availability
+from products.models import Combo, ComboItem, Product, StockMovement
+from products.stock import apply_movement
+from sales.models import DailySalesRollup, Sale
+from shipping.models import Shipment
+from Stockconf.db import REPORTS_DB, ReportsRouter, sqlite_options, use_reports_db
+
+from . import middleware
+from .benchmarks import QUERY_BUDGETS, run_view_benchmarks, sample_ids, uncovered_urls, view_cases
+from .models import Notification
+from .notifications import open_notifications, sync_combo_notifications, sync_product_notifications
+from .query_plans import QueryRecorder, analyze, suggest_index
+from .seeding import DemoSeeder
+
+
+class PanelStatsTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+        self.url = reverse('management:panel_stats')
+
+    def test_same_etag_answers_304_until_the_data_changes(self):
+        product = Product.objects.create(name='Mate', price=10, stock=3)
+        cache.clear()  # el alta invalidaría al confirmar; acá no hay commit
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['products']['units'], 3)
+        etag = response['ETag']
+
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movement(product, -3, StockMovement.Reason.SALE)
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(changed.json()['products']['out_of_stock'], 1)
+
+
+@override_settings(PERFORMANCE_MONITORING=True, PERFORMANCE_LOG=None)
+class PerformanceMiddlewareTests(TestCase):
+
+    def setUp(self):
+        # El middleware reemplaza Template.render al cargarse
+        self.addCleanup(setattr, Template, 'render', middleware._original_render)
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+
+    def test_reports_queries_and_timings_per_request(self):
+        with self.assertLogs('stockconf.performance', 'INFO') as logs:
+            response = self.client.get(reverse('products:product_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ consultas, \d+ repetidas", tpl;dur=')
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual((entry['url_name'], entry['status']), ('products:product_list', 200))
+        self.assertGreater(entry['queries'], 0)
+        self.assertGreater(entry['template_ms'], 0)
+
+    @override_settings(PERFORMANCE_MONITORING=False)
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse('products:product_list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertIs(Template.render, middleware._original_render)
+
+
+class PerfReportCommandTests(TestCase):
+
+    def test_percentiles_per_url(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'performance.jsonl')
+        with open(path, 'w', encoding='utf-8') as log:
+            for total in range(1, 21):
+                log.write(json.dumps({
+                    'url_name': 'products:product_list', 'total_ms': total, 'db_ms': 1, 'template_ms': 1,
+                    'queries': 4, 'duplicates': 0,
+                }) + '\n')
+            log.write('no es json\n')
+        output = io.StringIO()
+
+        call_command('perf_report', '--log', path, stdout=output)
+
+        row = output.getvalue().splitlines()[2].split()
+        self.assertEqual(row[:5], ['products:product_list', '20', '10.0', '19.0', '20.0'])
+
+
+class NotificationSyncTests(TestCase):
+
+    def _open(self):
+        return set(Notification.objects.filter(resolved__isnull=True).values_list('key', flat=True))
+
+    def test_product_notifications_follow_the_stock(self):
+        product = Product.objects.create(name='Mate', price=10, stock=10, reorder_point=5)
+        hidden = Product.objects.create(name='Termo', price=10, stock=0, available=False)
+        sync_product_notifications([product.pk, hidden.pk])
+        self.assertEqual(self._open(), set())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movement(product, -6, StockMovement.Reason.SALE)
+        self.assertEqual(self._open(), {f'low_stock:{product.pk}'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movement(product, -4, StockMovement.Reason.SALE)
+        self.assertEqual(self._open(), {f'out_of_stock:{product.pk}'})
+        self.assertEqual(Notification.objects.filter(resolved__isnull=False).count(), 1)
+
+        # Volver a sincronizar no duplica el aviso abierto
+        sync_product_notifications([product.pk])
+        self.assertEqual(Notification.objects.count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movement(product, 20, StockMovement.Reason.PURCHASE)
+        self.assertEqual(self._open(), set())
+
+    def test_combo_notifications_and_panel_limit(self):
+        product = Product.objects.create(name='Yerba', price=10, stock=1)
+        combo = Combo.objects.create(name='Kit')
+        ComboItem.objects.create(combo=combo, product=product, quantity=2)
+        refresh_combo_availability([combo.pk])
+
+        sync_combo_notifications([combo.pk])
+        self.assertEqual(self._open(), {f'combo_unavailable:{combo.pk}'})
+
+        Product.objects.filter(pk=product.pk).update(stock=2)
+        refresh_combo_availability([combo.pk])
+        sync_combo_notifications([combo.pk])
+        self.assertEqual(self._open(), set())
+
+        Product.objects.bulk_create(Product(name=f'P{index}', price=1, stock=0) for index in range(3))
+        sync_product_notifications(Product.objects.values_list('pk', flat=True))
+        rows, more = open_notifications(limit=2)
+        self.assertEqual((len(rows), more), (2, True))
+
+
+class _Discard(Exception):
+    """Deshace la siembra para volver a sembrar sobre la base vacía."""
+
+
+class SeedDemoTests(TestCase):
+
+    SIZES = ['--products', '60', '--categories', '2', '--branching', '3', '--combos', '5',
+             '--items-per-combo', '3', '--staff', '4', '--sales', '20', '--shipments', '10']
+
+    def _seed(self, *args):
+        call_command('seed_demo', *self.SIZES, *args, stdout=io.StringIO())
+        return {
+            'products': list(Product.objects.order_by('pk').values_list('code', 'name', 'price', 'stock', 'category_id')),
+            'combos': list(ComboItem.objects.order_by('pk').values_list('combo_id', 'product_id', 'quantity')),
+            'sales': list(Sale.objects.order_by('pk').values_list('vendedor_id', 'total')),
+            'shipments': list(Shipment.objects.order_by('pk').values_list('address', 'chofer_id', 'route_position')),
+        }
+
+    def _seed_and_discard(self, *args):
+        with self.assertRaises(_Discard), transaction.atomic():
+            fingerprint = self._seed(*args)
+            raise _Discard
+        return fingerprint
+
+    def test_same_seed_same_data(self):
+        first = self._seed_and_discard()
+        self.assertEqual(len(first['products']), 60)
+        self.assertEqual(self._seed_and_discard(), first)
+        self.assertNotEqual(self._seed_and_discard('--seed', '7'), first)
+
+    def test_derived_tables_are_rebuilt(self):
+        self._seed()
+        self.assertEqual(verify_combo_availability(), [])
+        self.assertTrue(DailySalesRollup.objects.exists())
+
+    def test_rejects_negative_sizes(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_demo', '--products', '-1', stdout=io.StringIO())
+
+
+class ViewBenchmarkTests(TestCase):
+
+    def test_every_view_answers_within_its_query_budget(self):
+        media = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media, MANIFEST_CACHE_DIR=os.path.join(media, 'manifests')))
+        DemoSeeder().run(products=40, category_depth=2, combos=4, items_per_combo=3, staff=3, sales=10, shipments=6)
+        cases = view_cases(sample_ids())
+        self.assertEqual(uncovered_urls(cases), [])
+        self.assertEqual({name for name, *_ in cases}, set(QUERY_BUDGETS))
+
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+        results = run_view_benchmarks(self.client, cases, repeat=1)
+
+        self.assertEqual({name: result['status'] for name, result in results.items() if result['status'] != 200}, {})
+        self.assertEqual(
+            {name: result['queries'] for name, result in results.items() if result['queries'] > result['budget']}, {},
+        )
+
+
+class IndexAdvisorTests(TestCase):
+
+    def _recorded(self, queryset):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            list(queryset)
+        return recorder.queries
+
+    def test_suggests_equality_then_range_then_order_columns(self):
+        sql, _ = Product.objects.filter(stock__gte=1, available=True).order_by('name').query.sql_with_params()
+        self.assertEqual(suggest_index('products_product', sql), (Product, ['available', 'stock', 'name']))
+
+        by_pk, _ = Product.objects.filter(pk=1, available=True).query.sql_with_params()
+        self.assertIsNone(suggest_index('products_product', by_pk))
+
+    def test_flags_scans_and_skips_declared_indexes(self):
+        Product.objects.bulk_create(Product(name=f'P{index}', price=1, stock=index % 3) for index in range(5))
+        cases = {
+            'sin índice': self._recorded(Product.objects.filter(description='x').order_by()),
+            'con índice': self._recorded(Product.objects.filter(available=True, stock=0).order_by()),
+        }
+
+        problems, proposals = analyze(cases, min_rows=5)
+
+        self.assertEqual({(problem['case'], problem['kind']) for problem in problems}, {('sin índice', 'scan')})
+        self.assertEqual(proposals, {(Product, ('description',)): ['sin índice']})
+        # Con pocas filas un SCAN es lo más barato: no se señala
+        self.assertEqual(analyze(cases, min_rows=6), ([], {}))
+
+
+class DatabaseProfileTests(TestCase):
+
+    def test_wal_is_opt_in(self):
+        default = sqlite_options()
+        self.assertEqual(default['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('PRAGMA busy_timeout=5000', default['init_command'])
+        self.assertNotIn('journal_mode', default['init_command'])
+
+        wal = sqlite_options(wal=True, query_only='ON')['init_command'].split(';')
+        self.assertIn('PRAGMA journal_mode=WAL', wal)
+        self.assertIn('PRAGMA synchronous=NORMAL', wal)
+        self.assertEqual(wal[-1], 'PRAGMA query_only=ON')
+
+    def test_reads_go_to_the_replica_only_inside_use_reports_db(self):
+        router = ReportsRouter()
+        with use_reports_db():
+            self.assertIsNone(router.db_for_read(Product))  # sin réplica configurada
+        with mock.patch.dict(settings.DATABASES, {REPORTS_DB: settings.DATABASES['default']}):
+            self.assertIsNone(router.db_for_read(Product))
+            with use_reports_db():
+                self.assertEqual(router.db_for_read(Product), REPORTS_DB)
+                self.assertEqual(router.db_for_write(Product), 'default')
+        self.assertFalse(router.allow_migrate(REPORTS_DB, 'products'))
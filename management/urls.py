@@ -7,4 +7,5 @@ urlpatterns = [
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('panel/', views.panel, name='panel'), # La URL para el panel
+    path('panel/stats/', views.panel_stats, name='panel_stats'),
 ]
\ No newline at end of file
@@ -2,6 +2,17 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from jobs.models import Job
+from sales.reports import dashboard_data
+from Stockconf.db import use_reports_db
+from .notifications import open_notifications
+from .stats import get_stats
+
+# Tareas en segundo plano que se listan en el panel
+RECENT_JOBS = 10
 
 def login_view(request):
     """
@@ -39,5 +50,35 @@ def panel(request):
     Vista del panel de administración principal.
     - Requiere que el usuario esté autenticado.
     - Muestra el template del panel con estadísticas y gráficos.
+    - Los gráficos se arman solo con los resúmenes diarios de ventas, leídos de la
+      réplica de reportes si está configurada.
+    - Los avisos salen de la tabla de abiertos (índice parcial), sin recorrer el catálogo.
+    - Las últimas tareas en segundo plano muestran su avance (se actualiza solo mientras corren).
+    """
+    with use_reports_db():
+        chart_data = dashboard_data()
+    notifications, more_notifications = open_notifications()
+    # Sin kwargs, resultado ni traceback: pueden ser grandes y el panel no los muestra
+    jobs = Job.objects.defer('kwargs', 'result', 'error')[:RECENT_JOBS]
+    return render(request, 'management/panel.html', {
+        'chart_data': chart_data,
+        'notifications': notifications,
+        'more_notifications': more_notifications,
+        'jobs': jobs,
+    })
+
+
+def _stats_etag(request):
+    return get_stats()['etag']
+
+
+@login_required(login_url='management:login')
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_stats_etag)
+def panel_stats(request):
+    """
+    Estadísticas del panel en JSON.
+    - Sale de la caché (TTL corto, invalidada por señales al guardar datos).
+    - Con If-None-Match y el mismo ETag responde 304 sin cuerpo.
     """
-    return render(request, 'management/panel.html')
+    return JsonResponse(get_stats()['data'])
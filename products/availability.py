@@ -0,0 +1,85 @@
+from django.db import transaction
+
+from .models import Combo, ComboAvailability, ComboItem
+from .utils import CHUNK_SIZE, chunks
+
+
+def combos_for_products(product_ids):
+    """Ids de los combos que contienen alguno de los productos indicados."""
+    combo_ids = set()
+    for chunk in chunks(product_ids):
+        combo_ids.update(
+            ComboItem.objects.filter(product_id__in=chunk).values_list('combo_id', flat=True)
+        )
+    return combo_ids
+
+
+def refresh_combo_availability(combo_ids):
+    """
+    Recalcula y guarda max_buildable solo para los combos indicados:
+    una consulta agregada y un upsert por bloque.
+    """
+    combo_ids = list(combo_ids)
+    updated = 0
+    for chunk in chunks(combo_ids):
+        rows = Combo.objects.filter(pk__in=chunk).with_buildable().values_list('pk', 'max_buildable')
+        ComboAvailability.objects.bulk_create(
+            [ComboAvailability(combo_id=pk, max_buildable=value) for pk, value in rows],
+            update_conflicts=True,
+            unique_fields=['combo'],
+            update_fields=['max_buildable', 'updated'],
+        )
+        updated += len(rows)
+    if updated:
+        from .signals import combo_availability_changed  # signals importa este módulo
+        combo_availability_changed.send(sender=ComboAvailability, combo_ids=combo_ids)
+    return updated
+
+
+def refresh_for_products(product_ids):
+    """Actualiza los combos afectados por un cambio de stock en estos productos."""
+    return refresh_combo_availability(combos_for_products(product_ids))
+
+
+def schedule_refresh(combo_ids=(), product_ids=()):
+    """
+    Programa la actualización para cuando se confirme la transacción actual,
+    así un rollback no deja la tabla desincronizada y los borrados en cascada
+    ya terminaron cuando se recalcula.
+    """
+    combo_ids = set(combo_ids)
+    product_ids = set(product_ids)
+    if not combo_ids and not product_ids:
+        return
+
+    def run():
+        ids = combo_ids | combos_for_products(product_ids) if product_ids else combo_ids
+        refresh_combo_availability(ids)
+
+    transaction.on_commit(run)
+
+
+def rebuild_combo_availability(batch_size=CHUNK_SIZE):
+    """Reconstruye la tabla completa. Devuelve la cantidad de combos procesados."""
+    ids = list(Combo.objects.values_list('pk', flat=True))
+    total = 0
+    for chunk in chunks(ids, batch_size):
+        total += refresh_combo_availability(chunk)
+    return total
+
+
+def verify_combo_availability(batch_size=CHUNK_SIZE):
+    """
+    Compara la tabla contra el cálculo en vivo.
+    Devuelve una lista de (combo_id, guardado, en_vivo) con las diferencias.
+    """
+    mismatches = []
+    live = (
+        Combo.objects.with_buildable()
+        .values_list('pk', 'max_buildable', 'availability__max_buildable')
+        .order_by('pk')
+    )
+    for pk, expected, stored in live.iterator(chunk_size=batch_size):
+        if stored != expected:
+            mismatches.append((pk, stored, expected))
+    return mismatches
@@ -0,0 +1,94 @@
+"""
+Acciones masivas sobre productos (product_list y product_trash).
+
+Cada acción es un solo UPDATE (o un DELETE) sobre el queryset elegido, dentro
+de una transacción: los productos marcados (ids) o todos los que coinciden con
+los filtros del listado. Como update() no dispara post_save, al final se envía
+products_bulk_updated con los ids afectados (avisos y estadísticas del panel).
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .filters import filter_products
+from .models import Product
+from .signals import products_bulk_updated, products_deleting
+
+
+class BulkAction:
+    TRASH = 'trash'
+    RESTORE = 'restore'
+    DELETE = 'delete'
+    SET_CATEGORY = 'set_category'
+    TOGGLE = 'toggle'
+
+    choices = [
+        (TRASH, "Mover a la papelera"),
+        (RESTORE, "Restaurar"),
+        (SET_CATEGORY, "Cambiar categoría"),
+        (TOGGLE, "Alternar disponibilidad"),
+        (DELETE, "Eliminar permanentemente"),
+    ]
+
+
+# Cada listado muestra solo sus productos y solo ofrece las acciones que tienen sentido ahí
+ORIGINS = {
+    'list': {'available': True, 'actions': [BulkAction.TRASH, BulkAction.SET_CATEGORY, BulkAction.TOGGLE]},
+    'trash': {
+        'available': False,
+        'actions': [BulkAction.RESTORE, BulkAction.SET_CATEGORY, BulkAction.TOGGLE, BulkAction.DELETE],
+    },
+}
+
+
+def bulk_queryset(origin, ids=None, filters=None):
+    """
+    Productos del listado `origin` a los que se aplica la acción: los `ids`
+    marcados o, si `ids` es None, todos los que coinciden con `filters`.
+    """
+    products = Product.objects.filter(available=ORIGINS[origin]['available'])
+    if ids is None:
+        return filter_products(products, filters or {})
+    return products.filter(pk__in=ids)
+
+
+def delete_products(products):
+    """
+    Borra `products` con un QuerySet.delete() (y sus cascadas). Antes avisa
+    con products_deleting, en la misma transacción. Devuelve (ids, cantidad borrada).
+    """
+    with transaction.atomic():
+        # Los ids se leen antes: después del borrado ya no hay cómo saber cuáles eran
+        product_ids = list(products.values_list('pk', flat=True))
+        if not product_ids:
+            return [], 0
+        products_deleting.send(sender=Product, product_ids=product_ids)
+        _, deleted = products.delete()
+    return product_ids, deleted.get(Product._meta.label, 0)
+
+
+def apply_bulk_action(products, action, category=None):
+    """
+    Aplica `action` a `products` y devuelve la cantidad de productos afectados.
+    - trash / restore / toggle / set_category: un UPDATE.
+    - delete: delete_products (un QuerySet.delete() con sus borrados en cascada);
+      solo borra productos que ya están en la papelera.
+    """
+    with transaction.atomic():
+        if action == BulkAction.DELETE:
+            product_ids, count = delete_products(products.filter(available=False))
+            fields = []
+        else:
+            changes = {
+                BulkAction.TRASH: {'available': False},
+                BulkAction.RESTORE: {'available': True},
+                BulkAction.TOGGLE: {'available': ~F('available')},
+                BulkAction.SET_CATEGORY: {'category': category},
+            }[action]
+            # Misma transacción (IMMEDIATE en SQLite): los ids leídos son los que se actualizan
+            product_ids = list(products.values_list('pk', flat=True))
+            count = products.update(updated=timezone.now(), **changes)
+            fields = list(changes)
+        if product_ids:
+            products_bulk_updated.send(sender=Product, product_ids=product_ids, fields=fields)
+    return count
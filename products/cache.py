@@ -0,0 +1,134 @@
+"""
+Caché versionada del árbol de categorías.
+
+Las categorías casi nunca cambian, así que el árbol completo se arma con una
+sola consulta y se guarda en la caché bajo una clave que incluye la versión.
+La versión sale de los datos (cantidad de categorías y última modificación):
+es la misma en todos los procesos y cambia apenas se confirma un cambio, sin
+esperar a que venza nada.
+
+Cada proceso además recuerda el último árbol leído, así que mientras la
+versión no cambie no hay ni consultas ni deserialización. La versión se
+consulta una vez por petición (ver `category_version`).
+"""
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
+from django.db.models import Count, Max
+from django.dispatch import receiver
+
+from .models import Category
+
+CATEGORY_TREE_KEY = 'products:category-tree:%s'
+# Las entradas de versiones viejas quedan huérfanas y vencen solas
+CATEGORY_CACHE_TTL = getattr(settings, 'CATEGORY_CACHE_TTL', 300)
+
+# Último árbol leído por este proceso
+_local_tree = None
+# Versión ya consultada en la petición en curso
+_request = Local()
+
+
+class CategoryTree:
+    """
+    Árbol de categorías en memoria (instancias de Category, solo lectura).
+    - `roots`: categorías raíz ordenadas por nombre, cada una con `tree_children`.
+    - Búsqueda por id, hijos y descendientes sin consultar la base.
+    """
+
+    def __init__(self, version, categories):
+        self.version = version
+        self.by_id = {category.pk: category for category in categories}
+        self.roots = []
+        for category in categories:
+            category.tree_children = []
+        for category in categories:  # ya vienen ordenadas por nombre
+            parent = self.by_id.get(category.parent_id)
+            if parent is not None:
+                parent.tree_children.append(category)
+            else:
+                self.roots.append(category)
+
+    def __iter__(self):
+        """Todas las categorías, ordenadas por nombre."""
+        return iter(sorted(self.by_id.values(), key=lambda category: category.name))
+
+    def get(self, pk):
+        try:
+            return self.by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def children_of(self, pk):
+        category = self.get(pk)
+        return category.tree_children if category is not None else []
+
+    def descendant_ids(self, pk, include_self=True):
+        """Ids de la categoría y de todas sus subcategorías (por prefijo del path)."""
+        category = self.get(pk)
+        if category is None:
+            return []
+        return [
+            other.pk for other in self.by_id.values()
+            if other.path.startswith(category.path) and (include_self or other.pk != category.pk)
+        ]
+
+    def payload(self):
+        """
+        Mapa padre → hijos para el navegador: {"": [[id, nombre], ...], "<id>": [...]}.
+        La clave "" son las categorías raíz; las hojas no aparecen.
+        """
+        tree = {'': [[root.pk, root.name] for root in self.roots]}
+        for category in self:
+            if category.tree_children:
+                tree[str(category.pk)] = [[child.pk, child.name] for child in category.tree_children]
+        return {'version': self.version, 'tree': tree}
+
+
+@receiver(request_started)
+def _start_request(sender, **kwargs):
+    _request.active = True
+    _request.version = None
+
+
+@receiver(request_finished)
+def _finish_request(sender, **kwargs):
+    _request.active = False
+    _request.version = None
+
+
+def category_version():
+    """
+    Versión del árbol: "<cantidad>-<última modificación>". Dentro de una petición
+    se consulta una sola vez; fuera de ellas (comandos, tareas), en cada llamada.
+    """
+    if getattr(_request, 'active', False) and _request.version is not None:
+        return _request.version
+    stats = Category.objects.aggregate(count=Count('id'), updated=Max('updated'))
+    updated = f"{stats['updated']:%Y%m%d%H%M%S%f}" if stats['updated'] else '0'
+    version = f"{stats['count']}-{updated}"
+    if getattr(_request, 'active', False):
+        _request.version = version
+    return version
+
+
+def forget_category_version():
+    """Tras guardar o borrar una Category en esta petición, la versión se vuelve a consultar."""
+    _request.version = None
+
+
+def get_category_tree():
+    """Devuelve el CategoryTree de la versión vigente, armándolo si hace falta."""
+    global _local_tree
+    version = category_version()
+    tree = _local_tree
+    if tree is not None and tree.version == version:
+        return tree
+    key = CATEGORY_TREE_KEY % version
+    tree = cache.get(key)
+    if tree is None:
+        tree = CategoryTree(version, list(Category.objects.order_by('name')))
+        cache.set(key, tree, CATEGORY_CACHE_TTL)
+    _local_tree = tree
+    return tree
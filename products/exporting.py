@@ -0,0 +1,79 @@
+import csv
+import json
+from decimal import Decimal
+
+from .filters import filter_products
+from .models import Combo, Product
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+KINDS = ('products', 'combos')
+CHUNK_SIZE = 2000
+_CENTS = Decimal('0.01')
+
+PRODUCT_COLUMNS = ['id', 'code', 'name', 'description', 'category', 'price', 'stock', 'available']
+COMBO_COLUMNS = ['id', 'name', 'description', 'price', 'max_buildable', 'available', 'items']
+
+
+class _Echo:
+    """Buffer mínimo para csv.writer: devuelve la línea en lugar de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def product_rows(filters, chunk_size=CHUNK_SIZE):
+    """Productos del listado (mismos filtros que product_list), de a bloques."""
+    products = filter_products(Product.objects.filter(available=True), filters)
+    products = products.select_related('category').only(
+        'id', 'code', 'name', 'description', 'price', 'stock', 'available', 'category__name'
+    ).order_by('name', 'id')
+    for product in products.iterator(chunk_size=chunk_size):
+        yield {
+            'id': product.pk,
+            'code': product.code or '',
+            'name': product.name,
+            'description': product.description,
+            'category': product.category.name if product.category else '',
+            'price': str(product.price),
+            'stock': product.stock,
+            'available': product.available,
+        }
+
+
+def combo_rows(chunk_size=CHUNK_SIZE):
+    """Combos con precio calculado, stock armable y sus productos."""
+    combos = Combo.objects.with_price().with_stored_availability().with_items().order_by('name', 'id')
+    for combo in combos.iterator(chunk_size=chunk_size):
+        yield {
+            'id': combo.pk,
+            'name': combo.name,
+            'description': combo.description or '',
+            'price': str(combo.computed_price.quantize(_CENTS)),
+            'max_buildable': combo.max_buildable,
+            'available': combo.available,
+            'items': '|'.join(
+                f"{item.quantity}x{item.product.code or item.product.name}" for item in combo.items.all()
+            ),
+        }
+
+
+def export_lines(kind, export_format, filters=None, chunk_size=CHUNK_SIZE):
+    """Genera el catálogo línea por línea; la memoria no depende del tamaño del catálogo."""
+    if kind == 'combos':
+        rows, columns = combo_rows(chunk_size), COMBO_COLUMNS
+    else:
+        rows, columns = product_rows(filters or {}, chunk_size), PRODUCT_COLUMNS
+
+    if export_format == 'jsonl':
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+        return
+
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        row['available'] = int(row['available'])
+        yield writer.writerow([row[column] for column in columns])
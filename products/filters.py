@@ -0,0 +1,34 @@
+from .cache import get_category_tree
+from .search import search_products
+
+
+def get_product_filters(params):
+    """
+    Lee los filtros del listado de productos desde un QueryDict (request.GET).
+    """
+    return {
+        'category': params.get('category'),
+        'status': params.get('status'),
+        'search': params.get('search') or '',  # <- evita "None"
+    }
+
+
+def filter_products(products, filters):
+    """
+    Aplica búsqueda, categoría y estado de stock a un queryset de productos.
+    Se usa desde el listado y desde cualquier vista que deba respetar los mismos filtros.
+    """
+    search_query = filters.get('search')
+    category_filter = filters.get('category')
+    status_filter = filters.get('status')
+
+    if search_query:
+        products = search_products(products, search_query)
+    if category_filter:
+        # Incluye las subcategorías de la categoría elegida (ids desde el árbol cacheado)
+        products = products.filter(category_id__in=get_category_tree().descendant_ids(category_filter))
+    if status_filter == 'in_stock':
+        products = products.filter(stock__gt=0)
+    elif status_filter == 'out_of_stock':
+        products = products.filter(stock__exact=0)
+    return products
@@ -1,8 +1,16 @@
 from django import forms
-from django.forms import inlineformset_factory
-from .models import Product, Category, Combo, ComboItem
+from django.core.exceptions import ValidationError
+from django.forms import BaseInlineFormSet, inlineformset_factory
+from django.urls import reverse
+from .bulk import ORIGINS, BulkAction
+from .cache import get_category_tree
+from .models import Product, Category, Combo, ComboItem, Repricing
 
 
+def _set_choices(field, categories):
+    """Opciones de un ModelChoiceField armadas en memoria (no consulta la base al renderizar)."""
+    field.choices = [('', field.empty_label)] + [(category.pk, category.name) for category in categories]
+
 
 class ProductForm(forms.ModelForm):
     parent_category = forms.ModelChoiceField(
@@ -11,10 +19,15 @@ class ProductForm(forms.ModelForm):
         label="Categoría",
         widget=forms.Select(attrs={'class': 'form-control'})
     )
+    # Stock que vio el usuario al abrir el formulario: al guardar se aplica
+    # solo la diferencia, sin pisar ventas u otras ediciones simultáneas
+    original_stock = forms.IntegerField(required=False, widget=forms.HiddenInput)
 
     class Meta:
         model = Product
-        fields = ['code', 'name', 'description', 'parent_category', 'category', 'price', 'stock', 'available']
+        fields = [
+            'code', 'name', 'description', 'parent_category', 'category', 'price', 'stock', 'reorder_point', 'available',
+        ]
         widgets = {
             'code': forms.TextInput(attrs={'class': 'form-control'}),
             'name': forms.TextInput(attrs={'class': 'form-control'}),
@@ -22,6 +35,7 @@ class ProductForm(forms.ModelForm):
             'category': forms.Select(attrs={'class': 'form-control'}),
             'price': forms.NumberInput(attrs={'class': 'form-control'}),
             'stock': forms.NumberInput(attrs={'class': 'form-control'}),
+            'reorder_point': forms.NumberInput(attrs={'class': 'form-control', 'min': 0}),
             'available': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
@@ -31,28 +45,178 @@ class ProductForm(forms.ModelForm):
         # Alta → disponible = True
         if not self.instance.pk:
             self.fields['available'].initial = True
+        else:
+            self.fields['original_stock'].initial = self.instance.stock
 
-        # Si estamos en POST → usar el padre enviado para armar el queryset
+        # Las opciones salen del árbol cacheado; el queryset solo se usa al validar
+        tree = get_category_tree()
+        children = []
         if 'parent_category' in self.data:
-            try:
-                parent_id = int(self.data.get('parent_category'))
-                self.fields['category'].queryset = Category.objects.filter(parent_id=parent_id)
-            except (ValueError, TypeError):
+            # Si estamos en POST → usar el padre enviado para armar el queryset
+            parent = tree.get(self.data.get('parent_category'))
+            if parent is not None:
+                self.fields['category'].queryset = Category.objects.filter(parent_id=parent.pk)
+                children = parent.tree_children
+            else:
                 self.fields['category'].queryset = Category.objects.none()
-        elif self.instance.pk and self.instance.category:
+        elif self.instance.pk and tree.get(self.instance.category_id):
             # Caso edición
-            cat = self.instance.category
-            if cat.parent:
-                self.fields['parent_category'].initial = cat.parent
-                self.fields['category'].queryset = Category.objects.filter(parent=cat.parent)
-                self.fields['category'].initial = cat
+            cat = tree.get(self.instance.category_id)
+            if cat.parent_id:
+                self.fields['parent_category'].initial = cat.parent_id
+                self.fields['category'].queryset = Category.objects.filter(parent_id=cat.parent_id)
+                self.fields['category'].initial = cat.pk
+                children = tree.children_of(cat.parent_id)
             else:
-                self.fields['parent_category'].initial = cat
-                self.fields['category'].queryset = Category.objects.filter(parent=cat)
+                self.fields['parent_category'].initial = cat.pk
+                self.fields['category'].queryset = Category.objects.filter(parent_id=cat.pk)
                 self.fields['category'].initial = None
+                children = cat.tree_children
         else:
             # Alta vacía
             self.fields['category'].queryset = Category.objects.none()
+        _set_choices(self.fields['parent_category'], tree.roots)
+        _set_choices(self.fields['category'], children)
+
+    def stock_delta(self):
+        """Diferencia entre el stock ingresado y el que se mostró al editar."""
+        original = self.cleaned_data.get('original_stock')
+        if original is None:
+            original = self.instance._loaded_stock if self.instance.pk else 0
+        return self.cleaned_data['stock'] - original
+
+class ProductImportForm(forms.ModelForm):
+    """
+    Valida una fila de importación con las mismas reglas de campo que ProductForm.
+    La categoría y la unicidad del código las resuelve el importador por lotes.
+    """
+
+    class Meta:
+        model = Product
+        fields = ['code', 'name', 'description', 'price', 'stock', 'reorder_point', 'available']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # El código identifica al producto al importar
+        self.fields['code'].required = True
+        # Columna opcional: vacía = sin aviso de reposición
+        self.fields['reorder_point'].required = False
+
+    def clean_reorder_point(self):
+        return self.cleaned_data.get('reorder_point') or 0
+
+    def validate_unique(self):
+        pass
+
+class ImportFileForm(forms.Form):
+    file = forms.FileField(
+        label="Archivo (CSV o XLSX)",
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.xlsx'})
+    )
+    batch_size = forms.IntegerField(
+        label="Filas por lote",
+        initial=1000,
+        min_value=1,
+        max_value=10000,
+        widget=forms.NumberInput(attrs={'class': 'form-control'})
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError("El archivo debe ser .csv o .xlsx")
+        return upload
+
+
+class IdListField(forms.TypedMultipleChoiceField):
+    """Lista de ids enteros sin opciones fijas: los que no existen simplemente no se actualizan."""
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {'invalid_choice': "«%(value)s» no es un id de producto válido."}
+
+    def __init__(self, **kwargs):
+        super().__init__(coerce=int, **kwargs)
+
+    def valid_value(self, value):
+        return True
+
+
+class BulkActionForm(forms.Form):
+    """
+    Acción masiva de product_list / product_trash (ver products/bulk.py).
+    - `ids`: casillas marcadas; con `select_all` se ignoran y se usan los filtros
+      (search, category, status) que venían en el listado.
+    - `new_category`: destino de "Cambiar categoría" (vacío = sin categoría).
+    """
+    origin = forms.ChoiceField(choices=[('list', 'list'), ('trash', 'trash')], widget=forms.HiddenInput)
+    action = forms.ChoiceField(choices=BulkAction.choices, label="Acción")
+    ids = IdListField(required=False)
+    select_all = forms.BooleanField(required=False)
+    # No se llama "category": ese nombre es el filtro del listado
+    new_category = forms.ModelChoiceField(queryset=Category.objects.all(), required=False, empty_label="Sin categoría")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        origin, action = cleaned_data.get('origin'), cleaned_data.get('action')
+        if origin and action and action not in ORIGINS[origin]['actions']:
+            raise forms.ValidationError("Esa acción no está disponible en este listado.")
+        if not cleaned_data.get('select_all') and not cleaned_data.get('ids') and 'ids' not in self.errors:
+            raise forms.ValidationError("No hay productos seleccionados.")
+        return cleaned_data
+
+
+class RepricingForm(forms.Form):
+    """
+    Cambio de precios masivo (ver products/pricing.py): los filtros del listado
+    (search, category, status) eligen los productos y mode/value/rounding el cambio.
+    """
+    search = forms.CharField(required=False, label="Buscar", widget=forms.TextInput(attrs={'class': 'form-control'}))
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(), required=False, empty_label="Todas las categorías", label="Categoría",
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    status = forms.ChoiceField(
+        choices=[('', "Todos los estados"), ('in_stock', "En Stock"), ('out_of_stock', "Sin Stock")],
+        required=False, label="Estado de Stock", widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    include_unavailable = forms.BooleanField(
+        required=False, label="Incluir productos de la papelera",
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
+    mode = forms.ChoiceField(
+        choices=Repricing.Mode.choices, label="Tipo de cambio", widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    value = forms.DecimalField(
+        max_digits=10, decimal_places=2, label="Valor",
+        help_text="Porcentaje o monto a sumar; negativo para bajar precios.",
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
+    )
+    rounding = forms.ChoiceField(
+        choices=Repricing.Rounding.choices, label="Redondeo", widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Opciones desde el árbol cacheado, como en ProductForm
+        _set_choices(self.fields['category'], get_category_tree())
+
+    def clean(self):
+        cleaned_data = super().clean()
+        mode, value = cleaned_data.get('mode'), cleaned_data.get('value')
+        if value is not None and value == 0:
+            self.add_error('value', "El valor no puede ser cero.")
+        elif mode == Repricing.Mode.PERCENT and value is not None and value <= -100:
+            self.add_error('value', "Una baja del 100% o más deja los precios en cero.")
+        return cleaned_data
+
+    def filters(self):
+        """Los filtros en el formato de filter_products (y de Repricing.filters)."""
+        category = self.cleaned_data.get('category')
+        return {
+            'search': self.cleaned_data.get('search') or '',
+            'category': str(category.pk) if category else None,
+            'status': self.cleaned_data.get('status') or None,
+        }
+
 
 class CategoryForm(forms.ModelForm):
     class Meta:
@@ -85,19 +249,100 @@ class ComboForm(forms.ModelForm):
             return None
         return value
 
+def product_label(code, name):
+    """Texto de un producto en el autocompletado (igual en el HTML y en el JSON)."""
+    return f"{code} - {name}" if code else name
+
+
+class ProductAutocompleteWidget(forms.Select):
+    """
+    Select de productos que solo renderiza la opción elegida; el resto se
+    carga en el navegador desde products:product_autocomplete al buscar.
+    - `labels` ({id: texto}) lo completa el formset con los productos precargados.
+    """
+
+    def __init__(self, attrs=None):
+        attrs = {'class': 'form-select item-product', **(attrs or {})}
+        super().__init__(attrs)
+        self.labels = None
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse('products:product_autocomplete')
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [str(pk) for pk in value if pk not in ('', None)]
+        labels = self.labels
+        if labels is None:
+            labels = {
+                str(pk): product_label(code, name)
+                for pk, code, name in Product.objects.filter(pk__in=selected).values_list('pk', 'code', 'name')
+            }
+        groups = [(None, [self.create_option(name, '', '---------', not selected, 0)], 0)]
+        for index, pk in enumerate(selected, start=1):
+            if pk in labels:
+                groups.append((None, [self.create_option(name, pk, labels[pk], True, index)], index))
+        return groups
+
+
+class ProductChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField que resuelve el producto elegido desde `preloaded`
+    ({id: Product}) cuando el formset ya los cargó, sin una consulta por fila.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.preloaded = None
+
+    def to_python(self, value):
+        if self.preloaded is None or value in self.empty_values:
+            return super().to_python(value)
+        try:
+            return self.preloaded[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+
+
 class ComboItemForm(forms.ModelForm):
     class Meta:
         model = ComboItem
         fields = ['product', 'quantity']
+        field_classes = {'product': ProductChoiceField}
         widgets = {
-            'product': forms.Select(attrs={'class': 'form-control'}),
+            'product': ProductAutocompleteWidget(),
             'quantity': forms.NumberInput(attrs={'class': 'form-control', 'min': 1}),
         }
 
+class BaseComboItemFormSet(BaseInlineFormSet):
+    """
+    Carga una sola vez los productos de todas las filas (los ya guardados y
+    los enviados en el POST) y los comparte con cada formulario, tanto para
+    validar como para mostrar la opción elegida.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        ids = set()
+        for form in self.forms:
+            value = form['product'].value()
+            if value not in (None, ''):
+                try:
+                    ids.add(int(value))
+                except (TypeError, ValueError):
+                    pass
+        products = Product.objects.in_bulk(ids)
+        labels = {str(pk): product_label(product.code, product.name) for pk, product in products.items()}
+        for form in self.forms:
+            form.fields['product'].preloaded = products
+            form.fields['product'].widget.labels = labels
+
 # Inline formset para relacionar Combo con ComboItems
 ComboItemFormSet = inlineformset_factory(
     Combo, ComboItem,
     form=ComboItemForm,
+    formset=BaseComboItemFormSet,
     extra=1,          # cantidad de formularios vacíos iniciales
     can_delete=True   # permitir eliminar productos del combo
 )
\ No newline at end of file
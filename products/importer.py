@@ -0,0 +1,235 @@
+import codecs
+import csv
+import io
+import time
+import unicodedata
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+
+from .forms import ProductImportForm
+from .models import Category, Product, StockMovement
+from .signals import stock_changed
+from .stock import apply_movements
+
+# Encabezados aceptados (normalizados) → campo del producto
+HEADERS = {
+    'code': 'code', 'codigo': 'code', 'cod': 'code', 'sku': 'code',
+    'name': 'name', 'nombre': 'name', 'producto': 'name',
+    'description': 'description', 'descripcion': 'description',
+    'category': 'category', 'categoria': 'category', 'subcategoria': 'category',
+    'price': 'price', 'precio': 'price',
+    'stock': 'stock', 'cantidad': 'stock',
+    'reorder_point': 'reorder_point', 'punto de reposicion': 'reorder_point', 'reposicion': 'reorder_point',
+    'minimo': 'reorder_point', 'stock minimo': 'reorder_point',
+    'available': 'available', 'disponible': 'available',
+}
+TRUE_VALUES = {'1', 'si', 'sí', 'true', 'yes', 'x', 'on', 'verdadero'}
+UPDATE_FIELDS = ['name', 'description', 'category', 'price', 'stock', 'reorder_point', 'available', 'updated']
+# Errores guardados con detalle; el resto solo se cuenta
+MAX_ERRORS = 100
+
+
+def _normalize(value):
+    value = unicodedata.normalize('NFKD', str(value).strip().lower())
+    return ''.join(char for char in value if not unicodedata.combining(char))
+
+
+def _cell(value):
+    """Celda de planilla → texto (los números enteros de Excel llegan como float)."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _map_header(header):
+    return [HEADERS.get(_normalize(column)) for column in header]
+
+
+def _decode_cp1252(error):
+    """Bytes que no son UTF-8 válido: se leen como cp1252 (los CSV que guarda Excel)."""
+    return error.object[error.start:error.end].decode('cp1252', errors='replace'), error.end
+
+
+codecs.register_error('importer_cp1252', _decode_cp1252)
+
+
+def _sniff(first_line):
+    if not first_line.strip():
+        return csv.excel
+    try:
+        return csv.Sniffer().sniff(first_line, delimiters=',;\t')
+    except csv.Error:
+        # Una sola columna o separador no reconocido: se lee como CSV con comas
+        return csv.excel
+
+
+def read_csv(binary_file):
+    """
+    Lee un CSV fila por fila (separador , ; o tab) sin cargarlo entero en memoria.
+    Acepta UTF-8 y, para lo que no lo sea, cp1252/latin-1.
+    """
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', errors='importer_cp1252', newline='')
+    first_line = text.readline()
+    dialect = _sniff(first_line)
+    header = _map_header(next(csv.reader([first_line], dialect)))
+    for values in csv.reader(text, dialect):
+        yield {field: _cell(value) for field, value in zip(header, values) if field}
+
+
+def read_xlsx(binary_file):
+    """Lee la primera hoja de un XLSX en modo streaming (read_only)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = _map_header(_cell(value) for value in next(rows, ()))
+        for values in rows:
+            yield {field: _cell(value) for field, value in zip(header, values) if field}
+    finally:
+        workbook.close()
+
+
+def read_rows(binary_file, filename):
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx(binary_file)
+    return read_csv(binary_file)
+
+
+class ImportResult:
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.error_count = 0
+        self.errors = []  # (línea, mensaje)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+
+class ProductImporter:
+    """
+    Importa productos por lotes identificándolos por `code`:
+    - Valida cada fila con ProductImportForm.
+    - Resuelve la categoría por nombre o slug con un mapa en memoria.
+    - Por lote: una consulta de códigos existentes, bulk_create y bulk_update.
+    - Los cambios de stock se aplican con apply_movements (F('stock') + delta) y
+      quedan en el ledger como movimientos de importación.
+    """
+
+    def __init__(self, batch_size=1000, progress=None):
+        self.batch_size = batch_size
+        self.progress = progress
+        self.categories = {}
+        for pk, name, slug in Category.objects.values_list('pk', 'name', 'slug'):
+            self.categories[_normalize(name)] = pk
+            self.categories[slug] = pk
+
+    def run(self, rows):
+        result = ImportResult()
+        numbered = enumerate(rows, start=2)  # línea 1 = encabezado
+        while True:
+            chunk = list(islice(numbered, self.batch_size))
+            if not chunk:
+                break
+            batch = {}
+            columns = set()
+            for line, row in chunk:
+                result.rows += 1
+                columns.update(row)
+                product = self._build(line, row, result)
+                if product is not None:
+                    batch[product.code] = product  # el último gana si el código se repite
+            if batch:
+                self._write(list(batch.values()), columns, result)
+            result.elapsed = time.perf_counter() - result.started
+            if self.progress:
+                self.progress(result)
+        result.elapsed = time.perf_counter() - result.started
+        return result
+
+    def _build(self, line, row, result):
+        data = dict(row)
+        data['available'] = 'on' if _normalize(data.get('available') or 'si') in TRUE_VALUES else ''
+        if ',' in data.get('price', '') and '.' not in data['price']:
+            data['price'] = data['price'].replace(',', '.')
+
+        form = ProductImportForm(data)
+        if not form.is_valid():
+            errors = '; '.join(f"{field}: {' '.join(messages)}" for field, messages in form.errors.items())
+            result.add_error(line, errors)
+            return None
+
+        product = form.save(commit=False)
+        category = data.get('category')
+        if category:
+            category_id = self.categories.get(_normalize(category)) or self.categories.get(category)
+            if category_id is None:
+                result.add_error(line, f"category: no existe la categoría «{category}»")
+                return None
+            product.category_id = category_id
+        return product
+
+    def _write(self, products, columns, result):
+        # Al actualizar solo se pisan las columnas que trae el archivo
+        compare_fields = [field for field in UPDATE_FIELDS if field in columns]
+        attnames = [Product._meta.get_field(field).attname for field in compare_fields]
+        # El stock nunca se escribe como valor absoluto: pasa por el ledger como delta
+        update_fields = [field for field in compare_fields if field != 'stock'] + ['updated']
+        now = timezone.now()
+        with transaction.atomic():
+            # Lectura dentro de la transacción: el delta se calcula sobre el stock vigente
+            existing = {
+                row[0]: row[1:]
+                for row in Product.objects.filter(
+                    code__in=[product.code for product in products]
+                ).values_list('code', 'pk', *attnames)
+            }
+            to_create, to_update, movements = [], [], []
+            for product in products:
+                product.updated = now
+                if product.code not in existing:
+                    to_create.append(product)
+                    continue
+                pk, *current = existing[product.code]
+                product.pk = pk
+                old = dict(zip(attnames, current))
+                # Las filas sin cambios no se reescriben
+                if all(getattr(product, attname) == old[attname] for attname in attnames):
+                    result.unchanged += 1
+                    continue
+                to_update.append(product)
+                if 'stock' in old and product.stock != old['stock']:
+                    movements.append(StockMovement(
+                        product_id=pk, delta=product.stock - old['stock'],
+                        reason=StockMovement.Reason.IMPORT,
+                    ))
+
+            Product.objects.bulk_create(to_create)
+            Product.objects.bulk_update(to_update, update_fields)
+            # UPDATE condicional con F('stock') + delta; también agenda el refresco de combos
+            apply_movements(movements, allow_negative=True)
+            # Los productos nuevos nacen con su stock y todavía no forman parte de ningún combo
+            StockMovement.objects.bulk_create(
+                StockMovement(product_id=product.pk, delta=product.stock, reason=StockMovement.Reason.IMPORT)
+                for product in to_create if product.stock
+            )
+            if to_create:
+                stock_changed.send(sender=Product, product_ids=[product.pk for product in to_create])
+        result.created += len(to_create)
+        result.updated += len(to_update)
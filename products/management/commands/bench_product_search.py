@@ -0,0 +1,68 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from management.benchmarks import benchmark_database, time_call
+from products.models import Product
+from products.search import fts_available, search_products
+
+WORDS = [
+    'aceite', 'arroz', 'azucar', 'cafe', 'galletitas', 'harina', 'leche', 'mate',
+    'yerba', 'fideos', 'queso', 'jabon', 'detergente', 'shampoo', 'gaseosa', 'agua',
+    'vino', 'cerveza', 'chocolate', 'alfajor', 'pan', 'manteca', 'dulce', 'tomate',
+]
+BRANDS = ['Norte', 'Sur', 'Andes', 'Pampa', 'Litoral', 'Patagonia', 'Cuyo', 'Delta']
+TERMS = ['yerba', 'erb', 'choco', 'X-00042', 'leche pampa', 'zzz']
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la búsqueda FTS5 trigram contra el filtro icontains original "
+        "sobre una base descartable con 10k / 100k / 1M productos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000, 1_000_000])
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--db-path', help="Archivo para la base de prueba (por defecto en memoria).")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with benchmark_database(path=options['db_path']):
+            if not fts_available(connection):
+                self.stdout.write(self.style.WARNING("Esta base no soporta FTS5 trigram: solo se mide icontains."))
+
+            self.stdout.write(f"{'filas':>10} {'término':>14} {'icontains ms':>13} {'fts ms':>9} {'resultados':>11}")
+            loaded = 0
+            for size in sorted(options['sizes']):
+                start = time.perf_counter()
+                while loaded < size:
+                    count = min(options['batch_size'], size - loaded)
+                    Product.objects.bulk_create([
+                        Product(
+                            code=f"X-{loaded + i:07d}",
+                            name=f"{rng.choice(WORDS).title()} {rng.choice(BRANDS)} {rng.randint(1, 999)}",
+                            price=rng.randint(100, 50_000),
+                            stock=rng.randint(0, 500),
+                        )
+                        for i in range(count)
+                    ])
+                    loaded += count
+                self.stdout.write(f"-- {size} filas cargadas en {time.perf_counter() - start:.1f}s")
+
+                base = Product.objects.filter(available=True)
+                for term in TERMS:
+                    legacy = base.filter(Q(name__icontains=term) | Q(code__icontains=term))
+                    legacy_ms, legacy_count = time_call(lambda: legacy.count(), options['repeat'])
+                    fts_ms, fts_count = time_call(
+                        lambda: search_products(base, term).count(), options['repeat']
+                    )
+                    self.stdout.write(
+                        f"{size:>10} {term:>14} {legacy_ms:>13.2f} {fts_ms:>9.2f} {fts_count:>11}"
+                        + ("" if fts_count == legacy_count else f"  (icontains: {legacy_count})")
+                    )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from products.exporting import CHUNK_SIZE, FORMATS, KINDS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Exporta el catálogo de productos o combos en CSV o JSON Lines, en streaming."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=KINDS, default='products')
+        parser.add_argument('--format', choices=list(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', help="Archivo de salida (por defecto, la salida estándar).")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        # Mismos filtros que el listado de productos
+        parser.add_argument('--search', default='')
+        parser.add_argument('--category')
+        parser.add_argument('--status', choices=['in_stock', 'out_of_stock'])
+
+    def handle(self, *args, **options):
+        filters = {key: options[key] for key in ('search', 'category', 'status')}
+        lines = export_lines(options['kind'], options['format'], filters, options['chunk_size'])
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        count = -1 if options['format'] == 'csv' else 0  # el encabezado no cuenta
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f"{count} filas exportadas a {options['output']}"))
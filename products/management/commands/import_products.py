@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importer import ProductImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Importa productos desde un CSV o XLSX (por código), en lotes y sin cargar el archivo en memoria."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Archivo .csv o .xlsx")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not path.lower().endswith(('.csv', '.xlsx')):
+            raise CommandError("El archivo debe ser .csv o .xlsx")
+
+        def progress(result):
+            self.stdout.write(
+                f"  {result.rows} filas ({result.rows_per_second:.0f} filas/s)", ending='\r'
+            )
+            self.stdout.flush()
+
+        importer = ProductImporter(batch_size=options['batch_size'], progress=progress)
+        try:
+            with open(path, 'rb') as binary_file:
+                result = importer.run(read_rows(binary_file, path))
+        except OSError as error:
+            raise CommandError(str(error))
+
+        self.stdout.write('')
+        for line, message in result.errors:
+            self.stdout.write(self.style.WARNING(f"  línea {line}: {message}"))
+        if result.error_count > len(result.errors):
+            self.stdout.write(self.style.WARNING(f"  ... y {result.error_count - len(result.errors)} errores más"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{result.rows} filas en {result.elapsed:.1f}s ({result.rows_per_second:.0f} filas/s): "
+            f"{result.created} creados, {result.updated} actualizados, {result.unchanged} sin cambios, "
+            f"{result.error_count} con errores."
+        ))
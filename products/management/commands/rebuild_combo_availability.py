@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.availability import rebuild_combo_availability, verify_combo_availability
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la tabla ComboAvailability y la verifica contra el cálculo en vivo."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help="No reconstruye: solo compara la tabla con el cálculo en vivo.",
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if not options['verify_only']:
+            total = rebuild_combo_availability(batch_size=batch_size)
+            self.stdout.write(f"Combos recalculados: {total}")
+
+        mismatches = verify_combo_availability(batch_size=batch_size)
+        for combo_id, stored, live in mismatches[:20]:
+            self.stdout.write(f"  combo {combo_id}: guardado={stored} en vivo={live}")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} combos no coinciden con el cálculo en vivo.")
+        self.stdout.write(self.style.SUCCESS("ComboAvailability coincide con el cálculo en vivo."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_availability(apps, schema_editor):
+    Combo = apps.get_model('products', 'Combo')
+    ComboAvailability = apps.get_model('products', 'ComboAvailability')
+    rows = []
+    for combo in Combo.objects.prefetch_related('items__product'):
+        stocks = [max(item.product.stock, 0) // item.quantity for item in combo.items.all()]
+        rows.append(ComboAvailability(combo=combo, max_buildable=min(stocks) if stocks else 0))
+    ComboAvailability.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_name_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComboAvailability',
+            fields=[
+                ('combo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='availability', serialize=False, to='products.combo')),
+                ('max_buildable', models.IntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(populate_availability, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from products.search import ensure_search_index
+    ensure_search_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from products.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_comboavailability'),
+    ]
+
+    operations = [
+        # Tabla FTS5 (trigram) + triggers; en bases sin FTS5 no hace nada
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+
+def build_paths(apps, schema_editor):
+    Category = apps.get_model('products', 'Category')
+    categories = list(Category.objects.all())
+    children = {}
+    for category in categories:
+        children.setdefault(category.parent_id, []).append(category)
+    pending = [(root, '/', 0) for root in children.get(None, [])]
+    while pending:
+        category, parent_path, depth = pending.pop()
+        category.path = f"{parent_path}{category.pk}/"
+        category.depth = depth
+        pending.extend((child, category.path, depth + 1) for child in children.get(category.pk, []))
+    Category.objects.bulk_update(categories, ['path', 'depth'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(build_paths, migrations.RunPython.noop),
+    ]
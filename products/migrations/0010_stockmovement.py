@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_category_path'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(verbose_name='Cantidad')),
+                ('reason', models.CharField(choices=[('initial', 'Stock inicial'), ('adjustment', 'Ajuste manual'), ('purchase', 'Compra'), ('sale', 'Venta'), ('return', 'Devolución')], default='adjustment', max_length=20, verbose_name='Motivo')),
+                ('reference', models.CharField(blank=True, max_length=100, verbose_name='Referencia')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_movements', to='products.product', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Movimiento de stock',
+                'verbose_name_plural': 'Movimientos de stock',
+                'ordering': ['-created', '-id'],
+                'indexes': [models.Index(fields=['product', 'created'], name='stockmovement_product_idx')],
+            },
+        ),
+    ]
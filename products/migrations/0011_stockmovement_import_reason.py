@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_stockmovement'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='reason',
+            field=models.CharField(choices=[('initial', 'Stock inicial'), ('adjustment', 'Ajuste manual'), ('purchase', 'Compra'), ('sale', 'Venta'), ('return', 'Devolución'), ('import', 'Importación')], default='adjustment', max_length=20, verbose_name='Motivo'),
+        ),
+    ]
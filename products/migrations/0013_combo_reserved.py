@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_product_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='combo',
+            name='reserved',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reservados'),
+        ),
+        migrations.AlterField(
+            model_name='stockmovement',
+            name='reason',
+            field=models.CharField(choices=[('initial', 'Stock inicial'), ('adjustment', 'Ajuste manual'), ('purchase', 'Compra'), ('sale', 'Venta'), ('return', 'Devolución'), ('import', 'Importación'), ('reservation', 'Reserva de combo')], default='adjustment', max_length=20, verbose_name='Motivo'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_combo_reserved'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='reorder_point',
+            field=models.PositiveIntegerField(default=0, verbose_name='Punto de reposición'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_product_reorder_point'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Repricing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('percent', 'Porcentaje'), ('amount', 'Monto fijo')], max_length=10, verbose_name='Tipo de cambio')),
+                ('value', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Valor')),
+                ('rounding', models.CharField(choices=[('cents', 'Sin redondeo (centavos)'), ('unit', 'Al peso'), ('ten', 'A la decena'), ('hundred', 'A la centena'), ('ninety_nine', 'Terminado en ,99')], default='cents', max_length=15, verbose_name='Redondeo')),
+                ('filters', models.JSONField(blank=True, default=dict, verbose_name='Filtros')),
+                ('product_count', models.PositiveIntegerField(default=0, verbose_name='Productos')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='repricings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cambio de precios',
+                'verbose_name_plural': 'Cambios de precios',
+                'ordering': ['-created', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio anterior')),
+                ('new_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio nuevo')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Fecha')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='products.product', verbose_name='Producto')),
+                ('repricing', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='products.repricing', verbose_name='Cambio masivo')),
+            ],
+            options={
+                'verbose_name': 'Cambio de precio',
+                'verbose_name_plural': 'Historial de precios',
+                'ordering': ['-created', '-id'],
+                'indexes': [models.Index(fields=['product', 'created'], name='pricehistory_product_idx')],
+            },
+        ),
+    ]
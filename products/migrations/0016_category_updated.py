@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 15:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_repricing_pricehistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Última modificación'),
+            preserve_default=False,
+        ),
+    ]
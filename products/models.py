@@ -1,4 +1,9 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import (
+    DecimalField, ExpressionWrapper, F, IntegerField, Min, Prefetch, Q, Sum, Value,
+)
+from django.db.models.functions import Coalesce, Concat, Greatest, NullIf, Substr
 from django.utils.text import slugify
 
 #Modelos para categorias 
@@ -7,6 +12,8 @@ class Category(models.Model):
     """
     Modelo para categorías de productos.
     - Utiliza una relación recursiva para crear subcategorías.
+    - `path` guarda los ids de la raíz hasta la categoría ("/1/5/") para filtrar
+      descendientes por prefijo; se mantiene en save().
     """
     name = models.CharField(max_length=100, unique=True, verbose_name="Nombre")
     slug = models.SlugField(max_length=100, unique=True, blank=True)
@@ -19,6 +26,11 @@ class Category(models.Model):
         related_name='children',
         verbose_name="Categoría Padre"
     )
+    # Path materializado y profundidad (0 = categoría raíz)
+    path = models.CharField(max_length=255, db_index=True, editable=False, default='')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Junto con la cantidad de categorías forma la versión del árbol cacheado (ver cache.py)
+    updated = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
 
     class Meta:
         verbose_name = "Categoría"
@@ -31,7 +43,33 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_path()
+
+    def _update_path(self):
+        """
+        Recalcula el path propio y, si la categoría se movió, el de todos sus
+        descendientes con un único UPDATE.
+        """
+        parent_path = '/'
+        if self.parent_id:
+            parent_path = Category.objects.filter(pk=self.parent_id).values_list('path', flat=True).get()
+        new_path = f"{parent_path}{self.pk}/"
+        old_path = self.path
+        if new_path == old_path:
+            return
+        if old_path and new_path.startswith(old_path):
+            raise ValueError("Una categoría no puede moverse dentro de una de sus subcategorías.")
+
+        new_depth = new_path.count('/') - 2
+        Category.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        if old_path:
+            Category.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                path=Concat(Value(new_path), Substr('path', len(old_path) + 1)),
+                depth=F('depth') + (new_depth - self.depth),
+            )
+        self.path, self.depth = new_path, new_depth
 
 #Modelos para productos
 
@@ -53,6 +91,8 @@ class Product(models.Model):
     )
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio")
     stock = models.IntegerField(verbose_name="Stock")
+    # Con stock en este valor o menos se avisa en el panel (0 = sin aviso)
+    reorder_point = models.PositiveIntegerField(default=0, verbose_name="Punto de reposición")
     available = models.BooleanField(default=True, verbose_name="Disponible")
     created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
     updated = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
@@ -61,42 +101,124 @@ class Product(models.Model):
         verbose_name = "Producto"
         verbose_name_plural = "Productos"
         ordering = ['name']
+        indexes = [
+            # Soporta la paginación por cursor (name, id) del listado
+            models.Index(fields=['name', 'id'], name='product_name_id_idx'),
+            # Los listados solo muestran disponibles: índice parcial más chico para su orden por (name, id)
+            models.Index(fields=['name', 'id'], condition=Q(available=True), name='product_available_name_idx'),
+            # Filtros de estado de stock y de categoría sobre los disponibles (ver manage.py index_advisor)
+            models.Index(fields=['available', 'stock'], name='product_available_stock_idx'),
+            models.Index(fields=['available', 'category'], name='product_available_cat_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stock tal como se leyó de la base, para detectar cambios al guardar
+        instance._loaded_stock = instance.__dict__.get('stock')
+        return instance
+
 #Modelos para combos    
 
+class ComboQuerySet(models.QuerySet):
+
+    def with_price(self):
+        """
+        Anota computed_price: precio especial o, si no tiene, suma de precio x cantidad.
+        """
+        money = DecimalField(max_digits=12, decimal_places=2)
+        items_total = Sum(
+            ExpressionWrapper(
+                F('items__product__price') * F('items__quantity'), output_field=money
+            )
+        )
+        return self.annotate(
+            computed_price=Coalesce(
+                NullIf('special_price', Value(0, output_field=money)),
+                items_total,
+                Value(0, output_field=money),
+            ),
+        )
+
+    def with_buildable(self):
+        """
+        Anota max_buildable calculado en vivo: mínimo de stock // cantidad entre sus productos.
+        El stock negativo cuenta como 0: así la división entera de SQL (que trunca)
+        coincide con el // de Python (que redondea hacia abajo).
+        """
+        return self.annotate(
+            max_buildable=Coalesce(
+                Min(
+                    ExpressionWrapper(
+                        Greatest('items__product__stock', Value(0)) / F('items__quantity'),
+                        output_field=IntegerField(),
+                    )
+                ),
+                Value(0),
+            ),
+        )
+
+    def with_totals(self):
+        """Precio y stock armable en vivo, en una sola consulta agregada."""
+        return self.with_price().with_buildable()
+
+    def with_stored_availability(self):
+        """
+        Anota max_buildable leyendo la tabla desnormalizada ComboAvailability
+        en lugar de recalcularlo.
+        """
+        return self.annotate(
+            max_buildable=Coalesce('availability__max_buildable', Value(0)),
+        )
+
+    def with_items(self):
+        """Precarga los items con su producto para listarlos sin consultas extra."""
+        return self.prefetch_related(
+            Prefetch('items', queryset=ComboItem.objects.select_related('product'))
+        )
+
+
 class Combo(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     special_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     available = models.BooleanField(default=True)
+    # Combos armados cuyo stock ya se descontó de los productos (ver products/reservations.py)
+    reserved = models.PositiveIntegerField(default=0, verbose_name="Reservados")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ComboQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     def calculated_price(self):
         """Si no tiene precio especial, devolver suma de productos"""
+        if hasattr(self, 'computed_price'):
+            return self.computed_price
         total = sum(item.product.price * item.quantity for item in self.items.all())
         return self.special_price if self.special_price else total
 
     def max_available_stock(self):
         """La cantidad máxima de combos disponibles depende del stock mínimo de sus productos"""
+        if hasattr(self, 'max_buildable'):
+            return self.max_buildable
         stocks = []
         for item in self.items.all():
             if item.product.stock is None:
                 continue
             if item.product.stock == 0:
                 return 0
-            stocks.append(item.product.stock // item.quantity)
+            stocks.append(max(item.product.stock, 0) // item.quantity)
         return min(stocks) if stocks else 0
     
     @property
     def is_available(self):
-        """Disponible solo si tiene stock suficiente y está marcado como disponible."""
-        return self.available and self.max_available_stock() > 0
+        """Disponible si está marcado como disponible y hay combos reservados o stock para armarlos."""
+        return self.available and (self.reserved > 0 or self.max_available_stock() > 0)
 
 
 class ComboItem(models.Model):
@@ -105,4 +227,135 @@ class ComboItem(models.Model):
     quantity = models.PositiveIntegerField(default=1)
 
     def __str__(self):
-        return f"{self.quantity} x {self.product.name}"
\ No newline at end of file
+        return f"{self.quantity} x {self.product.name}"
+
+
+class ComboAvailability(models.Model):
+    """
+    Cantidad de combos armables con el stock actual, desnormalizada.
+    - Se actualiza solo para los combos afectados (ver products/availability.py).
+    - `manage.py rebuild_combo_availability` la reconstruye y verifica.
+    """
+    combo = models.OneToOneField(
+        Combo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='availability',
+    )
+    max_buildable = models.IntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.combo_id}: {self.max_buildable}"
+
+
+#Movimientos de stock
+
+class StockMovement(models.Model):
+    """
+    Ledger de movimientos de stock (solo inserción).
+    - `delta` positivo suma stock, negativo descuenta.
+    - Se registran con products/stock.py, que aplica el cambio con un UPDATE atómico.
+    """
+
+    class Reason(models.TextChoices):
+        INITIAL = 'initial', 'Stock inicial'
+        ADJUSTMENT = 'adjustment', 'Ajuste manual'
+        PURCHASE = 'purchase', 'Compra'
+        SALE = 'sale', 'Venta'
+        RETURN = 'return', 'Devolución'
+        IMPORT = 'import', 'Importación'
+        RESERVATION = 'reservation', 'Reserva de combo'
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='stock_movements',
+        verbose_name="Producto"
+    )
+    delta = models.IntegerField(verbose_name="Cantidad")
+    reason = models.CharField(max_length=20, choices=Reason.choices, default=Reason.ADJUSTMENT, verbose_name="Motivo")
+    reference = models.CharField(max_length=100, blank=True, verbose_name="Referencia")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
+
+    class Meta:
+        verbose_name = "Movimiento de stock"
+        verbose_name_plural = "Movimientos de stock"
+        ordering = ['-created', '-id']
+        indexes = [
+            models.Index(fields=['product', 'created'], name='stockmovement_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.delta:+d} {self.product_id} ({self.get_reason_display()})"
+
+
+#Historial de precios
+
+class Repricing(models.Model):
+    """
+    Cambio de precios masivo (ver products/pricing.py): qué se aplicó, a qué
+    filtros y a cuántos productos. El detalle por producto está en PriceHistory.
+    """
+
+    class Mode(models.TextChoices):
+        PERCENT = 'percent', 'Porcentaje'
+        AMOUNT = 'amount', 'Monto fijo'
+
+    class Rounding(models.TextChoices):
+        CENTS = 'cents', 'Sin redondeo (centavos)'
+        UNIT = 'unit', 'Al peso'
+        TEN = 'ten', 'A la decena'
+        HUNDRED = 'hundred', 'A la centena'
+        NINETY_NINE = 'ninety_nine', 'Terminado en ,99'
+
+    mode = models.CharField(max_length=10, choices=Mode.choices, verbose_name="Tipo de cambio")
+    value = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Valor")
+    rounding = models.CharField(max_length=15, choices=Rounding.choices, default=Rounding.CENTS, verbose_name="Redondeo")
+    filters = models.JSONField(default=dict, blank=True, verbose_name="Filtros")
+    product_count = models.PositiveIntegerField(default=0, verbose_name="Productos")
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='repricings',
+    )
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
+
+    class Meta:
+        verbose_name = "Cambio de precios"
+        verbose_name_plural = "Cambios de precios"
+        ordering = ['-created', '-id']
+
+    def __str__(self):
+        sign = '+' if self.value >= 0 else ''
+        unit = '%' if self.mode == self.Mode.PERCENT else ' $'
+        return f"{sign}{self.value}{unit} ({self.product_count} productos)"
+
+
+class PriceHistory(models.Model):
+    """
+    Un cambio de precio de un producto: masivo (con `repricing`) o desde la
+    edición del producto (sin `repricing`). Solo inserción.
+    """
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='price_history',
+        verbose_name="Producto"
+    )
+    repricing = models.ForeignKey(
+        Repricing, on_delete=models.CASCADE, null=True, blank=True, related_name='changes',
+        verbose_name="Cambio masivo",
+    )
+    old_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio anterior")
+    new_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio nuevo")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
+
+    class Meta:
+        verbose_name = "Cambio de precio"
+        verbose_name_plural = "Historial de precios"
+        ordering = ['-created', '-id']
+        indexes = [
+            models.Index(fields=['product', 'created'], name='pricehistory_product_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product_id}: {self.old_price} → {self.new_price}"
@@ -0,0 +1,83 @@
+import base64
+import json
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    """
+    Página de resultados obtenida por keyset (cursor) sobre (name, id).
+    - `next_cursor` / `previous_cursor` son None cuando no hay más páginas.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+def encode_cursor(name, pk):
+    raw = json.dumps([name, pk], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Devuelve (name, id) o None si el cursor no es válido."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        name, pk = json.loads(raw)
+        return str(name), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_paginate(queryset, after=None, before=None, per_page=50):
+    """
+    Pagina un queryset de productos por (name, id), igual que Product.Meta.ordering,
+    sin OFFSET: cada página cuesta lo mismo sin importar qué tan lejos esté.
+    - `after`: cursor del último elemento de la página anterior (avanzar).
+    - `before`: cursor del primer elemento de la página siguiente (retroceder).
+    """
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before)
+
+    if before_key:
+        name, pk = before_key
+        qs = queryset.filter(Q(name__lt=name) | Q(name=name, id__lt=pk)).order_by('-name', '-id')
+        rows = list(qs[:per_page + 1])
+        has_more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        previous_cursor = encode_cursor(rows[0].name, rows[0].pk) if has_more else None
+        next_cursor = encode_cursor(rows[-1].name, rows[-1].pk) if rows else None
+        return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    qs = queryset
+    if after_key:
+        name, pk = after_key
+        qs = qs.filter(Q(name__gt=name) | Q(name=name, id__gt=pk))
+    rows = list(qs.order_by('name', 'id')[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(rows[-1].name, rows[-1].pk) if has_more else None
+    previous_cursor = encode_cursor(rows[0].name, rows[0].pk) if after_key and rows else None
+    return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
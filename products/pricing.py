@@ -0,0 +1,144 @@
+"""
+Cambio de precios masivo.
+
+El precio nuevo se calcula en SQL con una sola expresión sobre F('price')
+(porcentaje o monto fijo, redondeo y piso en 0). La misma expresión sirve
+para la vista previa (agregados y una muestra, sin modificar nada) y para
+aplicar el cambio con un UPDATE; antes, un INSERT ... SELECT con esa misma
+expresión guarda una fila de PriceHistory por producto que cambia, sin pasar
+los precios por Python.
+
+Se aplica a los productos que coinciden con los filtros del listado
+(búsqueda, categoría con sus subcategorías, estado de stock). Product no
+tiene proveedor, así que no hay filtro por proveedor.
+"""
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Avg, Count, DecimalField, ExpressionWrapper, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Greatest, Round
+from django.utils import timezone
+
+from .filters import filter_products
+from .models import PriceHistory, Product, Repricing
+from .signals import products_bulk_updated
+
+# Múltiplo al que se redondea el precio nuevo (al más cercano)
+ROUNDING_STEPS = {
+    Repricing.Rounding.CENTS: Decimal('0.01'),
+    Repricing.Rounding.UNIT: Decimal('1'),
+    Repricing.Rounding.TEN: Decimal('10'),
+    Repricing.Rounding.HUNDRED: Decimal('100'),
+    Repricing.Rounding.NINETY_NINE: Decimal('1'),
+}
+PREVIEW_SAMPLE = 20
+
+_PRICE = DecimalField(max_digits=10, decimal_places=2)
+CENT = Decimal('0.01')
+
+
+def new_price_expression(mode, value, rounding=Repricing.Rounding.CENTS):
+    """Expresión SQL del precio nuevo a partir de F('price')."""
+    value = Decimal(value)
+    if mode == Repricing.Mode.PERCENT:
+        price = F('price') * Value(1 + value / 100, output_field=_PRICE)
+    else:
+        price = F('price') + Value(value, output_field=_PRICE)
+    step = Value(ROUNDING_STEPS[rounding], output_field=_PRICE)
+    price = Round(price / step) * step
+    if rounding == Repricing.Rounding.NINETY_NINE:
+        # 1234,40 -> 1233,99: el entero más cercano menos un centavo
+        price = price - Value(Decimal('0.01'), output_field=_PRICE)
+    # Un descuento fijo mayor que el precio no lo deja negativo
+    return ExpressionWrapper(Round(Greatest(price, Value(Decimal('0'), output_field=_PRICE)), 2), output_field=_PRICE)
+
+
+def repricing_queryset(filters=None, include_unavailable=False):
+    products = Product.objects.all() if include_unavailable else Product.objects.filter(available=True)
+    return filter_products(products, filters or {})
+
+
+def _changing(products, expression):
+    # Solo los que cambian: si el redondeo deja el mismo precio no se toca ni se registra
+    return products.annotate(new_price=expression).exclude(new_price=F('price'))
+
+
+def preview_repricing(products, mode, value, rounding=Repricing.Rounding.CENTS, sample=PREVIEW_SAMPLE):
+    """
+    Vista previa sin modificar nada, calculada en la base:
+    {'matched', 'changed', 'old_total', 'new_total', 'avg_change', 'min_change', 'max_change', 'sample'}.
+    """
+    expression = new_price_expression(mode, value, rounding)
+    annotated = products.annotate(new_price=expression)
+    change = ExpressionWrapper(F('new_price') - F('price'), output_field=_PRICE)
+    summary = annotated.aggregate(
+        matched=Count('pk'),
+        changed=Count('pk', filter=~Q(new_price=F('price'))),
+        old_total=Sum('price'),
+        new_total=Sum('new_price'),
+        avg_change=Avg(change),
+        min_change=Min(change),
+        max_change=Max(change),
+    )
+    # SQLite suma en punto flotante: se vuelve a centavos
+    for key in ('old_total', 'new_total', 'avg_change', 'min_change', 'max_change'):
+        if summary[key] is not None:
+            summary[key] = summary[key].quantize(CENT)
+    summary['sample'] = list(
+        _changing(products, expression).order_by('name', 'id').values('id', 'code', 'name', 'price', 'new_price')[:sample]
+    )
+    for row in summary['sample']:
+        row['new_price'] = row['new_price'].quantize(CENT)
+    return summary
+
+
+# Campo de PriceHistory -> valor de cada producto que cambia
+_HISTORY_SOURCES = {'product': F('pk'), 'old_price': F('price'), 'new_price': F('new_price')}
+
+
+def _insert_history(changing, constants):
+    """
+    INSERT ... SELECT de una fila de PriceHistory por producto de `changing`.
+    Las columnas salen de PriceHistory._meta y el SELECT las toma por alias,
+    no por posición: renombrar o reordenar campos no cruza los datos.
+    """
+    quote = connection.ops.quote_name
+    select_sql, params = changing.order_by().values(
+        **{f'history_{name}': source for name, source in _HISTORY_SOURCES.items()}
+    ).query.sql_with_params()
+    constant_fields = [PriceHistory._meta.get_field(name) for name in constants]
+    columns = [PriceHistory._meta.get_field(name).column for name in _HISTORY_SOURCES]
+    columns += [field.column for field in constant_fields]
+    selected = [f'changed.{quote(f"history_{name}")}' for name in _HISTORY_SOURCES] + ['%s'] * len(constants)
+    values = [field.get_db_prep_save(value, connection) for field, value in zip(constant_fields, constants.values())]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {quote(PriceHistory._meta.db_table)} ({", ".join(quote(column) for column in columns)}) '
+            f'SELECT {", ".join(selected)} FROM ({select_sql}) AS changed',
+            (*values, *params),
+        )
+
+
+def apply_repricing(products, mode, value, rounding=Repricing.Rounding.CENTS, filters=None, user=None):
+    """
+    Aplica el cambio a `products` con un UPDATE y registra el historial.
+    Devuelve el Repricing creado (product_count = productos que cambiaron).
+    """
+    value = Decimal(value)
+    expression = new_price_expression(mode, value, rounding)
+    changing = _changing(products, expression)
+    now = timezone.now()
+    with transaction.atomic():
+        repricing = Repricing.objects.create(
+            mode=mode, value=value, rounding=rounding, filters=filters or {},
+            created_by=user if getattr(user, 'is_authenticated', False) else None,
+        )
+        # Misma transacción (IMMEDIATE en SQLite): el historial tiene los precios que el UPDATE reemplaza
+        _insert_history(changing, {'repricing': repricing.pk, 'created': now})
+        product_ids = list(repricing.changes.order_by().values_list('product_id', flat=True))
+        if product_ids:
+            changing.update(price=expression, updated=now)
+            repricing.product_count = len(product_ids)
+            repricing.save(update_fields=['product_count'])
+            products_bulk_updated.send(sender=Product, product_ids=product_ids, fields=['price'])
+    return repricing
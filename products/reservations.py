@@ -0,0 +1,114 @@
+"""
+Reserva de stock para combos.
+
+Reservar K combos saca del stock de cada producto cantidad × K y lo suma a
+Combo.reserved; liberar lo devuelve. Vender usa primero lo reservado y el resto
+lo descuenta del stock. Todo pasa por apply_movements: un UPDATE condicional
+por bloque de productos, así dos ventas simultáneas no pueden dejar stock
+negativo y, si falta un solo producto, no se descuenta ninguno.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import Combo, ComboItem, StockMovement
+from .stock import apply_movements
+
+
+class InsufficientReservation(Exception):
+    """Se pidió liberar más combos de los que hay reservados."""
+
+    def __init__(self, combo_id, reserved):
+        self.combo_id = combo_id
+        self.reserved = reserved
+        super().__init__(f"El combo {combo_id} tiene solo {reserved} reservados")
+
+
+def combo_items(combo):
+    """{product_id: cantidad por combo} (suma los items repetidos del mismo producto)."""
+    quantities = defaultdict(int)
+    rows = ComboItem.objects.filter(combo_id=getattr(combo, 'pk', combo)).values_list('product_id', 'quantity')
+    for product_id, quantity in rows:
+        quantities[product_id] += quantity
+    return dict(quantities)
+
+
+def _movements(quantities, factor, reason, reference):
+    return [
+        StockMovement(product_id=product_id, delta=quantity * factor, reason=reason, reference=reference)
+        for product_id, quantity in quantities.items()
+    ]
+
+
+def reserve_combo(combo, quantity, reference=''):
+    """Reserva `quantity` combos. Lanza InsufficientStock (sin cambios) si falta algún producto."""
+    combo_id = getattr(combo, 'pk', combo)
+    with transaction.atomic():
+        apply_movements(_movements(
+            combo_items(combo_id), -quantity, StockMovement.Reason.RESERVATION,
+            reference or f"Reserva combo #{combo_id}",
+        ))
+        Combo.objects.filter(pk=combo_id).update(reserved=F('reserved') + quantity)
+
+
+def release_combo(combo, quantity, reference=''):
+    """Devuelve al stock `quantity` combos reservados. Lanza InsufficientReservation si no alcanzan."""
+    combo_id = getattr(combo, 'pk', combo)
+    with transaction.atomic():
+        # Condicional: dos liberaciones simultáneas no pueden dejar la reserva negativa
+        if not Combo.objects.filter(pk=combo_id, reserved__gte=quantity).update(reserved=F('reserved') - quantity):
+            raise InsufficientReservation(
+                combo_id, Combo.objects.filter(pk=combo_id).values_list('reserved', flat=True).first() or 0
+            )
+        apply_movements(_movements(
+            combo_items(combo_id), quantity, StockMovement.Reason.RESERVATION,
+            reference or f"Liberación combo #{combo_id}",
+        ))
+
+
+def sell_combo(combo, quantity, reference=''):
+    """
+    Vende `quantity` combos: consume primero los reservados (su stock ya salió)
+    y descuenta el resto de los productos. Devuelve cuántos salieron de la reserva.
+    Lanza InsufficientStock si no alcanza; en ese caso no cambia nada.
+    """
+    combo_id = getattr(combo, 'pk', combo)
+    with transaction.atomic():
+        # Bloquea el combo hasta el final de la transacción (en SQLite ya lo
+        # hace la transacción IMMEDIATE)
+        reserved = Combo.objects.select_for_update().values_list('reserved', flat=True).get(pk=combo_id)
+        from_reserved = min(reserved, quantity)
+        if from_reserved and not Combo.objects.filter(pk=combo_id, reserved__gte=from_reserved).update(
+            reserved=F('reserved') - from_reserved
+        ):
+            raise InsufficientReservation(combo_id, reserved)
+        if quantity > from_reserved:
+            apply_movements(_movements(
+                combo_items(combo_id), -(quantity - from_reserved), StockMovement.Reason.SALE,
+                reference or f"Venta combo #{combo_id}",
+            ))
+    return from_reserved
+
+
+def apply_item_changes(combo, old_items, reference=''):
+    """
+    Tras editar los items de un combo con reservas, ajusta el stock solo por la
+    diferencia: (cantidad anterior − nueva) × reservados vuelve al stock (o sale,
+    si la nueva es mayor). `old_items` es combo_items() leído antes de guardar.
+    Lanza InsufficientStock si falta stock para lo que se agregó.
+    """
+    combo_id = getattr(combo, 'pk', combo)
+    with transaction.atomic():
+        reserved = Combo.objects.select_for_update().values_list('reserved', flat=True).get(pk=combo_id)
+        if not reserved:
+            return []
+        new_items = combo_items(combo_id)
+        differences = {
+            product_id: old_items.get(product_id, 0) - new_items.get(product_id, 0)
+            for product_id in old_items.keys() | new_items.keys()
+        }
+        return apply_movements(_movements(
+            differences, reserved, StockMovement.Reason.RESERVATION,
+            reference or f"Edición combo #{combo_id}",
+        ))
@@ -0,0 +1,136 @@
+"""
+Búsqueda de productos por nombre y código.
+
+En SQLite usa una tabla virtual FTS5 con tokenizer trigram (índice de
+subcadenas) que se mantiene sincronizada con products_product mediante
+triggers, así también la actualizan los bulk_create / update().
+En otras bases, o para términos de menos de 3 caracteres, cae en icontains.
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'products_product_fts'
+PRODUCT_TABLE = 'products_product'
+
+# El tokenizer trigram no puede buscar términos más cortos que esto
+MIN_FTS_LENGTH = 3
+
+_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {PRODUCT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, name, code) VALUES (new.id, new.name, new.code);
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {PRODUCT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, code)
+            VALUES ('delete', old.id, old.name, old.code);
+        END
+    """,
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, code ON {PRODUCT_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, code)
+            VALUES ('delete', old.id, old.name, old.code);
+            INSERT INTO {FTS_TABLE}(rowid, name, code) VALUES (new.id, new.name, new.code);
+        END
+    """,
+}
+
+# Cache de disponibilidad por (alias, nombre de base)
+_available = {}
+
+
+def supports_fts(connection):
+    """True si la base es SQLite compilada con FTS5 y el tokenizer trigram (3.34+)."""
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, tokenize='trigram')")
+            cursor.execute("DROP TABLE temp.fts_probe")
+        except Exception:
+            return False
+    return True
+
+
+def ensure_search_index(connection):
+    """
+    Crea (si falta) la tabla FTS y sus triggers, y reconstruye el índice cuando
+    hubo que recrear algo. Es idempotente: se llama tras cada migrate porque
+    SQLite descarta los triggers cuando Django reconstruye la tabla de productos.
+    """
+    _available.pop((connection.alias, connection.settings_dict['NAME']), None)
+    if not supports_fts(connection):
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name = %s OR (type = 'trigger' AND tbl_name = %s)",
+            [FTS_TABLE, PRODUCT_TABLE],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if existing >= {FTS_TABLE, *_TRIGGERS}:
+            return True
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"name, code, content='{PRODUCT_TABLE}', content_rowid='id', tokenize='trigram')"
+        )
+        for sql in _TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def drop_search_index(connection):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in _TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _available.pop((connection.alias, connection.settings_dict['NAME']), None)
+
+
+def fts_available(connection):
+    key = (connection.alias, connection.settings_dict['NAME'])
+    if key not in _available:
+        if connection.vendor != 'sqlite':
+            _available[key] = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [FTS_TABLE])
+                _available[key] = cursor.fetchone() is not None
+    return _available[key]
+
+
+def _match_expression(term):
+    # Frase entre comillas: el trigram la trata como subcadena literal
+    return '"%s"' % term.replace('"', '""')
+
+
+def search_products(queryset, term, ranked=False):
+    """
+    Filtra un queryset de productos por nombre o código (subcadena, sin
+    importar mayúsculas). Con `ranked=True` anota `search_rank` (bm25, menor es
+    mejor) y ordena por relevancia; sin él conserva el orden del queryset.
+    """
+    term = (term or '').strip()
+    if not term:
+        return queryset
+
+    connection = connections[queryset.db]
+    if len(term) < MIN_FTS_LENGTH or not fts_available(connection):
+        queryset = queryset.filter(Q(name__icontains=term) | Q(code__icontains=term))
+        return queryset.order_by('name', 'id') if ranked else queryset
+
+    match = _match_expression(term)
+    queryset = queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+    )
+    if not ranked:
+        return queryset
+    rank = RawSQL(
+        f"SELECT rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {PRODUCT_TABLE}.id",
+        (match,),
+    )
+    return queryset.annotate(search_rank=rank).order_by('search_rank', 'name', 'id')
@@ -0,0 +1,64 @@
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .availability import schedule_refresh
+from .cache import forget_category_version
+from .models import Category, Combo, ComboItem, Product
+from .search import PRODUCT_TABLE, ensure_search_index
+
+# Se envía cuando el stock cambia con update()/bulk_* (que no disparan post_save).
+# Argumentos: product_ids.
+stock_changed = Signal()
+
+# Se envía al recalcular ComboAvailability (ver availability.refresh_combo_availability).
+# Argumentos: combo_ids.
+combo_availability_changed = Signal()
+
+# Se envía tras un cambio masivo con update()/delete() (bulk.apply_bulk_action,
+# pricing.apply_repricing). Argumentos: product_ids, fields (campos que cambiaron).
+products_bulk_updated = Signal()
+
+# Se envía dentro de la transacción, justo antes de borrar productos con
+# bulk.delete_products: otras apps sueltan sus datos en bloque, sin un pre_delete
+# por producto (que impediría el borrado en una sola consulta). Argumentos: product_ids.
+products_deleting = Signal()
+
+
+@receiver(post_save, sender=Product)
+def product_stock_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Si cambió el stock, actualizar solo los combos que contienen el producto."""
+    if created or (update_fields is not None and 'stock' not in update_fields):
+        return
+    if instance.stock != getattr(instance, '_loaded_stock', None):
+        schedule_refresh(product_ids=[instance.pk])
+    instance._loaded_stock = instance.stock
+
+
+@receiver(post_save, sender=Combo)
+def combo_saved(sender, instance, created, **kwargs):
+    if created:
+        schedule_refresh(combo_ids=[instance.pk])
+
+
+@receiver(post_save, sender=ComboItem)
+@receiver(post_delete, sender=ComboItem)
+def combo_item_changed(sender, instance, **kwargs):
+    schedule_refresh(combo_ids=[instance.combo_id])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, **kwargs):
+    # La versión sale de los datos: basta con volver a consultarla (al confirmar)
+    transaction.on_commit(forget_category_version)
+
+
+def sync_search_index(sender, using, **kwargs):
+    """
+    Tras migrate: recrea los triggers del índice de búsqueda si una migración
+    reconstruyó la tabla de productos (SQLite los elimina junto con la tabla).
+    """
+    connection = connections[using]
+    if PRODUCT_TABLE in connection.introspection.table_names():
+        ensure_search_index(connection)
@@ -0,0 +1,42 @@
+// Acciones masivas de product_list / product_trash (formulario #bulkForm)
+document.addEventListener('DOMContentLoaded', function () {
+    const form = document.getElementById('bulkForm');
+    if (!form) {
+        return;
+    }
+    const accion = document.getElementById('bulkAction');
+    const categoria = document.getElementById('bulkCategory');
+    const todos = document.getElementById('bulkSelectAll');
+    const enviar = document.getElementById('bulkSubmit');
+    const contador = document.getElementById('bulkCount');
+    const casillas = () => document.querySelectorAll('input.bulk-check[form="bulkForm"]');
+    const marcarPagina = document.getElementById('bulkCheckPage');
+
+    function actualizar() {
+        const marcadas = Array.from(casillas()).filter((casilla) => casilla.checked).length;
+        contador.textContent = todos.checked ? 'todos' : marcadas;
+        enviar.disabled = !accion.value || (!todos.checked && !marcadas);
+        const conCategoria = accion.value === 'set_category';
+        categoria.classList.toggle('d-none', !conCategoria);
+        categoria.disabled = !conCategoria;
+    }
+
+    if (marcarPagina) {
+        marcarPagina.addEventListener('change', function () {
+            casillas().forEach((casilla) => { casilla.checked = marcarPagina.checked; });
+            actualizar();
+        });
+    }
+    casillas().forEach((casilla) => casilla.addEventListener('change', actualizar));
+    [accion, todos].forEach((campo) => campo.addEventListener('change', actualizar));
+
+    form.addEventListener('submit', function (event) {
+        const texto = accion.options[accion.selectedIndex].text;
+        const alcance = todos.checked ? 'todos los productos que coinciden' : `${contador.textContent} productos`;
+        const aviso = accion.value === 'delete' ? '\nEsta acción no se puede deshacer.' : '';
+        if (!window.confirm(`${texto}: ${alcance}.${aviso}`)) {
+            event.preventDefault();
+        }
+    });
+    actualizar();
+});
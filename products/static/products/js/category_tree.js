@@ -0,0 +1,40 @@
+// Árbol de categorías precargado (products:category_tree_api).
+// Se pide una sola vez por página; el servidor responde 304 mientras no cambie.
+const CategoryTree = (() => {
+  const cargas = {};
+
+  function cargar(url) {
+    if (!cargas[url]) {
+      cargas[url] = fetch(url, { credentials: 'same-origin', headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+        .then((response) => response.json())
+        .then((data) => data.tree);
+    }
+    return cargas[url];
+  }
+
+  // Hijos directos: [[id, nombre], ...] ('' = categorías raíz)
+  function hijos(tree, id) {
+    return tree[String(id ?? '')] || [];
+  }
+
+  // Ids (como texto) de la categoría y todas sus subcategorías
+  function descendientes(tree, id) {
+    const ids = new Set();
+    const pendientes = [String(id)];
+    while (pendientes.length) {
+      const actual = pendientes.pop();
+      ids.add(actual);
+      hijos(tree, actual).forEach(([hijo]) => pendientes.push(String(hijo)));
+    }
+    return ids;
+  }
+
+  function llenarSelect(select, opciones, vacio, seleccionado) {
+    select.replaceChildren(new Option(vacio, ''));
+    opciones.forEach(([id, nombre]) => {
+      select.appendChild(new Option(nombre, id, false, String(id) === String(seleccionado ?? '')));
+    });
+  }
+
+  return { cargar, hijos, descendientes, llenarSelect };
+})();
@@ -0,0 +1,85 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+from .availability import schedule_refresh
+from .models import Product, StockMovement
+from .signals import stock_changed
+
+# Productos por UPDATE (lejos del límite de variables de SQLite)
+CHUNK_SIZE = 500
+
+
+class InsufficientStock(Exception):
+    """Algún producto quedaría con stock negativo; no se aplicó ningún movimiento."""
+
+    def __init__(self, shortages):
+        # {product_id: stock_disponible}
+        self.shortages = shortages
+        super().__init__(f"Stock insuficiente para los productos {sorted(shortages)}")
+
+
+class _ShortChunk(Exception):
+    pass
+
+
+def _apply_deltas(deltas, allow_negative=False):
+    """
+    Aplica {product_id: delta} con un único UPDATE condicional por bloque:
+    stock = stock + delta; los descuentos solo si el resultado no queda negativo.
+    Debe llamarse dentro de una transacción.
+    """
+    items = list(deltas.items())
+    for start in range(0, len(items), CHUNK_SIZE):
+        chunk = items[start:start + CHUNK_SIZE]
+        ids = [pk for pk, _ in chunk]
+        delta = Case(*[When(pk=pk, then=Value(d)) for pk, d in chunk], output_field=IntegerField())
+        qs = Product.objects.filter(pk__in=ids)
+        # Solo los descuentos exigen stock: un ingreso se aplica aunque el stock sea negativo
+        decrements = [(pk, d) for pk, d in chunk if d < 0]
+        if decrements and not allow_negative:
+            required = Case(*[When(pk=pk, then=Value(-d)) for pk, d in decrements], output_field=IntegerField())
+            qs = qs.filter(Q(stock__gte=required) | ~Q(pk__in=[pk for pk, _ in decrements]))
+        try:
+            # Savepoint: si no se actualizaron todos, se deshace el bloque antes de leer
+            # el stock, así el faltante informado es el real y no el ya descontado
+            with transaction.atomic():
+                if qs.update(stock=F('stock') + delta) != len(ids):
+                    raise _ShortChunk
+        except _ShortChunk:
+            current = dict(Product.objects.filter(pk__in=ids).values_list('pk', 'stock'))
+            raise InsufficientStock({
+                pk: current.get(pk, 0) for pk, d in chunk
+                if pk not in current or (d < 0 and current[pk] + d < 0)
+            })
+
+
+def apply_movements(movements, allow_negative=False):
+    """
+    Aplica una tanda de StockMovement (sin guardar) en una sola transacción:
+    - Suma los deltas por producto y actualiza el stock con F('stock') + delta.
+    - Si algún producto quedaría negativo, revierte todo y lanza InsufficientStock.
+    - Registra los movimientos en el ledger con bulk_create.
+    """
+    movements = [movement for movement in movements if movement.delta]
+    if not movements:
+        return []
+
+    deltas = defaultdict(int)
+    for movement in movements:
+        deltas[movement.product_id] += movement.delta
+
+    with transaction.atomic():
+        _apply_deltas(deltas, allow_negative=allow_negative)
+        StockMovement.objects.bulk_create(movements, batch_size=CHUNK_SIZE)
+        schedule_refresh(product_ids=deltas)
+        stock_changed.send(sender=Product, product_ids=list(deltas))
+    return movements
+
+
+def apply_movement(product, delta, reason=StockMovement.Reason.ADJUSTMENT, reference='', allow_negative=False):
+    """Atajo para un único movimiento. Devuelve el StockMovement registrado."""
+    movement = StockMovement(product_id=getattr(product, 'pk', product), delta=delta, reason=reason, reference=reference)
+    apply_movements([movement], allow_negative=allow_negative)
+    return movement
@@ -0,0 +1,49 @@
+"""Tareas en segundo plano de productos (ver jobs/queue.py)."""
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from jobs.queue import task
+
+from .exporting import export_lines
+from .importer import ProductImporter, read_rows
+
+
+@task(timeout=3600, max_attempts=2)
+def import_products(job, path, filename, batch_size=1000):
+    """Importa un archivo subido a default_storage; al terminar bien lo borra."""
+
+    def progress(result):
+        job.set_progress(result.rows, message=f"{result.created} creados, {result.updated} actualizados")
+
+    with default_storage.open(path, 'rb') as upload:
+        result = ProductImporter(batch_size=batch_size, progress=progress).run(read_rows(upload, filename))
+    default_storage.delete(path)
+    return {
+        'rows': result.rows,
+        'created': result.created,
+        'updated': result.updated,
+        'unchanged': result.unchanged,
+        'error_count': result.error_count,
+        'errors': result.errors,
+        'elapsed': round(result.elapsed, 2),
+    }
+
+
+@task(timeout=3600)
+def export_catalog(job, kind, export_format, filters=None):
+    """Genera el archivo de exportación en default_storage (jobs/exports/) para descargarlo después."""
+    count = 0
+    # Se escribe de a líneas en un temporal: la memoria no depende del tamaño del catálogo
+    with tempfile.TemporaryFile() as output:
+        for line in export_lines(kind, export_format, filters):
+            output.write(line.encode('utf-8'))
+            count += 1
+            if count % 10_000 == 0:
+                job.set_progress(count, message="filas exportadas")
+        output.seek(0)
+        filename = f"catalogo-{kind}-{timezone.localdate():%Y%m%d}.{export_format}"
+        path = default_storage.save(f"jobs/exports/{job.pk}-{filename}", File(output))
+    return {'file': path, 'filename': filename, 'lines': count}
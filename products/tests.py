@@ -1,3 +1,604 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from sales.models import DailySalesRollup
+
+from . import stock
+from .availability import rebuild_combo_availability, refresh_combo_availability, verify_combo_availability
+from .bulk import BulkAction, apply_bulk_action, bulk_queryset
+from .cache import category_version, get_category_tree
+from .exporting import export_lines
+from .importer import ProductImporter, read_csv
+from .models import Category, Combo, ComboItem, PriceHistory, Product, Repricing, StockMovement
+from .pagination import keyset_paginate
+from .pricing import apply_repricing, preview_repricing
+from .reservations import (
+    InsufficientReservation, apply_item_changes, combo_items, release_combo, reserve_combo, sell_combo,
+)
+from .search import fts_available, search_products
+from .signals import products_bulk_updated
+from .stock import InsufficientStock, apply_movement, apply_movements
+
+
+class ApplyMovementsTests(TestCase):
+
+    def _product(self, name, stock_value):
+        return Product.objects.create(name=name, price=10, stock=stock_value)
+
+    def _stock(self, product):
+        return Product.objects.values_list('stock', flat=True).get(pk=product.pk)
+
+    def test_shortage_rolls_back_every_chunk(self):
+        first, second, short = self._product('A', 5), self._product('B', 5), self._product('C', 1)
+        movements = [
+            StockMovement(product_id=product.pk, delta=-2, reason=StockMovement.Reason.SALE)
+            for product in (first, second, short)
+        ]
+        # Un producto por bloque: los dos primeros bloques ya se aplicaron cuando falla el tercero
+        with mock.patch.object(stock, 'CHUNK_SIZE', 1), self.assertRaises(InsufficientStock) as raised:
+            apply_movements(movements)
+
+        self.assertEqual(raised.exception.shortages, {short.pk: 1})
+        self.assertEqual([self._stock(p) for p in (first, second, short)], [5, 5, 1])
+        self.assertFalse(StockMovement.objects.exists())
+
+    def test_shortage_reports_stock_before_the_update(self):
+        # Después del UPDATE parcial A quedaría en 2 y 2 - 4 < 0: no debe figurar como faltante
+        enough, short = self._product('A', 6), self._product('B', 3)
+        with self.assertRaises(InsufficientStock) as raised:
+            apply_movements([
+                StockMovement(product_id=enough.pk, delta=-4, reason=StockMovement.Reason.SALE),
+                StockMovement(product_id=short.pk, delta=-5, reason=StockMovement.Reason.SALE),
+            ])
+        # Solo el producto que no alcanza, con su stock real (no el ya descontado)
+        self.assertEqual(raised.exception.shortages, {short.pk: 3})
+        self.assertEqual(self._stock(enough), 6)
+
+    def test_increment_on_negative_stock_is_applied(self):
+        product = self._product('A', -5)
+        apply_movement(product, 3)
+        self.assertEqual(self._stock(product), -2)
+        self.assertEqual(list(StockMovement.objects.values_list('delta', flat=True)), [3])
+
+    def test_increment_does_not_need_stock_when_mixed_with_decrements(self):
+        negative, available = self._product('A', -5), self._product('B', 4)
+        apply_movements([
+            StockMovement(product_id=negative.pk, delta=2, reason=StockMovement.Reason.ADJUSTMENT),
+            StockMovement(product_id=available.pk, delta=-4, reason=StockMovement.Reason.SALE),
+        ])
+        self.assertEqual([self._stock(negative), self._stock(available)], [-3, 0])
+
+
+class ProductImporterTests(TestCase):
+
+    def _import(self, content, encoding='utf-8'):
+        return ProductImporter().run(read_csv(io.BytesIO(content.encode(encoding))))
+
+    def test_stock_change_goes_through_the_ledger(self):
+        product = Product.objects.create(code='A1', name='Mate', price=10, stock=10)
+        StockMovement.objects.create(product=product, delta=10, reason=StockMovement.Reason.INITIAL)
+
+        result = self._import("codigo;nombre;precio;stock\nA1;Mate;10;7\n")
+
+        self.assertEqual(result.updated, 1)
+        product.refresh_from_db()
+        self.assertEqual(product.stock, 7)
+        ledger = StockMovement.objects.filter(product=product).aggregate(total=Sum('delta'))['total']
+        self.assertEqual(ledger, product.stock)
+
+    def test_reads_cp1252_and_single_column_files(self):
+        result = self._import("Código;Nombre;Descripción;Precio;Stock\nB1;Cañón;Niño;10,5;3\n", 'cp1252')
+        self.assertEqual((result.created, result.error_count), (1, 0))
+        self.assertEqual(Product.objects.get(code='B1').description, 'Niño')
+
+        rows = list(read_csv(io.BytesIO("nombre\nTermo\n".encode('utf-8'))))
+        self.assertEqual(rows, [{'name': 'Termo'}])
+
+    def test_resolves_categories_by_name_or_slug(self):
+        infusiones = Category.objects.create(name='Infusiones')
+        bazar = Category.objects.create(name='Bazar y cocina')
+
+        result = self._import(
+            "codigo;nombre;precio;stock;categoria\n"
+            "A1;Yerba;10;1;INFUSIÓNES\n"
+            "A2;Termo;20;1;bazar-y-cocina\n"
+            "A3;Vaso;5;1;Juguetes\n"
+            "A4;Plato;5;1;\n"
+        )
+
+        self.assertEqual((result.created, result.error_count), (3, 1))
+        self.assertEqual(result.errors[0][0], 4)
+        self.assertIn('Juguetes', result.errors[0][1])
+        self.assertEqual(
+            dict(Product.objects.values_list('code', 'category_id')),
+            {'A1': infusiones.pk, 'A2': bazar.pk, 'A4': None},
+        )
+
+
+class CategoryPathTests(TestCase):
+
+    def _paths(self):
+        return {name: (path, depth) for name, path, depth in Category.objects.values_list('name', 'path', 'depth')}
+
+    def test_moving_a_category_moves_its_subtree(self):
+        bebidas = Category.objects.create(name='Bebidas')
+        infusiones = Category.objects.create(name='Infusiones', parent=bebidas)
+        yerbas = Category.objects.create(name='Yerbas', parent=infusiones)
+        almacen = Category.objects.create(name='Almacén')
+        self.assertEqual(self._paths()['Yerbas'], (f'/{bebidas.pk}/{infusiones.pk}/{yerbas.pk}/', 2))
+
+        infusiones.parent = almacen
+        infusiones.save()
+
+        self.assertEqual(self._paths(), {
+            'Bebidas': (f'/{bebidas.pk}/', 0),
+            'Almacén': (f'/{almacen.pk}/', 0),
+            'Infusiones': (f'/{almacen.pk}/{infusiones.pk}/', 1),
+            'Yerbas': (f'/{almacen.pk}/{infusiones.pk}/{yerbas.pk}/', 2),
+        })
+
+        infusiones.parent = None
+        infusiones.save()
+        self.assertEqual(self._paths()['Yerbas'], (f'/{infusiones.pk}/{yerbas.pk}/', 1))
+
+    def test_cannot_move_into_its_own_subtree(self):
+        bebidas = Category.objects.create(name='Bebidas')
+        infusiones = Category.objects.create(name='Infusiones', parent=bebidas)
+        before = self._paths()
+
+        bebidas.parent = infusiones
+        with self.assertRaises(ValueError):
+            bebidas.save()
+        self.assertEqual(self._paths(), before)
+        self.assertIsNone(Category.objects.get(pk=bebidas.pk).parent_id)
+
+
+class CategoryVersionTests(TestCase):
+
+    def test_version_follows_the_data(self):
+        category = Category.objects.create(name='Bebidas')
+        version = category_version()
+        self.assertEqual(category_version(), version)
+
+        category.name = 'Infusiones'
+        category.save()
+        renamed = category_version()
+        self.assertNotEqual(renamed, version)
+
+        Category.objects.create(name='Yerbas', parent=category)
+        self.assertNotEqual(category_version(), renamed)
+        self.assertEqual(get_category_tree().children_of(category.pk)[0].name, 'Yerbas')
+
+
+class CategoryTreeApiTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+        self.url = reverse('products:category_tree_api')
+
+    def test_revalidates_with_the_tree_version(self):
+        bebidas = Category.objects.create(name='Bebidas')
+        yerbas = Category.objects.create(name='Yerbas', parent=bebidas)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()['tree'], {'': [[bebidas.pk, 'Bebidas']], str(bebidas.pk): [[yerbas.pk, 'Yerbas']]})
+        self.assertIn('no-cache', response['Cache-Control'])
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        yerbas.name = 'Yerbas y mates'
+        yerbas.save()
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertEqual(changed.json()['tree'][str(bebidas.pk)], [[yerbas.pk, 'Yerbas y mates']])
+
+
+class ProductAutocompleteTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+        self.url = reverse('products:product_autocomplete')
+
+    def test_filters_ranks_and_pages(self):
+        bebidas = Category.objects.create(name='Bebidas')
+        Product.objects.create(code='Y1', name='Yerba suave', price=1, stock=1, category=bebidas)
+        Product.objects.create(name='Yerba', price=1, stock=1)
+        Product.objects.create(name='Yerba vieja', price=1, stock=1, available=False)
+        Product.objects.bulk_create(Product(name=f'Mate {index:02}', price=1, stock=1) for index in range(25))
+
+        results = self.client.get(self.url, {'q': 'yerba'}).json()['results']
+        self.assertEqual(sorted(row['text'] for row in results), ['Y1 - Yerba suave', 'Yerba'])
+
+        in_category = self.client.get(self.url, {'q': 'yerba', 'category': bebidas.pk}).json()
+        self.assertEqual([row['code'] for row in in_category['results']], ['Y1'])
+
+        first = self.client.get(self.url, {'q': 'mate'}).json()
+        second = self.client.get(self.url, {'q': 'mate', 'page': 2}).json()
+        self.assertEqual((len(first['results']), first['more']), (20, True))
+        self.assertEqual((len(second['results']), second['more']), (5, False))
+        self.assertEqual(self.client.get(self.url, {'page': 'x'}).json()['results'][0]['name'], 'Mate 00')
+
+
+class ProductTrashViewTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('admin', password='clave')
+        self.client.force_login(self.user)
+
+    def test_trash_and_restore_keep_the_current_stock(self):
+        product = Product.objects.create(name='Mate', price=10, stock=10)
+        stale = Product.objects.get(pk=product.pk)
+        # Una venta confirmada después de que la vista leyó el producto
+        Product.objects.filter(pk=product.pk).update(stock=7)
+
+        with mock.patch('products.views.get_object_or_404', return_value=stale):
+            self.client.post(reverse('products:product_delete', args=[product.pk]))
+            self.assertEqual(Product.objects.values_list('available', 'stock').get(pk=product.pk), (False, 7))
+            self.client.post(reverse('products:product_restore', args=[product.pk]))
+        self.assertEqual(Product.objects.values_list('available', 'stock').get(pk=product.pk), (True, 7))
+
+
+class ComboAvailabilityTests(TestCase):
+
+    def _stored(self, combo):
+        return Combo.objects.values_list('availability__max_buildable', flat=True).get(pk=combo.pk)
+
+    def test_only_affected_combos_are_refreshed_after_commit(self):
+        yerba = Product.objects.create(name='Yerba', price=1, stock=10)
+        mate = Product.objects.create(name='Mate', price=1, stock=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            kit, solo = Combo.objects.create(name='Kit'), Combo.objects.create(name='Solo mate')
+            ComboItem.objects.create(combo=kit, product=yerba, quantity=2)
+            ComboItem.objects.create(combo=kit, product=mate, quantity=1)
+            ComboItem.objects.create(combo=solo, product=mate, quantity=3)
+        self.assertEqual((self._stored(kit), self._stored(solo)), (3, 1))
+
+        # Solo cambia el combo que lleva yerba
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_movement(yerba, -6, StockMovement.Reason.SALE)
+        self.assertEqual((self._stored(kit), self._stored(solo)), (2, 1))
+
+        # Sin commit no se recalcula: verify encuentra la diferencia y rebuild la corrige
+        with self.captureOnCommitCallbacks(execute=False):
+            apply_movement(mate, -3, StockMovement.Reason.SALE)
+        self.assertEqual((self._stored(kit), self._stored(solo)), (2, 1))
+        self.assertEqual(verify_combo_availability(), [(kit.pk, 2, 0), (solo.pk, 1, 0)])
+
+        self.assertEqual(rebuild_combo_availability(), 2)
+        self.assertEqual(verify_combo_availability(), [])
+
+
+class ComboBuildableTests(TestCase):
+
+    def test_negative_stock_counts_as_zero_everywhere(self):
+        combo = Combo.objects.create(name='Kit')
+        ComboItem.objects.create(combo=combo, product=Product.objects.create(name='A', price=1, stock=-1), quantity=2)
+        ComboItem.objects.create(combo=combo, product=Product.objects.create(name='B', price=1, stock=10), quantity=1)
+
+        refresh_combo_availability([combo.pk])
+
+        self.assertEqual(Combo.objects.with_buildable().get(pk=combo.pk).max_buildable, 0)
+        self.assertEqual(Combo.objects.get(pk=combo.pk).max_available_stock(), 0)
+        self.assertEqual(verify_combo_availability(), [])
+
+
+class ExportCatalogCommandTests(TestCase):
+
+    def test_writes_through_the_command_stdout(self):
+        Product.objects.create(code='A1', name='Mate', price=10, stock=3)
+        Product.objects.create(code='B1', name='Bombilla', price=5, stock=0, available=False)
+        output = io.StringIO()
+
+        call_command('export_catalog', '--format', 'jsonl', stdout=output)
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([(row['code'], row['stock']) for row in rows], [('A1', 3)])
+
+
+class ExportLinesTests(TestCase):
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Infusiones')
+        self.yerba = Product.objects.create(
+            code='Y1', name='Yerba', price=Decimal('10.50'), stock=4, category=self.category,
+        )
+        self.mate = Product.objects.create(name='Mate, "calabaza"', price=Decimal('20.00'), stock=0)
+        Product.objects.create(code='X1', name='Borrado', price=1, stock=1, available=False)
+
+    def test_csv_streams_the_filtered_products(self):
+        lines = list(export_lines('products', 'csv'))
+        self.assertEqual(lines[0], 'id,code,name,description,category,price,stock,available\r\n')
+        self.assertEqual(len(lines), 3)  # encabezado + disponibles, una línea por fila
+        self.assertEqual(lines[1], f'{self.mate.pk},,"Mate, ""calabaza""",,,20.00,0,1\r\n')
+
+        in_stock = list(export_lines('products', 'csv', {'status': 'in_stock'}, chunk_size=1))
+        self.assertEqual(in_stock[1:], [f'{self.yerba.pk},Y1,Yerba,,Infusiones,10.50,4,1\r\n'])
+
+    def test_jsonl_combo_rows(self):
+        combo = Combo.objects.create(name='Kit matero')
+        ComboItem.objects.create(combo=combo, product=self.yerba, quantity=2)
+        ComboItem.objects.create(combo=combo, product=self.mate, quantity=1)
+        refresh_combo_availability([combo.pk])
+
+        rows = [json.loads(line) for line in export_lines('combos', 'jsonl')]
+        self.assertEqual(rows, [{
+            'id': combo.pk, 'name': 'Kit matero', 'description': '', 'price': '41.00',
+            'max_buildable': 0, 'available': True, 'items': '2xY1|1xMate, "calabaza"',
+        }])
+
+
+class BulkActionTests(TestCase):
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Infusiones')
+        self.yerba = Product.objects.create(name='Yerba', price=1, stock=5)
+        self.mate = Product.objects.create(name='Mate', price=1, stock=0)
+        self.trashed = Product.objects.create(name='Termo', price=1, stock=1, available=False)
+        self.sent = []
+        receiver = lambda sender, product_ids, fields, **kwargs: self.sent.append((sorted(product_ids), fields))
+        products_bulk_updated.connect(receiver)
+        self.addCleanup(products_bulk_updated.disconnect, receiver)
+
+    def _available(self):
+        return dict(Product.objects.values_list('name', 'available'))
+
+    def test_each_action_is_one_update_over_its_listing(self):
+        with CaptureQueriesContext(connection) as queries:
+            count = apply_bulk_action(bulk_queryset('list', filters={'status': 'out_of_stock'}), BulkAction.TRASH)
+        self.assertEqual(count, 1)
+        # Los ids y un UPDATE (sin contar el savepoint de la transacción del test)
+        statements = [query['sql'].split()[0] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(statements, ['SELECT', 'UPDATE'])
+        self.assertEqual(self._available(), {'Yerba': True, 'Mate': False, 'Termo': False})
+        self.assertEqual(self.sent, [([self.mate.pk], ['available'])])
+
+        # Los ids de otro listado no se tocan
+        apply_bulk_action(bulk_queryset('trash', ids=[self.yerba.pk, self.trashed.pk]), BulkAction.RESTORE)
+        self.assertEqual(self._available(), {'Yerba': True, 'Mate': False, 'Termo': True})
+
+        apply_bulk_action(Product.objects.filter(pk__in=[self.yerba.pk, self.mate.pk]), BulkAction.TOGGLE)
+        self.assertEqual(self._available(), {'Yerba': False, 'Mate': True, 'Termo': True})
+
+        apply_bulk_action(bulk_queryset('list', ids=[self.mate.pk]), BulkAction.SET_CATEGORY, category=self.category)
+        self.assertEqual(Product.objects.get(pk=self.mate.pk).category, self.category)
+        self.assertEqual(self.sent[-1], ([self.mate.pk], ['category']))
+
+    def test_empty_selection_sends_no_signal(self):
+        self.assertEqual(apply_bulk_action(bulk_queryset('list', ids=[self.trashed.pk]), BulkAction.TRASH), 0)
+        self.assertEqual(self.sent, [])
+
+    def test_view_only_offers_the_actions_of_each_listing(self):
+        self.client.force_login(User.objects.create_user('admin', password='clave'))
+        url = reverse('products:product_bulk_action')
+
+        self.client.post(url, {'origin': 'list', 'action': BulkAction.DELETE, 'ids': [self.yerba.pk]})
+        self.assertTrue(Product.objects.filter(pk=self.yerba.pk).exists())
+
+        response = self.client.post(url, {'origin': 'list', 'action': BulkAction.TRASH, 'select_all': 'on', 'search': 'yer'})
+        self.assertRedirects(response, reverse('products:product_list') + '?search=yer', fetch_redirect_response=False)
+        self.assertEqual(self._available(), {'Yerba': False, 'Mate': True, 'Termo': False})
+
+
+class BulkDeleteTests(TestCase):
+
+    def _trashed_with_history(self, count, day):
+        products = [Product.objects.create(name=f'P{index}', price=1, stock=1, available=False) for index in range(count)]
+        DailySalesRollup.objects.bulk_create(
+            DailySalesRollup(day=day, product=product, quantity=1, revenue=1, sales_count=1) for product in products
+        )
+        return Product.objects.filter(pk__in=[product.pk for product in products])
+
+    def _delete_queries(self, products):
+        with CaptureQueriesContext(connection) as queries:
+            apply_bulk_action(products, BulkAction.DELETE)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_the_products(self):
+        few = self._delete_queries(self._trashed_with_history(2, datetime.date(2026, 1, 1)))
+        many = self._delete_queries(self._trashed_with_history(20, datetime.date(2026, 1, 2)))
+
+        self.assertEqual(few, many)
+        self.assertFalse(Product.objects.exists())
+        # Las ventas de los productos borrados quedan en el resumen sin producto de cada día
+        self.assertEqual(
+            list(DailySalesRollup.objects.order_by('day').values_list('product_id', 'quantity')),
+            [(None, 2), (None, 20)],
+        )
+
+
+class RepricingTests(TestCase):
+
+    def test_history_keeps_old_and_new_price_per_changed_product(self):
+        mate = Product.objects.create(name='Mate', price=Decimal('100.00'), stock=1)
+        termo = Product.objects.create(name='Termo', price=Decimal('50.00'), stock=1)
+
+        repricing = apply_repricing(Product.objects.all(), Repricing.Mode.PERCENT, '10')
+
+        history = {
+            row.product_id: (row.old_price, row.new_price, row.repricing_id, row.created is not None)
+            for row in PriceHistory.objects.all()
+        }
+        self.assertEqual(history, {
+            mate.pk: (Decimal('100.00'), Decimal('110.00'), repricing.pk, True),
+            termo.pk: (Decimal('50.00'), Decimal('55.00'), repricing.pk, True),
+        })
+        self.assertEqual(repricing.product_count, 2)
+        self.assertEqual(Product.objects.get(pk=mate.pk).price, Decimal('110.00'))
+
+    def test_rounding_modes_and_floor(self):
+        expected = {
+            Repricing.Rounding.CENTS: Decimal('1358.02'),
+            Repricing.Rounding.UNIT: Decimal('1358.00'),
+            Repricing.Rounding.TEN: Decimal('1360.00'),
+            Repricing.Rounding.HUNDRED: Decimal('1400.00'),
+            Repricing.Rounding.NINETY_NINE: Decimal('1357.99'),
+        }
+        product = Product.objects.create(name='Termo', price=Decimal('1234.56'), stock=1)
+        for rounding, price in expected.items():
+            with self.subTest(rounding=rounding):
+                Product.objects.filter(pk=product.pk).update(price=Decimal('1234.56'))
+                apply_repricing(Product.objects.all(), Repricing.Mode.PERCENT, '10', rounding)
+                self.assertEqual(Product.objects.get(pk=product.pk).price, price)
+
+        # Un descuento fijo mayor que el precio deja el producto en 0
+        apply_repricing(Product.objects.all(), Repricing.Mode.AMOUNT, '-5000')
+        self.assertEqual(Product.objects.get(pk=product.pk).price, Decimal('0.00'))
+
+    def test_preview_aggregates_without_changing_prices(self):
+        Product.objects.create(name='Mate', price=Decimal('100.00'), stock=1)
+        Product.objects.create(name='Bombilla', price=Decimal('50.00'), stock=1)
+        Product.objects.create(name='Regalo', price=Decimal('0.00'), stock=1)
+
+        preview = preview_repricing(Product.objects.all(), Repricing.Mode.PERCENT, '10')
+
+        self.assertEqual(
+            {key: value for key, value in preview.items() if key != 'sample'},
+            {
+                'matched': 3, 'changed': 2, 'old_total': Decimal('150.00'), 'new_total': Decimal('165.00'),
+                'avg_change': Decimal('5.00'), 'min_change': Decimal('0.00'), 'max_change': Decimal('10.00'),
+            },
+        )
+        self.assertEqual(
+            [(row['name'], row['new_price']) for row in preview['sample']],
+            [('Bombilla', Decimal('55.00')), ('Mate', Decimal('110.00'))],
+        )
+        self.assertFalse(PriceHistory.objects.exists())
+        self.assertEqual(Product.objects.aggregate(total=Sum('price'))['total'], Decimal('150.00'))
+
+        # El que no cambia tampoco queda en el historial
+        repricing = apply_repricing(Product.objects.all(), Repricing.Mode.PERCENT, '10')
+        self.assertEqual((repricing.product_count, PriceHistory.objects.count()), (2, 2))
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        # Nombres repetidos: el id desempata
+        for name in ['Bombilla', 'Mate', 'Mate', 'Termo', 'Yerba']:
+            Product.objects.create(name=name, price=1, stock=1)
+        self.expected = list(Product.objects.order_by('name', 'id').values_list('pk', flat=True))
+
+    def test_forward_and_back_cover_every_product_once(self):
+        pages, cursor = [], None
+        while True:
+            page = keyset_paginate(Product.objects.all(), after=cursor, per_page=2)
+            pages.append([product.pk for product in page])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+
+        previous = keyset_paginate(Product.objects.all(), before=page.previous_cursor, per_page=2)
+        self.assertEqual([product.pk for product in previous], pages[1])
+        self.assertTrue(previous.has_previous and previous.has_next)
+
+    def test_invalid_cursor_starts_from_the_first_page(self):
+        page = keyset_paginate(Product.objects.all(), after='no-es-un-cursor', per_page=2)
+        self.assertEqual([product.pk for product in page], self.expected[:2])
+        self.assertFalse(page.has_previous)
+
+
+class ProductSearchTests(TestCase):
+
+    def setUp(self):
+        self.mate = Product.objects.create(code='MT-01', name='Mate de calabaza', price=1, stock=1)
+        self.termo = Product.objects.create(code='TR-02', name='Termo acero', price=1, stock=1)
+
+    def _search(self, term, **kwargs):
+        return [product.pk for product in search_products(Product.objects.order_by('pk'), term, **kwargs)]
+
+    def test_finds_substrings_of_name_and_code_through_the_index(self):
+        self.assertTrue(fts_available(connection))
+        self.assertEqual(self._search('calab'), [self.mate.pk])
+        self.assertEqual(self._search('ACERO'), [self.termo.pk])
+        self.assertEqual(self._search('tr-0'), [self.termo.pk])
+        self.assertEqual(self._search('"'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        Product.objects.filter(pk=self.mate.pk).update(name='Bombilla')
+        self.assertEqual(self._search('calab'), [])
+        self.assertEqual(self._search('bombi'), [self.mate.pk])
+
+        self.termo.delete()
+        self.assertEqual(self._search('acero'), [])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        # El trigram no indexa términos de menos de 3 caracteres
+        self.assertEqual(self._search('er'), [self.termo.pk])
+        self.assertEqual(self._search('mt'), [self.mate.pk])
+        self.assertEqual(self._search('Ca'), [self.mate.pk])
+        self.assertEqual(self._search('  '), [self.mate.pk, self.termo.pk])
+
+    def test_ranked_orders_by_relevance(self):
+        results = list(search_products(Product.objects.all(), 'mate', ranked=True))
+        self.assertEqual([product.pk for product in results], [self.mate.pk])
+        self.assertIsNotNone(results[0].search_rank)
+
+
+class ComboReservationTests(TestCase):
+
+    def setUp(self):
+        self.yerba = Product.objects.create(name='Yerba', price=1, stock=10)
+        self.mate = Product.objects.create(name='Mate', price=1, stock=3)
+        self.combo = Combo.objects.create(name='Kit')
+        ComboItem.objects.create(combo=self.combo, product=self.yerba, quantity=2)
+        ComboItem.objects.create(combo=self.combo, product=self.mate, quantity=1)
+
+    def _state(self):
+        stocks = dict(Product.objects.values_list('name', 'stock'))
+        return stocks['Yerba'], stocks['Mate'], Combo.objects.get(pk=self.combo.pk).reserved
+
+    def test_reserve_and_release_move_stock_through_the_ledger(self):
+        reserve_combo(self.combo, 2)
+        self.assertEqual(self._state(), (6, 1, 2))
+
+        release_combo(self.combo, 1)
+        self.assertEqual(self._state(), (8, 2, 1))
+        self.assertEqual(StockMovement.objects.filter(reason=StockMovement.Reason.RESERVATION).count(), 4)
+
+        with self.assertRaises(InsufficientReservation) as raised:
+            release_combo(self.combo, 2)
+        self.assertEqual(raised.exception.reserved, 1)
+        self.assertEqual(self._state(), (8, 2, 1))
+
+    def test_reserve_without_stock_changes_nothing(self):
+        with self.assertRaises(InsufficientStock) as raised:
+            reserve_combo(self.combo, 4)
+        self.assertEqual(raised.exception.shortages, {self.mate.pk: 3})
+        self.assertEqual(self._state(), (10, 3, 0))
+
+    def test_sell_uses_the_reservation_first(self):
+        reserve_combo(self.combo, 1)
+        self.assertEqual(sell_combo(self.combo, 3), 1)
+        self.assertEqual(self._state(), (4, 0, 0))
+
+        with self.assertRaises(InsufficientStock):
+            sell_combo(self.combo, 1)
+        self.assertEqual(self._state(), (4, 0, 0))
+
+    def test_item_changes_only_move_the_difference(self):
+        reserve_combo(self.combo, 2)
+        old_items = combo_items(self.combo)
+        ComboItem.objects.filter(combo=self.combo, product=self.yerba).update(quantity=1)
+        ComboItem.objects.filter(combo=self.combo, product=self.mate).delete()
+        termo = Product.objects.create(name='Termo', price=1, stock=5)
+        ComboItem.objects.create(combo=self.combo, product=termo, quantity=2)
+
+        apply_item_changes(self.combo, old_items)
 
-# Create your tests here.
+        self.assertEqual(self._state(), (8, 3, 2))
+        self.assertEqual(Product.objects.get(pk=termo.pk).stock, 1)
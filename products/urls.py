@@ -7,9 +7,13 @@ urlpatterns = [
     path('', views.product_list, name='product_list'),
     path('trash/', views.product_trash, name='product_trash'),
     path('new/', views.product_create, name='product_create'),
+    path('import/', views.product_import, name='product_import'),
+    path('export/', views.catalog_export, name='catalog_export'),
+    path('reprice/', views.product_reprice, name='product_reprice'),
     path('<int:pk>/edit/', views.product_edit, name='product_edit'),
 
     # Acciones por POST
+    path('bulk/', views.product_bulk_action, name='product_bulk_action'),
     path('<int:pk>/delete/', views.product_delete, name='product_delete'),
     path('<int:pk>/restore/', views.product_restore, name='product_restore'),
     path('<int:pk>/delete-permanently/', views.product_delete_permanently, name='product_delete_permanently'),
@@ -22,10 +26,13 @@ urlpatterns = [
 
     # API subcategorías
     path('api/subcategories/', views.subcategories_api, name='subcategories_api'),
+    path('api/categories/', views.category_tree_api, name='category_tree_api'),
+    path('api/products/', views.product_autocomplete, name='product_autocomplete'),
 
     # Combos
     path('combos/', views.combo_list, name='combo_list'),
     path('combos/new/', views.combo_create, name='combo_create'),
     path('combos/<int:pk>/edit/', views.combo_edit, name='combo_edit'),
     path('combos/<int:pk>/delete/', views.combo_delete, name='combo_delete'),
+    path('combos/<int:pk>/reserve/', views.combo_reserve, name='combo_reserve'),
 ]
\ No newline at end of file
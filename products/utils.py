@@ -0,0 +1,11 @@
+"""Utilidades compartidas con las otras apps."""
+
+# Cantidad de ids por consulta (lejos del límite de variables de SQLite)
+CHUNK_SIZE = 500
+
+
+def chunks(ids, size=CHUNK_SIZE):
+    """Parte `ids` en listas de a `size` para filtrar con __in sin pasarse del límite."""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
@@ -1,43 +1,155 @@
+import uuid
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.contrib import messages
-from .models import Product, Category, Combo, ComboItem
-from .forms import ComboItemFormSet, ProductForm, CategoryForm, ComboForm, ComboItemForm
-from django.http import JsonResponse
+from .models import Product, Category, Combo, ComboItem, PriceHistory, Repricing, StockMovement
+from .forms import (
+    BulkActionForm, ComboItemFormSet, ProductForm, CategoryForm, ComboForm, ComboItemForm, ImportFileForm, RepricingForm,
+    product_label,
+)
+from .bulk import BulkAction, ORIGINS, apply_bulk_action, bulk_queryset, delete_products
+from .exporting import FORMATS, KINDS, export_lines
+from .cache import get_category_tree
+from .filters import get_product_filters, filter_products
+from .pagination import keyset_paginate
+from .pricing import apply_repricing, preview_repricing, repricing_queryset
+from .search import search_products
+from .stock import InsufficientStock, apply_movement
+from .reservations import InsufficientReservation, apply_item_changes, combo_items, release_combo, reserve_combo
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.utils import timezone
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from jobs.queue import enqueue
+from .tasks import export_catalog, import_products
+
+PRODUCTS_PER_PAGE = getattr(settings, 'PRODUCTS_PER_PAGE', 50)
+AUTOCOMPLETE_PAGE_SIZE = 20
+RECENT_REPRICINGS = 10
+
+# Campos que guarda la edición; el stock va por el ledger (products/stock.py)
+PRODUCT_EDIT_FIELDS = ['code', 'name', 'description', 'category', 'price', 'reorder_point', 'available', 'updated']
 
 @login_required
 def product_list(request):
-    category_filter = request.GET.get('category')
-    status_filter = request.GET.get('status')
-    search_query = request.GET.get('search') or ''  # <- evita "None"
+    filters = get_product_filters(request.GET)
 
     # Filtrado de productos y busqueda
-    products = Product.objects.filter(available=True)
-    if search_query:
-        products = products.filter(Q(name__icontains=search_query) | Q(code__icontains=search_query))
-    if category_filter:
-        products = products.filter(category_id=category_filter)
-    if status_filter == 'in_stock':
-        products = products.filter(stock__gt=0)
-    elif status_filter == 'out_of_stock':
-        products = products.filter(stock__exact=0)
+    products = filter_products(Product.objects.filter(available=True), filters)
+    # Solo las columnas que muestra la tabla, con la categoría en el mismo JOIN
+    products = products.select_related('category').only(
+        'id', 'code', 'name', 'price', 'stock', 'category__name'
+    )
+    page = keyset_paginate(
+        products,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+        per_page=PRODUCTS_PER_PAGE,
+    )
 
     context = {
-        'products': products,
-        'categories': Category.objects.all(),
-        'filters': {'category': category_filter, 'status': status_filter, 'search': search_query},
+        'products': page,
+        'page': page,
+        'categories': get_category_tree(),
+        'filters': filters,
+        'bulk_actions': _bulk_choices('list'),
         'active_tab': 'available',
     }
     return render(request, 'products/product_list.html', context)
 
+@login_required
+def catalog_export(request):
+    """
+    Exporta el catálogo (productos o combos) en CSV o JSON Lines.
+    - Respeta los filtros de product_list.
+    - Se envía en streaming: la memoria no crece con la cantidad de productos.
+    - Con background=1 se genera en segundo plano y se descarga desde la tarea.
+    """
+    export_format = request.GET.get('format') if request.GET.get('format') in FORMATS else 'csv'
+    kind = request.GET.get('kind') if request.GET.get('kind') in KINDS else 'products'
+    filters = get_product_filters(request.GET)
+
+    if request.GET.get('background'):
+        job = enqueue(
+            export_catalog, label=f"Exportar catálogo ({kind}, {export_format})", user=request.user,
+            kind=kind, export_format=export_format, filters=filters,
+        )
+        messages.info(request, "La exportación quedó en cola; el archivo se descarga desde esta página.")
+        return redirect('jobs:job_detail', pk=job.pk)
+
+    response = StreamingHttpResponse(
+        export_lines(kind, export_format, filters), content_type=FORMATS[export_format]
+    )
+    filename = f"catalogo-{kind}-{timezone.localdate():%Y%m%d}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 # API para mostrar las subcategorías asociadas a una categoría en el formulario 
 
 @login_required
 def subcategories_api(request):
-    parent_id = request.GET.get('parent')
-    qs = Category.objects.filter(parent_id=parent_id).values('id', 'name') if parent_id else []
-    return JsonResponse({'results': list(qs)})
+    # Responde desde el árbol cacheado, sin consultar la base
+    children = get_category_tree().children_of(request.GET.get('parent'))
+    return JsonResponse({'results': [{'id': child.pk, 'name': child.name} for child in children]})
+
+
+def _autocomplete_queryset(params):
+    """Productos disponibles filtrados por categoría y ordenados por relevancia (o nombre)."""
+    products = filter_products(Product.objects.filter(available=True), {'category': params.get('category')})
+    term = (params.get('q') or '').strip()
+    if term:
+        return search_products(products, term, ranked=True)
+    return products.order_by('name', 'id')
+
+
+@login_required
+async def product_autocomplete(request):
+    """
+    Autocompletado de productos para los formularios (JSON paginado).
+    - Parámetros: q (nombre o código), category, page.
+    - Vista async: bajo ASGI (Stockconf.asgi) las búsquedas no ocupan un hilo mientras esperan.
+    """
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    # Armar el queryset puede consultar la base (índice de búsqueda, árbol de categorías)
+    products = await sync_to_async(_autocomplete_queryset)(request.GET)
+    start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    rows = [
+        row async for row in products.values('id', 'code', 'name', 'price', 'stock')[
+            start:start + AUTOCOMPLETE_PAGE_SIZE + 1
+        ]
+    ]
+    for row in rows:
+        row['text'] = product_label(row['code'], row['name'])
+    return JsonResponse({
+        'results': rows[:AUTOCOMPLETE_PAGE_SIZE],
+        'more': len(rows) > AUTOCOMPLETE_PAGE_SIZE,
+    })
+
+
+def _category_tree_etag(request):
+    return f"cat-{get_category_tree().version}"
+
+
+@login_required
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_category_tree_etag)
+def category_tree_api(request):
+    """
+    Árbol completo de categorías (padre → hijos) para filtrar en el navegador.
+    - ETag fuerte según la versión del árbol: mientras no cambien las
+      categorías el navegador revalida y recibe 304 sin cuerpo.
+    """
+    return JsonResponse(get_category_tree().payload())
 
 
 @login_required
@@ -45,10 +157,13 @@ def product_trash(request):
     """
     Vista que muestra los productos en la papelera (no disponibles).
     """
-    inactive_products = Product.objects.filter(available=False)
-    
+    # La categoría en el mismo JOIN: evita una consulta por fila
+    inactive_products = Product.objects.filter(available=False).select_related('category')
+
     context = {
         'inactive_products': inactive_products,
+        'categories': get_category_tree(),
+        'bulk_actions': _bulk_choices('trash'),
         'active_tab': 'trash', # Indica qué pestaña está activa
     }
     return render(request, 'products/product_trash.html', context)
@@ -65,7 +180,12 @@ def product_create(request):
         if form.is_valid():
             product = form.save(commit=False)
             product.available = True
-            product.save()
+            with transaction.atomic():
+                product.save()
+                if product.stock:
+                    StockMovement.objects.create(
+                        product=product, delta=product.stock, reason=StockMovement.Reason.INITIAL
+                    )
             messages.success(request, "Producto creado exitosamente.")
             return redirect('products:product_list')
     else:
@@ -91,9 +211,25 @@ def product_edit(request, pk):
             product = form.save(commit=False)
             if not product.available:
                 product.available = True
-            product.save()
-            messages.success(request, "Producto actualizado exitosamente.")
-            return redirect('products:product_list')
+            try:
+                with transaction.atomic():
+                    # El stock no se sobrescribe: se aplica la diferencia como movimiento
+                    product.save(update_fields=PRODUCT_EDIT_FIELDS)
+                    if 'price' in form.changed_data:
+                        PriceHistory.objects.create(
+                            product=product, old_price=form.initial['price'], new_price=product.price,
+                        )
+                    delta = form.stock_delta()
+                    if delta:
+                        apply_movement(product, delta, reference=f"Edición de {request.user}")
+            except InsufficientStock as error:
+                form.add_error('stock', (
+                    f"El stock cambió mientras editabas (ahora hay {error.shortages[product.pk]}). "
+                    "Revisá el valor e intentá de nuevo."
+                ))
+            else:
+                messages.success(request, "Producto actualizado exitosamente.")
+                return redirect('products:product_list')
     else:
         form = ProductForm(instance=product)
     
@@ -105,6 +241,105 @@ def product_edit(request, pk):
     return render(request, 'products/product_form.html', context)
 
 
+@login_required
+def product_import(request):
+    """
+    Vista para importar productos desde un CSV o XLSX.
+    - El archivo se guarda y se importa en segundo plano (tarea products.tasks.import_products):
+      la vista responde enseguida y redirige al avance de la tarea.
+    - El archivo se procesa fila por fila y se guarda en lotes (ver products/importer.py).
+    """
+    if request.method == 'POST':
+        form = ImportFileForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            path = default_storage.save(f"jobs/imports/{uuid.uuid4().hex}-{upload.name}", upload)
+            job = enqueue(
+                import_products, label=f"Importar {upload.name}", user=request.user,
+                path=path, filename=upload.name, batch_size=form.cleaned_data['batch_size'],
+            )
+            messages.info(request, "El archivo se está importando; el resultado aparece en esta página.")
+            return redirect('jobs:job_detail', pk=job.pk)
+    else:
+        form = ImportFileForm()
+
+    context = {
+        'form': form,
+        'active_tab': 'import',
+    }
+    return render(request, 'products/product_import.html', context)
+
+
+def _bulk_choices(origin):
+    return [(value, label) for value, label in BulkAction.choices if value in ORIGINS[origin]['actions']]
+
+
+@login_required
+@require_POST
+def product_bulk_action(request):
+    """
+    Acción masiva sobre los productos marcados en product_list o product_trash
+    (o sobre todos los que coinciden con los filtros): una sola consulta por
+    acción, ver products/bulk.py.
+    """
+    form = BulkActionForm(request.POST)
+    origin = request.POST.get('origin') if request.POST.get('origin') in ORIGINS else 'list'
+    filters = get_product_filters(request.POST)
+    if origin == 'list':
+        query = {name: value for name, value in filters.items() if value}
+        redirect_url = reverse('products:product_list') + (f"?{urlencode(query)}" if query else '')
+    else:
+        redirect_url = reverse('products:product_trash')
+
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(redirect_url)
+
+    data = form.cleaned_data
+    products = bulk_queryset(origin, ids=None if data['select_all'] else data['ids'], filters=filters)
+    count = apply_bulk_action(products, data['action'], category=data['new_category'])
+    label = dict(BulkAction.choices)[data['action']]
+    messages.success(request, f"{label}: {count} producto{'s' if count != 1 else ''}.")
+    return redirect(redirect_url)
+
+
+@login_required
+def product_reprice(request):
+    """
+    Cambio de precios masivo por filtros (ver products/pricing.py).
+    - GET: formulario; los filtros del listado llegan en la URL.
+    - POST "preview": totales y una muestra calculados en la base, sin modificar nada.
+    - POST "apply": un UPDATE de los precios y el historial por producto.
+    """
+    preview = None
+    if request.method == 'POST':
+        form = RepricingForm(request.POST)
+        if form.is_valid():
+            data = form.cleaned_data
+            filters = form.filters()
+            products = repricing_queryset(filters, include_unavailable=data['include_unavailable'])
+            if 'apply' in request.POST:
+                repricing = apply_repricing(
+                    products, data['mode'], data['value'], data['rounding'], filters=filters, user=request.user,
+                )
+                messages.success(request, f"Precios actualizados: {repricing}.")
+                return redirect('products:product_reprice')
+            preview = preview_repricing(products, data['mode'], data['value'], data['rounding'])
+    else:
+        filters = get_product_filters(request.GET)
+        form = RepricingForm(initial={**filters, 'rounding': Repricing.Rounding.CENTS})
+
+    context = {
+        'form': form,
+        'preview': preview,
+        'repricings': Repricing.objects.select_related('created_by')[:RECENT_REPRICINGS],
+        'active_tab': 'reprice',
+    }
+    return render(request, 'products/product_reprice.html', context)
+
+
 @login_required
 def product_delete(request, pk):
     product = get_object_or_404(Product, pk=pk)
@@ -112,7 +347,8 @@ def product_delete(request, pk):
         messages.error(request, "Acción inválida.")
         return redirect('products:product_list')
     product.available = False
-    product.save()
+    # Solo estas columnas: el stock no se reescribe con el valor leído (va por el ledger)
+    product.save(update_fields=['available', 'updated'])
     messages.success(request, "Producto movido a la papelera.")
     return redirect('products:product_list')
 
@@ -123,7 +359,8 @@ def product_restore(request, pk):
         return redirect('products:product_trash')
     product = get_object_or_404(Product, pk=pk)
     product.available = True
-    product.save()
+    # Solo estas columnas: el stock no se reescribe con el valor leído (va por el ledger)
+    product.save(update_fields=['available', 'updated'])
     messages.success(request, "Producto restaurado exitosamente.")
     return redirect('products:product_trash')
 
@@ -133,7 +370,7 @@ def product_delete_permanently(request, pk):
         messages.error(request, "Acción inválida.")
         return redirect('products:product_trash')
     product = get_object_or_404(Product, pk=pk)
-    product.delete()
+    delete_products(Product.objects.filter(pk=product.pk))
     messages.success(request, "Producto eliminado permanentemente.")
     return redirect('products:product_trash')
 
@@ -144,7 +381,8 @@ def category_list(request):
     """
     Vista que lista las categorías.
     """
-    categories = Category.objects.all()
+    # Árbol completo desde la caché de categorías
+    categories = get_category_tree().roots
     context = {
         'categories': categories,
         'active_tab': 'categories', # Indica qué pestaña está activa
@@ -205,7 +443,8 @@ def category_delete(request, pk):
 
 @login_required
 def combo_list(request):
-    combos = Combo.objects.all()
+    # Precio en SQL, stock armable desde la tabla desnormalizada; items precargados para el detalle
+    combos = Combo.objects.with_price().with_stored_availability().with_items()
     context = {
         'combos': combos,
         'active_tab': 'combos',
@@ -238,10 +477,21 @@ def combo_edit(request, pk):
         formset = ComboItemFormSet(request.POST, instance=combo, prefix="items")
         
         if form.is_valid() and formset.is_valid():
-            form.save()
-            formset.save()
-            messages.success(request, "Combo actualizado exitosamente.")
-            return redirect('products:combo_list')
+            try:
+                with transaction.atomic():
+                    old_items = combo_items(combo)
+                    form.save()
+                    formset.save()
+                    # Con combos reservados, solo la diferencia de cantidades vuelve al stock (o sale)
+                    apply_item_changes(combo, old_items, reference=f"Edición de {request.user}")
+            except InsufficientStock as error:
+                messages.error(request, (
+                    f"No hay stock para los combos reservados con las nuevas cantidades "
+                    f"(productos {', '.join(map(str, sorted(error.shortages)))}). No se guardaron los cambios."
+                ))
+            else:
+                messages.success(request, "Combo actualizado exitosamente.")
+                return redirect('products:combo_list')
         else:
             # Debug: mostrar en consola por qué no se guarda
             print("Form errors:", form.errors)
@@ -266,6 +516,42 @@ def combo_edit(request, pk):
 def combo_delete(request, pk):
     combo = get_object_or_404(Combo, pk=pk)
     if request.method == 'POST':
-        combo.delete()
+        with transaction.atomic():
+            # Lo reservado vuelve al stock antes de borrar el combo
+            if combo.reserved:
+                release_combo(combo, combo.reserved, reference=f"Baja combo {combo.name}")
+            combo.delete()
         messages.success(request, "Combo eliminado.")
     return redirect('products:combo_list')
+
+
+@login_required
+@require_POST
+def combo_reserve(request, pk):
+    """
+    Reserva (action=reserve) o libera (action=release) combos armados.
+    - El stock de los productos cambia en una sola transacción: o alcanza para todos o no cambia nada.
+    """
+    combo = get_object_or_404(Combo, pk=pk)
+    try:
+        quantity = int(request.POST.get('quantity', ''))
+    except ValueError:
+        quantity = 0
+    if quantity < 1:
+        messages.error(request, "Indicá una cantidad mayor que cero.")
+        return redirect('products:combo_list')
+
+    reference = f"{combo.name} ({request.user})"
+    try:
+        if request.POST.get('action') == 'release':
+            release_combo(combo, quantity, reference=reference)
+            messages.success(request, f"Se liberaron {quantity} combos «{combo.name}»; sus productos volvieron al stock.")
+        else:
+            reserve_combo(combo, quantity, reference=reference)
+            messages.success(request, f"Se reservaron {quantity} combos «{combo.name}».")
+    except InsufficientStock as error:
+        names = Product.objects.filter(pk__in=error.shortages).values_list('name', flat=True)
+        messages.error(request, f"No hay stock suficiente de: {', '.join(names)}.")
+    except InsufficientReservation as error:
+        messages.error(request, f"Solo hay {error.reserved} combos «{combo.name}» reservados.")
+    return redirect('products:combo_list')
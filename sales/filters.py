@@ -0,0 +1,47 @@
+import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Sale
+
+
+def _parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def get_sale_filters(params):
+    """
+    Lee los filtros del historial de ventas desde un QueryDict (request.GET).
+    """
+    status = params.get('status')
+    return {
+        'date_from': _parse_date(params.get('date_from')),
+        'date_to': _parse_date(params.get('date_to')),
+        'client': params.get('client') or '',
+        'status': status if status in Sale.DeliveryStatus.values else '',
+    }
+
+
+def filter_sales(sales, filters):
+    """
+    Aplica fecha, cliente y estado de entrega a un queryset de ventas.
+    Las fechas se comparan como rangos de datetime para usar el índice sobre `date`.
+    """
+    if filters.get('date_from'):
+        sales = sales.filter(date__gte=_start_of_day(filters['date_from']))
+    if filters.get('date_to'):
+        sales = sales.filter(date__lt=_start_of_day(filters['date_to'] + datetime.timedelta(days=1)))
+    if filters.get('client'):
+        term = filters['client']
+        sales = sales.filter(Q(client__name__icontains=term) | Q(client__phone__icontains=term))
+    if filters.get('status'):
+        sales = sales.filter(delivery_status=filters['status'])
+    return sales
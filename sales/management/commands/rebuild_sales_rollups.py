@@ -0,0 +1,33 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.queue import enqueue
+from sales.services import rebuild_rollups
+from sales.tasks import rebuild_sales_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula los resúmenes diarios de ventas (DailySalesRollup) desde las ventas registradas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help="Recalcular solo desde este día (AAAA-MM-DD).")
+        parser.add_argument('--background', action='store_true',
+                            help="Encolar el recálculo para `run_workers` en vez de hacerlo ahora.")
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = datetime.date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError("--since debe tener el formato AAAA-MM-DD.")
+        if options['background']:
+            job = enqueue(
+                rebuild_sales_rollups, label="Recalcular resúmenes de ventas",
+                since=since.isoformat() if since else None,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Tarea #{job.pk} encolada."))
+            return
+        total = rebuild_rollups(since=since)
+        self.stdout.write(self.style.SUCCESS(f"Resúmenes recalculados: {total}"))
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:56
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0011_stockmovement_import_reason'),
+        ('staff', '0002_chofer_dni_vendedor_dni'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Client',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=200, verbose_name='Nombre')),
+                ('phone', models.CharField(blank=True, max_length=20, verbose_name='Teléfono')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='Email')),
+                ('address', models.CharField(blank=True, max_length=255, verbose_name='Dirección')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de alta')),
+            ],
+            options={
+                'verbose_name': 'Cliente',
+                'verbose_name_plural': 'Clientes',
+                'ordering': ['name'],
+                'indexes': [models.Index(fields=['phone'], name='client_phone_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Sale',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha')),
+                ('delivery_status', models.CharField(choices=[('pickup', 'Entregado en local'), ('delivery', 'En reparto')], default='pickup', max_length=20, verbose_name='Estado del envío')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total')),
+                ('client', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sales', to='sales.client', verbose_name='Cliente')),
+                ('vendedor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sales', to='staff.vendedor', verbose_name='Vendedor')),
+            ],
+            options={
+                'verbose_name': 'Venta',
+                'verbose_name_plural': 'Ventas',
+                'ordering': ['-date', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SaleLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('description', models.CharField(max_length=200, verbose_name='Descripción')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Cantidad')),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio unitario')),
+                ('line_total', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Subtotal')),
+                ('product', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sale_lines', to='products.product', verbose_name='Producto')),
+                ('sale', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='sales.sale', verbose_name='Venta')),
+            ],
+            options={
+                'verbose_name': 'Línea de venta',
+                'verbose_name_plural': 'Líneas de venta',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Facturación')),
+                ('sales_count', models.PositiveIntegerField(default=0, verbose_name='Ventas')),
+                ('product', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='products.product', verbose_name='Producto')),
+                ('vendedor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='staff.vendedor', verbose_name='Vendedor')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de ventas',
+                'verbose_name_plural': 'Resúmenes diarios de ventas',
+                'indexes': [models.Index(fields=['day', 'vendedor'], name='rollup_day_vendedor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'product', 'vendedor'), name='rollup_day_product_vendedor_uniq')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['date'], name='sale_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['client', 'date'], name='sale_client_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['delivery_status', 'date'], name='sale_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0013_combo_reserved'),
+        ('sales', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='saleline',
+            name='combo',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sale_lines', to='products.combo', verbose_name='Combo'),
+        ),
+    ]
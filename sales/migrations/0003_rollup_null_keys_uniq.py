@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:41
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_rollups(apps, schema_editor):
+    DailySalesRollup = apps.get_model('sales', 'DailySalesRollup')
+    duplicates = (
+        DailySalesRollup.objects.values('day', 'product_id', 'vendedor_id')
+        .annotate(rows=Count('id'), quantity_sum=Sum('quantity'), revenue_sum=Sum('revenue'),
+                  sales_sum=Sum('sales_count'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in list(duplicates):
+        rows = DailySalesRollup.objects.filter(
+            day=group['day'], product_id=group['product_id'], vendedor_id=group['vendedor_id'],
+        ).order_by('id')
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        keep.quantity, keep.revenue, keep.sales_count = (
+            group['quantity_sum'], group['revenue_sum'], group['sales_sum'],
+        )
+        keep.save(update_fields=['quantity', 'revenue', 'sales_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_repricing_pricehistory'),
+        ('sales', '0002_saleline_combo'),
+        ('staff', '0003_staff_activo_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_rollups, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='dailysalesrollup',
+            name='rollup_day_product_vendedor_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('product__isnull', False), ('vendedor__isnull', False)), fields=('day', 'product', 'vendedor'), name='rollup_day_product_vendedor_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('product__isnull', False), ('vendedor__isnull', True)), fields=('day', 'product'), name='rollup_day_product_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('product__isnull', True), ('vendedor__isnull', False)), fields=('day', 'vendedor'), name='rollup_day_vendedor_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('product__isnull', True), ('vendedor__isnull', True)), fields=('day',), name='rollup_day_uniq'),
+        ),
+    ]
@@ -0,0 +1,164 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from products.models import Combo, Product
+from staff.models import Vendedor
+
+
+class Client(models.Model):
+    """
+    Modelo para clientes.
+    - Se crea o se completa al registrar una venta.
+    """
+    name = models.CharField(max_length=200, verbose_name="Nombre")
+    phone = models.CharField(max_length=20, blank=True, verbose_name="Teléfono")
+    email = models.EmailField(blank=True, verbose_name="Email")
+    address = models.CharField(max_length=255, blank=True, verbose_name="Dirección")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de alta")
+
+    class Meta:
+        verbose_name = "Cliente"
+        verbose_name_plural = "Clientes"
+        ordering = ['name']
+        indexes = [
+            models.Index(fields=['phone'], name='client_phone_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class Sale(models.Model):
+    """
+    Modelo para ventas.
+    - Se registran con sales/services.py: descuenta stock y actualiza los resúmenes diarios.
+    """
+
+    class DeliveryStatus(models.TextChoices):
+        PICKUP = 'pickup', 'Entregado en local'
+        DELIVERY = 'delivery', 'En reparto'
+
+    date = models.DateTimeField(default=timezone.now, verbose_name="Fecha")
+    client = models.ForeignKey(
+        Client,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='sales',
+        verbose_name="Cliente"
+    )
+    vendedor = models.ForeignKey(
+        Vendedor,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='sales',
+        verbose_name="Vendedor"
+    )
+    delivery_status = models.CharField(
+        max_length=20,
+        choices=DeliveryStatus.choices,
+        default=DeliveryStatus.PICKUP,
+        verbose_name="Estado del envío"
+    )
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name="Total")
+
+    class Meta:
+        verbose_name = "Venta"
+        verbose_name_plural = "Ventas"
+        ordering = ['-date', '-id']
+        indexes = [
+            models.Index(fields=['date'], name='sale_date_idx'),
+            models.Index(fields=['client', 'date'], name='sale_client_date_idx'),
+            models.Index(fields=['delivery_status', 'date'], name='sale_status_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"Venta #{self.pk}"
+
+
+class SaleLine(models.Model):
+    sale = models.ForeignKey(Sale, on_delete=models.CASCADE, related_name='lines', verbose_name="Venta")
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='sale_lines',
+        verbose_name="Producto"
+    )
+    # Las líneas de combo no tienen producto: el stock de sus componentes lo maneja products/reservations.py
+    combo = models.ForeignKey(
+        Combo,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sale_lines',
+        verbose_name="Combo"
+    )
+    # Copia del nombre: el historial no cambia si el producto se edita o elimina
+    description = models.CharField(max_length=200, verbose_name="Descripción")
+    quantity = models.PositiveIntegerField(verbose_name="Cantidad")
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio unitario")
+    line_total = models.DecimalField(max_digits=12, decimal_places=2, verbose_name="Subtotal")
+
+    class Meta:
+        verbose_name = "Línea de venta"
+        verbose_name_plural = "Líneas de venta"
+
+    def __str__(self):
+        return f"{self.quantity} x {self.description}"
+
+
+class DailySalesRollup(models.Model):
+    """
+    Resumen de ventas por día × producto × vendedor.
+    - Se actualiza de forma incremental al registrar cada venta.
+    - El panel lee solo de esta tabla, nunca de las ventas crudas.
+    """
+    day = models.DateField(verbose_name="Día")
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='daily_sales',
+        verbose_name="Producto"
+    )
+    vendedor = models.ForeignKey(
+        Vendedor,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='daily_sales',
+        verbose_name="Vendedor"
+    )
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Unidades")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Facturación")
+    sales_count = models.PositiveIntegerField(default=0, verbose_name="Ventas")
+
+    class Meta:
+        verbose_name = "Resumen diario de ventas"
+        verbose_name_plural = "Resúmenes diarios de ventas"
+        # Un UNIQUE no compara NULLs (ventas sin vendedor, líneas de combo): una restricción
+        # parcial por combinación para que el upsert de add_to_rollups valga para todas las filas
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'product', 'vendedor'], name='rollup_day_product_vendedor_uniq',
+                condition=Q(product__isnull=False, vendedor__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=['day', 'product'], name='rollup_day_product_uniq',
+                condition=Q(product__isnull=False, vendedor__isnull=True),
+            ),
+            models.UniqueConstraint(
+                fields=['day', 'vendedor'], name='rollup_day_vendedor_uniq',
+                condition=Q(product__isnull=True, vendedor__isnull=False),
+            ),
+            models.UniqueConstraint(
+                fields=['day'], name='rollup_day_uniq',
+                condition=Q(product__isnull=True, vendedor__isnull=True),
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'vendedor'], name='rollup_day_vendedor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.product_id} {self.vendedor_id}"
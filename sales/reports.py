@@ -0,0 +1,101 @@
+"""
+Datos para los gráficos del panel.
+
+Todo se calcula sobre DailySalesRollup (una fila por día × producto × vendedor),
+nunca sobre las ventas crudas: el costo depende de los días consultados y no de
+la cantidad de ventas registradas.
+"""
+import datetime
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import DailySalesRollup
+
+DASHBOARD_DAYS = 30
+TOP_PRODUCTS = 10
+MONTHS = 12
+
+
+def _money(value):
+    return float(value or 0)
+
+
+def daily_revenue(days=DASHBOARD_DAYS, today=None):
+    """Facturación y unidades por día de los últimos `days` días (incluye días sin ventas)."""
+    today = today or timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    totals = {
+        row['day']: row
+        for row in DailySalesRollup.objects.filter(day__gte=start, day__lte=today)
+        .values('day').annotate(revenue_sum=Sum('revenue'), quantity_sum=Sum('quantity')).order_by()
+    }
+    labels, revenue, quantity = [], [], []
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        row = totals.get(day, {})
+        labels.append(day.strftime('%d/%m'))
+        revenue.append(_money(row.get('revenue_sum')))
+        quantity.append(row.get('quantity_sum') or 0)
+    return {'labels': labels, 'revenue': revenue, 'quantity': quantity}
+
+
+def top_products(days=DASHBOARD_DAYS, limit=TOP_PRODUCTS, today=None):
+    """Productos con más unidades vendidas en los últimos `days` días."""
+    today = today or timezone.localdate()
+    rows = (
+        DailySalesRollup.objects.filter(day__gt=today - datetime.timedelta(days=days), product__isnull=False)
+        .values('product_id', 'product__name').annotate(quantity_sum=Sum('quantity'))
+        .order_by('-quantity_sum', 'product__name')[:limit]
+    )
+    return {
+        'labels': [row['product__name'] for row in rows],
+        'quantity': [row['quantity_sum'] for row in rows],
+    }
+
+
+def revenue_by_vendedor(days=DASHBOARD_DAYS, today=None):
+    """Facturación por vendedor en los últimos `days` días."""
+    today = today or timezone.localdate()
+    rows = (
+        DailySalesRollup.objects.filter(day__gt=today - datetime.timedelta(days=days))
+        .values('vendedor__nombre', 'vendedor__apellido').annotate(revenue_sum=Sum('revenue'))
+        .order_by('-revenue_sum')
+    )
+    labels, revenue = [], []
+    for row in rows:
+        name = f"{row['vendedor__nombre'] or ''} {row['vendedor__apellido'] or ''}".strip()
+        labels.append(name or 'Sin vendedor')
+        revenue.append(_money(row['revenue_sum']))
+    return {'labels': labels, 'revenue': revenue}
+
+
+def monthly_revenue(months=MONTHS, today=None):
+    """Facturación por mes de los últimos `months` meses."""
+    today = today or timezone.localdate()
+    first = today.replace(day=1)
+    for _ in range(months - 1):
+        first = (first - datetime.timedelta(days=1)).replace(day=1)
+    totals = {
+        row['month']: row['revenue_sum']
+        for row in DailySalesRollup.objects.filter(day__gte=first)
+        .annotate(month=TruncMonth('day')).values('month')
+        .annotate(revenue_sum=Sum('revenue')).order_by()
+    }
+    labels, revenue = [], []
+    month = first
+    for _ in range(months):
+        labels.append(month.strftime('%m/%Y'))
+        revenue.append(_money(totals.get(month)))
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+    return {'labels': labels, 'revenue': revenue}
+
+
+def dashboard_data():
+    return {
+        'daily': daily_revenue(),
+        'top_products': top_products(),
+        'vendedores': revenue_by_vendedor(),
+        'monthly': monthly_revenue(),
+    }
@@ -0,0 +1,200 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from products.models import Combo, Product, StockMovement
+from products.reservations import sell_combo
+from products.stock import apply_movements
+from products.utils import chunks
+
+from .models import DailySalesRollup, Sale, SaleLine
+
+
+def record_sale(items, client=None, vendedor=None, delivery_status=Sale.DeliveryStatus.PICKUP, date=None,
+                combos=()):
+    """
+    Registra una venta en una sola transacción:
+    - `items`: iterable de (producto o id, cantidad[, precio unitario]).
+      Sin precio se usa el precio actual del producto.
+    - `combos`: igual, con combos; sin precio se usa el precio especial o la suma de sus productos.
+      Se venden con sell_combo: primero los reservados, el resto del stock de sus productos.
+    - Descuenta el stock (lanza InsufficientStock y no guarda nada si falta).
+    - Suma la venta a los resúmenes diarios (DailySalesRollup). Los combos quedan
+      sin producto: cuentan en la facturación por día y vendedor, no en el ranking de productos.
+    """
+    items = [tuple(item) for item in items]
+    combos = [tuple(item) for item in combos]
+    product_ids = {getattr(item[0], 'pk', item[0]) for item in items}
+    products = Product.objects.only('id', 'name', 'price').in_bulk(product_ids)
+    missing = product_ids - set(products)
+    if missing:
+        raise Product.DoesNotExist(f"No existen los productos {sorted(missing)}")
+
+    lines = []
+    for product, quantity, *price in items:
+        product = products[getattr(product, 'pk', product)]
+        unit_price = Decimal(price[0]) if price and price[0] is not None else product.price
+        lines.append(SaleLine(
+            product_id=product.pk,
+            description=product.name,
+            quantity=quantity,
+            unit_price=unit_price,
+            line_total=unit_price * quantity,
+        ))
+
+    combo_ids = {getattr(item[0], 'pk', item[0]) for item in combos}
+    combo_objects = Combo.objects.with_price().only('id', 'name', 'special_price').in_bulk(combo_ids)
+    missing = combo_ids - set(combo_objects)
+    if missing:
+        raise Combo.DoesNotExist(f"No existen los combos {sorted(missing)}")
+    for combo, quantity, *price in combos:
+        combo = combo_objects[getattr(combo, 'pk', combo)]
+        unit_price = Decimal(price[0]) if price and price[0] is not None else combo.computed_price
+        lines.append(SaleLine(
+            combo_id=combo.pk,
+            description=combo.name,
+            quantity=quantity,
+            unit_price=unit_price,
+            line_total=unit_price * quantity,
+        ))
+
+    with transaction.atomic():
+        sale = Sale.objects.create(
+            date=date or timezone.now(),
+            client=client,
+            vendedor=vendedor,
+            delivery_status=delivery_status,
+            total=sum((line.line_total for line in lines), Decimal('0')),
+        )
+        for line in lines:
+            line.sale = sale
+        SaleLine.objects.bulk_create(lines)
+        apply_movements(
+            StockMovement(
+                product_id=line.product_id, delta=-line.quantity,
+                reason=StockMovement.Reason.SALE, reference=f"Venta #{sale.pk}",
+            )
+            for line in lines if line.product_id
+        )
+        for line in lines:
+            if line.combo_id:
+                sell_combo(line.combo_id, line.quantity, reference=f"Venta #{sale.pk}")
+        add_to_rollups(sale, lines)
+    return sale
+
+
+def _upsert_rollup(key, quantity, revenue, sales_count):
+    """
+    Suma al resumen de `key` (día, producto, vendedor; los dos últimos pueden ser None).
+    Primero intenta un UPDATE con F(); si la fila no existe la crea, y si otra
+    transacción la creó en el medio vuelve a intentar el UPDATE.
+    """
+    increments = {
+        'quantity': F('quantity') + quantity,
+        'revenue': F('revenue') + revenue,
+        'sales_count': F('sales_count') + sales_count,
+    }
+    if DailySalesRollup.objects.filter(**key).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            DailySalesRollup.objects.create(**key, quantity=quantity, revenue=revenue, sales_count=sales_count)
+    except IntegrityError:
+        DailySalesRollup.objects.filter(**key).update(**increments)
+
+
+def add_to_rollups(sale, lines):
+    """Suma las líneas de una venta al resumen del día × producto × vendedor."""
+    totals = defaultdict(lambda: [0, Decimal('0')])
+    for line in lines:
+        totals[line.product_id][0] += line.quantity
+        totals[line.product_id][1] += line.line_total
+
+    day = timezone.localdate(sale.date)
+    for product_id, (quantity, revenue) in totals.items():
+        _upsert_rollup({'day': day, 'product_id': product_id, 'vendedor_id': sale.vendedor_id}, quantity, revenue, 1)
+
+
+def detach_rollups(field, ids):
+    """
+    Antes de borrar productos o vendedores (`field` = 'product' o 'vendedor'):
+    suma sus resúmenes a los del mismo día sin ese producto/vendedor. Si el
+    SET_NULL los dejara en NULL chocarían con esas filas (únicas también con NULL).
+    Cantidad fija de consultas por bloque de ids, no una por producto.
+    """
+    column = f'{field}_id'
+    other = 'vendedor_id' if field == 'product' else 'product_id'
+    totals = defaultdict(lambda: [0, Decimal('0'), 0])
+    with transaction.atomic():
+        for chunk in chunks(ids):
+            rows = DailySalesRollup.objects.filter(**{f'{column}__in': chunk})
+            grouped = rows.values('day', other).annotate(
+                quantity_sum=Sum('quantity'), revenue_sum=Sum('revenue'), sales_sum=Sum('sales_count'),
+            ).order_by()
+            for row in grouped:
+                total = totals[row['day'], row[other]]
+                total[0] += row['quantity_sum']
+                total[1] += row['revenue_sum']
+                total[2] += row['sales_sum']
+            rows.delete()
+        if not totals:
+            return
+
+        # Filas sin ese producto/vendedor que ya existen para esos días
+        targets = {}
+        for days in chunks({day for day, _ in totals}):
+            for rollup in DailySalesRollup.objects.filter(**{f'{column}__isnull': True}, day__in=days):
+                targets[rollup.day, getattr(rollup, other)] = rollup
+        to_update, to_create = [], []
+        for key, (quantity, revenue, sales_count) in totals.items():
+            rollup = targets.get(key)
+            if rollup is None:
+                to_create.append(DailySalesRollup(
+                    day=key[0], **{other: key[1]}, quantity=quantity, revenue=revenue, sales_count=sales_count,
+                ))
+                continue
+            rollup.quantity += quantity
+            rollup.revenue += revenue
+            rollup.sales_count += sales_count
+            to_update.append(rollup)
+        DailySalesRollup.objects.bulk_update(to_update, ['quantity', 'revenue', 'sales_count'], batch_size=500)
+        DailySalesRollup.objects.bulk_create(to_create, batch_size=500)
+
+
+def rebuild_rollups(since=None):
+    """
+    Recalcula los resúmenes desde las ventas (a partir del día `since`, o todos).
+    Es la única operación que recorre las ventas crudas.
+    """
+    lines = SaleLine.objects.all()
+    rollups = DailySalesRollup.objects.all()
+    if since:
+        lines = lines.filter(sale__date__gte=timezone.make_aware(
+            datetime.datetime.combine(since, datetime.time.min)
+        ))
+        rollups = rollups.filter(day__gte=since)
+
+    grouped = (
+        lines.annotate(day=TruncDate('sale__date'))
+        .values('day', 'product_id', 'sale__vendedor_id')
+        .annotate(quantity_sum=Sum('quantity'), revenue_sum=Sum('line_total'), count=Count('sale_id', distinct=True))
+        .order_by()
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = DailySalesRollup.objects.bulk_create(
+            (
+                DailySalesRollup(
+                    day=row['day'], product_id=row['product_id'], vendedor_id=row['sale__vendedor_id'],
+                    quantity=row['quantity_sum'], revenue=row['revenue_sum'], sales_count=row['count'],
+                )
+                for row in grouped.iterator()
+            ),
+            batch_size=500,
+        )
+    return len(created)
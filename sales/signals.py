@@ -0,0 +1,18 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from products.signals import products_deleting
+from staff.models import Vendedor
+
+from .services import detach_rollups
+
+
+@receiver(products_deleting)
+def product_rollups(sender, product_ids, **kwargs):
+    detach_rollups('product', product_ids)
+
+
+@receiver(pre_delete, sender=Vendedor)
+def vendedor_rollups(sender, instance, **kwargs):
+    # Los vendedores se borran de a uno (staff/views.py)
+    detach_rollups('vendedor', [instance.pk])
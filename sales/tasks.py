@@ -0,0 +1,14 @@
+"""Tareas en segundo plano de ventas (ver jobs/queue.py)."""
+import datetime
+
+from jobs.queue import task
+
+from .services import rebuild_rollups
+
+
+@task(timeout=3600)
+def rebuild_sales_rollups(job, since=None):
+    """Recalcula DailySalesRollup (desde `since`, AAAA-MM-DD, o completo)."""
+    job.set_progress(0, message="recalculando resúmenes")
+    total = rebuild_rollups(since=datetime.date.fromisoformat(since) if since else None)
+    return {'rollups': total}
@@ -0,0 +1,43 @@
+import datetime
+
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from products.bulk import delete_products
+from products.models import Product
+
+from .models import DailySalesRollup
+from .services import record_sale
+
+
+class DailySalesRollupTests(TestCase):
+
+    def setUp(self):
+        self.mate = Product.objects.create(name='Mate', price=10, stock=100)
+        self.termo = Product.objects.create(name='Termo', price=20, stock=100)
+
+    def test_null_keys_are_unique_per_day(self):
+        day = datetime.date(2026, 1, 5)
+        DailySalesRollup.objects.create(day=day, product=None, vendedor=None)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailySalesRollup.objects.create(day=day, product=None, vendedor=None)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DailySalesRollup.objects.create(day=day, product=self.mate, vendedor=None)
+            DailySalesRollup.objects.create(day=day, product=self.mate, vendedor=None)
+
+    def test_sales_without_vendedor_share_one_row(self):
+        record_sale([(self.mate, 2)])
+        record_sale([(self.mate, 3)])
+        rollup = DailySalesRollup.objects.get()
+        self.assertEqual((rollup.quantity, rollup.sales_count, rollup.vendedor_id), (5, 2, None))
+
+    def test_deleting_a_product_merges_its_rollups(self):
+        day = datetime.date(2026, 1, 5)
+        DailySalesRollup.objects.create(day=day, product=None, quantity=1, revenue=5, sales_count=1)
+        DailySalesRollup.objects.create(day=day, product=self.mate, quantity=2, revenue=20, sales_count=1)
+        DailySalesRollup.objects.create(day=day, product=self.termo, quantity=1, revenue=20, sales_count=1)
+
+        delete_products(Product.objects.filter(pk__in=[self.mate.pk, self.termo.pk]))
+
+        rollup = DailySalesRollup.objects.get()
+        self.assertEqual((rollup.product_id, rollup.quantity, rollup.revenue, rollup.sales_count), (None, 4, 45, 3))
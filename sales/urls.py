@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'sales'
+
+urlpatterns = [
+    path('', views.sale_list, name='sale_list'),
+    path('<int:pk>/estado/', views.sale_status, name='sale_status'),
+]
@@ -0,0 +1,44 @@
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.core.paginator import Paginator
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+from .filters import get_sale_filters, filter_sales
+from .models import Sale
+
+SALES_PER_PAGE = 50
+
+
+@login_required
+def sale_list(request):
+    """
+    Historial de ventas con filtros por fecha, cliente y estado de entrega.
+    """
+    filters = get_sale_filters(request.GET)
+    sales = filter_sales(Sale.objects.select_related('client', 'vendedor'), filters)
+    page = Paginator(sales.prefetch_related('lines'), SALES_PER_PAGE).get_page(request.GET.get('page'))
+
+    return render(request, 'sales/sale_list.html', {
+        'sales': page,
+        'page': page,
+        'filters': filters,
+        'delivery_statuses': Sale.DeliveryStatus.choices,
+    })
+
+
+@login_required
+@require_POST
+def sale_status(request, pk):
+    """
+    Cambia manualmente el estado de entrega de una venta.
+    """
+    sale = get_object_or_404(Sale, pk=pk)
+    status = request.POST.get('delivery_status')
+    if status in Sale.DeliveryStatus.values:
+        Sale.objects.filter(pk=sale.pk).update(delivery_status=status)
+        messages.success(request, f"{sale}: estado actualizado.")
+    next_url = request.POST.get('next')
+    if next_url and url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        return redirect(next_url)
+    return redirect('sales:sale_list')
@@ -0,0 +1,24 @@
+from django import forms
+
+from staff.models import Chofer
+from .models import Shipment
+
+
+class ShipmentForm(forms.ModelForm):
+    class Meta:
+        model = Shipment
+        fields = ['recipient', 'address', 'phone', 'chofer', 'status', 'scheduled_date', 'notes']
+        widgets = {
+            'recipient': forms.TextInput(attrs={'class': 'form-control'}),
+            'address': forms.TextInput(attrs={'class': 'form-control'}),
+            'phone': forms.TextInput(attrs={'class': 'form-control'}),
+            'chofer': forms.Select(attrs={'class': 'form-control'}),
+            'status': forms.Select(attrs={'class': 'form-control'}),
+            'scheduled_date': forms.DateInput(format='%Y-%m-%d', attrs={'class': 'form-control', 'type': 'date'}),
+            'notes': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Solo choferes activos para asignar envíos
+        self.fields['chofer'].queryset = Chofer.objects.filter(activo=True)
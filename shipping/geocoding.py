@@ -0,0 +1,95 @@
+"""
+Coordenadas de las direcciones de envío desde la tabla local GeocodeCache.
+
+Las direcciones se comparan normalizadas (sin tildes, en minúsculas, sin
+signos y con espacios simples): "Av. Córdoba  1234" y "av cordoba 1234" son la
+misma entrada. Las que no están en la caché quedan sin coordenadas y van al
+final del recorrido (ver shipping/routing.py).
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+
+from .models import GeocodeCache, Shipment
+from .routing import distances_from, store_location
+
+_NOT_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_address(address):
+    text = unicodedata.normalize('NFKD', address or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NOT_WORD.sub(' ', text.lower()).split())[:255]
+
+
+def lookup(addresses):
+    """{dirección normalizada: (lat, lng)} de las que están en la caché (una consulta)."""
+    keys = {normalize_address(address) for address in addresses} - {''}
+    return {
+        address: (latitude, longitude)
+        for address, latitude, longitude in GeocodeCache.objects.filter(address__in=keys)
+        .values_list('address', 'latitude', 'longitude')
+    }
+
+
+def fill_coordinates(shipments):
+    """
+    Completa latitude, longitude y store_distance de los envíos (sin guardar).
+    Devuelve los que cambiaron.
+    """
+    shipments = list(shipments)
+    known = lookup(shipment.address for shipment in shipments)
+    located = [known.get(normalize_address(shipment.address), (None, None)) for shipment in shipments]
+    points = [point for point in located if point[0] is not None]
+    distances = iter(distances_from(store_location(), points).round(3).tolist())
+    changed = []
+    for shipment, (latitude, longitude) in zip(shipments, located):
+        distance = next(distances) if latitude is not None else None
+        if (shipment.latitude, shipment.longitude, shipment.store_distance) != (latitude, longitude, distance):
+            shipment.latitude, shipment.longitude, shipment.store_distance = latitude, longitude, distance
+            changed.append(shipment)
+    return changed
+
+
+def geocode_shipments(shipments=None, batch_size=2000):
+    """
+    Completa y guarda las coordenadas de los envíos (por defecto, los que no
+    tienen). Devuelve la cantidad de envíos actualizados.
+    """
+    if shipments is None:
+        shipments = Shipment.objects.filter(latitude__isnull=True)
+    shipments = shipments.only('id', 'address', 'latitude', 'longitude', 'store_distance')
+    updated = 0
+    batch = []
+    for shipment in shipments.iterator(chunk_size=batch_size):
+        batch.append(shipment)
+        if len(batch) == batch_size:
+            updated += _save_coordinates(batch)
+            batch = []
+    return updated + _save_coordinates(batch)
+
+
+def _save_coordinates(shipments):
+    changed = fill_coordinates(shipments)
+    with transaction.atomic():
+        Shipment.objects.bulk_update(changed, ['latitude', 'longitude', 'store_distance'], batch_size=500)
+    return len(changed)
+
+
+def load_geocodes(rows, batch_size=2000):
+    """
+    Carga filas (dirección, lat, lng) en la caché; si la dirección ya estaba,
+    actualiza sus coordenadas. Devuelve la cantidad de filas guardadas.
+    """
+    entries = {}
+    for address, latitude, longitude in rows:
+        key = normalize_address(address)
+        if key:
+            entries[key] = GeocodeCache(address=key, latitude=float(latitude), longitude=float(longitude))
+    with transaction.atomic():
+        GeocodeCache.objects.bulk_create(
+            entries.values(), batch_size=batch_size,
+            update_conflicts=True, unique_fields=['address'], update_fields=['latitude', 'longitude', 'updated'],
+        )
+    return len(entries)
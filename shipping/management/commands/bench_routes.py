@@ -0,0 +1,86 @@
+import statistics
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from shipping.routing import (
+    EARTH_RADIUS_KM, distance_matrix, nearest_neighbour, route_length, store_location, two_opt,
+)
+
+
+def random_stops(count, radius_km, rng, origin):
+    """`count` puntos (lat, lng) uniformes en un círculo de `radius_km` alrededor de `origin`."""
+    distance = radius_km * np.sqrt(rng.random(count))
+    bearing = rng.random(count) * 2 * np.pi
+    lat0, lng0 = np.radians(origin)
+    angular = distance / EARTH_RADIUS_KM
+    lat = np.arcsin(np.sin(lat0) * np.cos(angular) + np.cos(lat0) * np.sin(angular) * np.cos(bearing))
+    lng = lng0 + np.arctan2(
+        np.sin(bearing) * np.sin(angular) * np.cos(lat0), np.cos(angular) - np.sin(lat0) * np.sin(lat)
+    )
+    return np.degrees(np.column_stack([lat, lng]))
+
+
+def _timed(func, *args):
+    began = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - began) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide el optimizador de recorridos (shipping/routing.py) con paradas al azar alrededor del "
+        "local: tiempo de la matriz de distancias, del vecino más cercano y del 2-opt, y km ahorrados "
+        "frente al orden sin optimizar. No usa la base de datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stops', default='50,100,200,300,500', help="Cantidades de paradas separadas por coma.")
+        parser.add_argument('--repeat', type=int, default=5, help="Recorridos distintos por cantidad (mediana).")
+        parser.add_argument('--radius', type=float, default=15.0, help="Radio de reparto en km.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--max-ms', type=float, default=1000.0,
+                            help="Tiempo máximo aceptable por chofer; el comando falla si se supera.")
+
+    def handle(self, *args, **options):
+        try:
+            counts = [int(value) for value in options['stops'].split(',')]
+        except ValueError:
+            raise CommandError("--stops debe ser una lista de enteros, p. ej. 100,300.")
+        rng = np.random.default_rng(options['seed'])
+        origin = store_location()
+
+        self.stdout.write(
+            f"{'paradas':>7} {'matriz ms':>10} {'vecino ms':>10} {'2-opt ms':>9} {'total ms':>9} "
+            f"{'sin opt km':>11} {'vecino km':>10} {'2-opt km':>9} {'ahorro':>7}"
+        )
+        too_slow = []
+        for count in counts:
+            rows = []
+            for _ in range(options['repeat']):
+                points = np.vstack([origin, random_stops(count, options['radius'], rng, origin)])
+                dist, matrix_ms = _timed(distance_matrix, points)
+                seed, seed_ms = _timed(nearest_neighbour, dist)
+                route, opt_ms = _timed(two_opt, seed, dist)
+                rows.append({
+                    'matrix': matrix_ms, 'seed': seed_ms, 'opt': opt_ms,
+                    'total': matrix_ms + seed_ms + opt_ms,
+                    'unordered': route_length(np.arange(len(points)), dist),
+                    'seed_km': route_length(seed, dist),
+                    'opt_km': route_length(route, dist),
+                })
+            median = {key: statistics.median(row[key] for row in rows) for key in rows[0]}
+            saving = 1 - median['opt_km'] / median['unordered'] if median['unordered'] else 0.0
+            self.stdout.write(
+                f"{count:>7} {median['matrix']:>10.2f} {median['seed']:>10.2f} {median['opt']:>9.2f} "
+                f"{median['total']:>9.2f} {median['unordered']:>11.1f} {median['seed_km']:>10.1f} "
+                f"{median['opt_km']:>9.1f} {saving:>7.0%}"
+            )
+            if max(row['total'] for row in rows) > options['max_ms']:
+                too_slow.append(count)
+        if too_slow:
+            raise CommandError(
+                f"Más de {options['max_ms']:.0f} ms por chofer con {', '.join(map(str, too_slow))} paradas."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Todos los recorridos por debajo de {options['max_ms']:.0f} ms."))
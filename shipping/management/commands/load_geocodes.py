@@ -0,0 +1,52 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from shipping.geocoding import geocode_shipments, load_geocodes, normalize_address
+from shipping.routing import update_routes
+
+# Encabezados aceptados (normalizados) para cada columna
+COLUMNS = {
+    'address': {'address', 'direccion', 'domicilio'},
+    'latitude': {'latitude', 'latitud', 'lat'},
+    'longitude': {'longitude', 'longitud', 'lng', 'lon'},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga un CSV de direcciones con coordenadas (dirección, latitud, longitud) en la caché "
+        "de geocodificación, completa los envíos sin coordenadas y recalcula los recorridos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Archivo CSV con encabezado.")
+        parser.add_argument('--no-routes', action='store_true', help="No recalcular los recorridos.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as source:
+                loaded = load_geocodes(self._rows(csv.DictReader(source)))
+        except OSError as error:
+            raise CommandError(f"No se pudo leer el archivo: {error}")
+        self.stdout.write(f"Direcciones en caché: {loaded}")
+        self.stdout.write(f"Envíos con coordenadas nuevas: {geocode_shipments()}")
+        if not options['no_routes']:
+            lengths = update_routes()
+            self.stdout.write(f"Recorridos recalculados: {len(lengths)} choferes")
+        self.stdout.write(self.style.SUCCESS("Listo."))
+
+    def _rows(self, reader):
+        headers = {}
+        for header in reader.fieldnames or []:
+            for column, aliases in COLUMNS.items():
+                if normalize_address(header) in aliases:
+                    headers[column] = header
+        missing = set(COLUMNS) - set(headers)
+        if missing:
+            raise CommandError(f"Faltan columnas en el CSV: {', '.join(sorted(missing))}.")
+        for line, row in enumerate(reader, start=2):
+            try:
+                yield row[headers['address']], float(row[headers['latitude']]), float(row[headers['longitude']])
+            except (TypeError, ValueError):
+                self.stderr.write(f"Línea {line}: coordenadas inválidas, se omite.")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from shipping.geocoding import geocode_shipments
+from shipping.routing import update_routes
+from staff.models import Chofer
+
+
+class Command(BaseCommand):
+    help = (
+        "Completa las coordenadas de los envíos desde la caché de direcciones y recalcula el "
+        "orden de reparto de cada chofer (vecino más cercano + 2-opt)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chofer', type=int, action='append', dest='choferes',
+                            help="Solo este chofer (se puede repetir).")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Envíos con coordenadas nuevas: {geocode_shipments()}")
+        lengths = update_routes(options['choferes'])
+        names = {chofer.pk: str(chofer) for chofer in Chofer.objects.filter(pk__in=lengths)}
+        for chofer_id, length in sorted(lengths.items(), key=lambda item: -item[1]):
+            self.stdout.write(f"{names.get(chofer_id, chofer_id):<40} {length:>8.1f} km")
+        self.stdout.write(self.style.SUCCESS(f"Recorridos recalculados: {len(lengths)} choferes"))
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import Shipment
+from .pdf import render_manifest_to_file
+
+# Estados que entran en la hoja de ruta
+MANIFEST_STATUSES = [Shipment.Status.PENDING, Shipment.Status.IN_TRANSIT]
+# Segundos que un PDF viejo sigue en disco después de su último uso: una petición
+# que acaba de encontrarlo en la caché todavía puede estar por abrirlo
+MANIFEST_STALE_GRACE = getattr(settings, 'MANIFEST_STALE_GRACE', 300)
+
+
+def cache_dir():
+    path = Path(getattr(settings, 'MANIFEST_CACHE_DIR', Path(settings.MEDIA_ROOT) / 'manifests'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def manifest_data(choferes):
+    """
+    Datos planos (serializables) de la hoja de ruta de cada chofer.
+    Una sola consulta de envíos para todos los choferes.
+    """
+    data = {
+        chofer.pk: {
+            'chofer': {'id': chofer.pk, 'name': str(chofer), 'telefono': chofer.telefono},
+            'shipments': [],
+        }
+        for chofer in choferes
+    }
+    # En el orden de reparto calculado (shipping/routing.py); los que no tienen, al final
+    shipments = Shipment.objects.filter(chofer_id__in=data, status__in=MANIFEST_STATUSES).order_by(
+        'chofer_id', F('route_position').asc(nulls_last=True), 'scheduled_date', 'id'
+    )
+    for shipment in shipments:
+        data[shipment.chofer_id]['shipments'].append({
+            'id': shipment.pk,
+            'date': f"{shipment.scheduled_date:%d/%m/%Y}",
+            'recipient': shipment.recipient,
+            'address': shipment.address,
+            'phone': shipment.phone,
+            'notes': shipment.notes,
+            'status': shipment.get_status_display(),
+        })
+    return data
+
+
+def manifest_path(data):
+    """Ruta en caché: cambia solo si cambia el conjunto de envíos (o el chofer)."""
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:20]
+    return cache_dir() / f"chofer-{data['chofer']['id']}-{digest}.pdf"
+
+
+def _mark_used(path):
+    """Actualiza la fecha del PDF en caché (último uso). False si no existe."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _discard_stale(chofer_id, current):
+    """Borra los PDFs anteriores del chofer que no se usaron en el período de gracia."""
+    limit = time.time() - MANIFEST_STALE_GRACE
+    for path in cache_dir().glob(f"chofer-{chofer_id}-*.pdf"):
+        try:
+            if path != current and path.stat().st_mtime < limit:
+                path.unlink()
+        except FileNotFoundError:
+            pass  # Otro proceso ya lo borró
+
+
+def generate_manifests(choferes, max_workers=None):
+    """
+    Genera (o toma de la caché) el PDF de cada chofer y va devolviendo
+    (chofer_id, ruta) a medida que están listos.
+    - Los que no cambiaron se leen de disco sin volver a generarse.
+    - Los demás se generan en paralelo en un pool de procesos.
+    """
+    pending = {}
+    for chofer_id, data in manifest_data(choferes).items():
+        path = manifest_path(data)
+        if _mark_used(path):
+            yield chofer_id, path
+        else:
+            pending[chofer_id] = (data, path)
+
+    if not pending:
+        return
+    if len(pending) == 1:
+        # No vale la pena levantar un pool para un solo PDF
+        (chofer_id, (data, path)), = pending.items()
+        render_manifest_to_file(data, str(path))
+        _discard_stale(chofer_id, path)
+        yield chofer_id, path
+        return
+
+    workers = max_workers or getattr(settings, 'MANIFEST_WORKERS', None)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_manifest_to_file, data, str(path)): (chofer_id, path)
+            for chofer_id, (data, path) in pending.items()
+        }
+        for future in as_completed(futures):
+            chofer_id, path = futures[future]
+            future.result()
+            _discard_stale(chofer_id, path)
+            yield chofer_id, path
+
+
+class _ZipBuffer:
+    """Destino no posicionable para ZipFile: acumula lo escrito hasta que se lo retira."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def zip_manifests(choferes, names):
+    """
+    ZIP con el PDF de cada chofer, generado en streaming: cada PDF se agrega
+    (y se envía) apenas está listo. `names` mapea chofer_id → nombre de archivo.
+    """
+    buffer = _ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for chofer_id, path in generate_manifests(choferes):
+            archive.write(path, arcname=names[chofer_id])
+            yield buffer.take()
+    yield buffer.take()
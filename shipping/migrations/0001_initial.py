@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('staff', '0002_chofer_dni_vendedor_dni'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Shipment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.CharField(max_length=200, verbose_name='Destinatario')),
+                ('address', models.CharField(max_length=255, verbose_name='Dirección')),
+                ('phone', models.CharField(blank=True, max_length=20, verbose_name='Teléfono')),
+                ('notes', models.TextField(blank=True, verbose_name='Notas')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('in_transit', 'En reparto'), ('delivered', 'Entregado')], default='pending', max_length=20, verbose_name='Estado')),
+                ('scheduled_date', models.DateField(default=django.utils.timezone.now, verbose_name='Fecha de entrega')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+                ('chofer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='shipments', to='staff.chofer', verbose_name='Chofer')),
+            ],
+            options={
+                'verbose_name': 'Envío',
+                'verbose_name_plural': 'Envíos',
+                'ordering': ['scheduled_date', 'id'],
+                'indexes': [models.Index(fields=['chofer', 'status'], name='shipment_chofer_status_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shipping', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(max_length=255, unique=True, verbose_name='Dirección normalizada')),
+                ('latitude', models.FloatField(verbose_name='Latitud')),
+                ('longitude', models.FloatField(verbose_name='Longitud')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Última modificación')),
+            ],
+            options={
+                'verbose_name': 'Dirección geocodificada',
+                'verbose_name_plural': 'Direcciones geocodificadas',
+            },
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='Latitud'),
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, verbose_name='Longitud'),
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='route_position',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Orden de reparto'),
+        ),
+        migrations.AddField(
+            model_name='shipment',
+            name='store_distance',
+            field=models.FloatField(blank=True, null=True, verbose_name='Distancia al local (km)'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import models
+from django.utils import timezone
+
+from staff.models import Chofer
+
+
+class Shipment(models.Model):
+    """
+    Envío a domicilio.
+    - Se asigna a un chofer; los pendientes forman su hoja de ruta (ver shipping/manifests.py).
+    - Las coordenadas salen de GeocodeCache (ver shipping/geocoding.py) y
+      route_position es el orden de reparto calculado en shipping/routing.py.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendiente'
+        IN_TRANSIT = 'in_transit', 'En reparto'
+        DELIVERED = 'delivered', 'Entregado'
+
+    chofer = models.ForeignKey(
+        Chofer,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='shipments',
+        verbose_name="Chofer"
+    )
+    recipient = models.CharField(max_length=200, verbose_name="Destinatario")
+    address = models.CharField(max_length=255, verbose_name="Dirección")
+    phone = models.CharField(max_length=20, blank=True, verbose_name="Teléfono")
+    notes = models.TextField(blank=True, verbose_name="Notas")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING, verbose_name="Estado")
+    scheduled_date = models.DateField(default=timezone.now, verbose_name="Fecha de entrega")
+    latitude = models.FloatField(null=True, blank=True, verbose_name="Latitud")
+    longitude = models.FloatField(null=True, blank=True, verbose_name="Longitud")
+    store_distance = models.FloatField(null=True, blank=True, verbose_name="Distancia al local (km)")
+    route_position = models.PositiveIntegerField(null=True, blank=True, verbose_name="Orden de reparto")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de creación")
+    updated = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Envío"
+        verbose_name_plural = "Envíos"
+        ordering = ['scheduled_date', 'id']
+        indexes = [
+            models.Index(fields=['chofer', 'status'], name='shipment_chofer_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} - {self.address}"
+
+
+class GeocodeCache(models.Model):
+    """
+    Coordenadas conocidas de cada dirección (normalizada, ver shipping/geocoding.py).
+    Se carga con `manage.py load_geocodes`; no se consulta ningún servicio externo.
+    """
+    address = models.CharField(max_length=255, unique=True, verbose_name="Dirección normalizada")
+    latitude = models.FloatField(verbose_name="Latitud")
+    longitude = models.FloatField(verbose_name="Longitud")
+    updated = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+
+    class Meta:
+        verbose_name = "Dirección geocodificada"
+        verbose_name_plural = "Direcciones geocodificadas"
+
+    def __str__(self):
+        return f"{self.address} ({self.latitude:.5f}, {self.longitude:.5f})"
@@ -0,0 +1,60 @@
+import os
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Este módulo no importa Django: corre dentro de los procesos del pool.
+
+
+def render_manifest(data):
+    """Arma el PDF de la hoja de ruta de un chofer a partir de datos planos."""
+    buffer = BytesIO()
+    styles = getSampleStyleSheet()
+    document = SimpleDocTemplate(
+        buffer, pagesize=A4, leftMargin=1.5 * cm, rightMargin=1.5 * cm,
+        topMargin=1.5 * cm, bottomMargin=1.5 * cm, title=f"Envíos - {data['chofer']['name']}",
+    )
+    story = [
+        Paragraph(f"Hoja de ruta - {escape(data['chofer']['name'])}", styles['Title']),
+        Paragraph(f"Teléfono: {escape(data['chofer']['telefono'])} · Envíos: {len(data['shipments'])}", styles['Normal']),
+        Spacer(1, 0.5 * cm),
+    ]
+    rows = [['#', 'Fecha', 'Destinatario', 'Dirección', 'Teléfono', 'Estado']]
+    cell = styles['BodyText']
+    for position, shipment in enumerate(data['shipments'], start=1):
+        rows.append([
+            str(position),
+            shipment['date'],
+            Paragraph(escape(shipment['recipient']), cell),
+            Paragraph(
+                escape(shipment['address'])
+                + (f"<br/><i>{escape(shipment['notes'])}</i>" if shipment['notes'] else ''),
+                cell,
+            ),
+            shipment['phone'],
+            shipment['status'],
+        ])
+    table = Table(rows, colWidths=[0.8 * cm, 2 * cm, 3.8 * cm, 6.2 * cm, 2.6 * cm, 2.4 * cm], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ]))
+    story.append(table)
+    document.build(story)
+    return buffer.getvalue()
+
+
+def render_manifest_to_file(data, path):
+    """Genera el PDF y lo escribe de forma atómica (archivo temporal + rename)."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as output:
+        output.write(render_manifest(data))
+    os.replace(tmp_path, path)
+    return path
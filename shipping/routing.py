@@ -0,0 +1,152 @@
+"""
+Orden de reparto de los envíos de cada chofer.
+
+- distance_matrix(): distancias haversine (km) entre todos los puntos en una
+  sola operación de NumPy.
+- optimize_route(): recorrido abierto que sale del local (STORE_LOCATION):
+  vecino más cercano como punto de partida y después 2-opt (invertir un tramo
+  cuando acorta el recorrido) hasta que ninguna inversión mejora.
+- update_routes(): guarda el orden en Shipment.route_position para los choferes pedidos.
+
+Los envíos sin coordenadas no entran en el cálculo: van al final en el orden
+de siempre (fecha, id).
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from .manifests import MANIFEST_STATUSES
+from .models import Shipment
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Mejora mínima (km) para aplicar una inversión: evita ciclos por redondeo
+MIN_GAIN = 1e-9
+
+
+def store_location():
+    """(lat, lng) del local, punto de partida de todos los recorridos."""
+    return tuple(settings.STORE_LOCATION)
+
+
+def distance_matrix(points):
+    """Matriz n×n de distancias haversine en km; `points` es una secuencia de (lat, lng)."""
+    coords = np.radians(np.asarray(points, dtype=float).reshape(-1, 2))
+    lat, lng = coords[:, 0], coords[:, 1]
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distances_from(origin, points):
+    """Distancia en km de `origin` a cada punto (vector)."""
+    if not len(points):
+        return np.empty(0)
+    return distance_matrix([origin, *points])[0, 1:]
+
+
+def route_length(route, dist):
+    """Largo (km) de un recorrido abierto: suma de los tramos consecutivos."""
+    route = np.asarray(route)
+    return float(dist[route[:-1], route[1:]].sum()) if len(route) > 1 else 0.0
+
+
+def nearest_neighbour(dist, start=0):
+    """Recorrido que siempre va al punto sin visitar más cercano. Devuelve los índices, empezando en `start`."""
+    n = len(dist)
+    route = np.empty(n, dtype=np.intp)
+    visited = np.zeros(n, dtype=bool)
+    current = start
+    for position in range(n):
+        route[position] = current
+        visited[current] = True
+        if position == n - 1:
+            break
+        candidates = np.where(visited, np.inf, dist[current])
+        current = int(candidates.argmin())
+    return route
+
+
+def two_opt(route, dist, max_iterations=None):
+    """
+    Mejora un recorrido abierto con 2-opt; el primer punto (el local) queda fijo.
+
+    Invertir route[i..j] cambia los tramos (a→b, c→d) por (a→c, b→d), con
+    a = route[i-1], b = route[i], c = route[j], d = route[j+1]. Las ganancias de
+    todos los pares (i, j) se calculan juntas como una matriz y se aplica la
+    mejor. Para el último punto no hay "d": se agrega un nodo final a distancia 0
+    de todos que nunca se mueve, así el mismo cálculo vale para el recorrido abierto.
+    """
+    route = np.array(route, dtype=np.intp)
+    n = len(route)
+    if n < 4:
+        return route
+    size = len(dist)
+    extended = np.zeros((size + 1, size + 1))
+    extended[:size, :size] = dist
+    # Tramos i-1..i con i = 1..n-1 y j..j+1 con j = 1..n-1 (j+1 puede ser el nodo final)
+    lower = np.tril(np.ones((n - 1, n - 1), dtype=bool))  # j <= i: no es una inversión válida
+    iterations = 0
+    while max_iterations is None or iterations < max_iterations:
+        path = np.append(route, size)
+        a, b = path[:-2], path[1:-1]  # a = route[i-1], b = route[i]
+        c, d = path[1:-1], path[2:]   # c = route[j], d = route[j+1]
+        gains = (
+            extended[a, b][:, None] + extended[c, d][None, :]
+            - extended[a[:, None], c[None, :]] - extended[b[:, None], d[None, :]]
+        )
+        gains[lower] = 0.0
+        best = int(gains.argmax())
+        i, j = divmod(best, n - 1)
+        if gains[i, j] <= MIN_GAIN:
+            break
+        # Índices de la matriz -> posiciones en el recorrido (i y j arrancan en 1)
+        route[i + 1:j + 2] = route[i + 1:j + 2][::-1]
+        iterations += 1
+    return route
+
+
+def optimize_route(points, origin=None, max_iterations=None):
+    """
+    Orden de visita de `points` [(lat, lng), ...] saliendo de `origin` (el local
+    por defecto). Devuelve (índices en `points` en orden de visita, km totales).
+    """
+    if not len(points):
+        return [], 0.0
+    dist = distance_matrix([origin or store_location(), *points])
+    route = two_opt(nearest_neighbour(dist), dist, max_iterations=max_iterations)
+    return [int(index) - 1 for index in route[1:]], route_length(route, dist)
+
+
+def update_routes(chofer_ids=None):
+    """
+    Recalcula route_position de los envíos pendientes de cada chofer (todos si
+    `chofer_ids` es None) y lo borra en los pendientes sin chofer.
+    Devuelve {chofer_id: km del recorrido}.
+    """
+    shipments = Shipment.objects.filter(status__in=MANIFEST_STATUSES, chofer__isnull=False)
+    if chofer_ids is not None:
+        shipments = shipments.filter(chofer_id__in=chofer_ids)
+    by_chofer = {}
+    for shipment in shipments.only('id', 'chofer_id', 'latitude', 'longitude', 'route_position'):
+        by_chofer.setdefault(shipment.chofer_id, []).append(shipment)
+
+    lengths, changed = {}, []
+    for chofer_id, pending in by_chofer.items():
+        located = [shipment for shipment in pending if shipment.latitude is not None and shipment.longitude is not None]
+        order, lengths[chofer_id] = optimize_route([(s.latitude, s.longitude) for s in located])
+        ordered = [located[index] for index in order]
+        ordered += [shipment for shipment in pending if shipment.latitude is None or shipment.longitude is None]
+        for position, shipment in enumerate(ordered, start=1):
+            if shipment.route_position != position:
+                shipment.route_position = position
+                changed.append(shipment)
+    with transaction.atomic():
+        Shipment.objects.bulk_update(changed, ['route_position'], batch_size=500)
+        # Los sin chofer se listan por distancia al local: no conservan un orden viejo
+        Shipment.objects.filter(
+            status__in=MANIFEST_STATUSES, chofer__isnull=True, route_position__isnull=False,
+        ).update(route_position=None)
+    return lengths
+
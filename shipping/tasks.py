@@ -0,0 +1,24 @@
+"""Tareas en segundo plano de envíos (ver jobs/queue.py)."""
+from jobs.queue import task
+from staff.models import Chofer
+
+from .geocoding import geocode_shipments
+from .manifests import MANIFEST_STATUSES, generate_manifests
+from .routing import update_routes
+
+
+@task(timeout=1800)
+def prepare_manifests(job):
+    """
+    Genera por adelantado las hojas de ruta de los choferes con envíos:
+    después la descarga (individual o ZIP) las sirve de la caché en disco.
+    Antes completa las coordenadas que falten y recalcula el orden de reparto.
+    """
+    job.set_progress(0, message="calculando recorridos")
+    geocode_shipments()
+    update_routes()
+    choferes = list(Chofer.objects.filter(activo=True, shipments__status__in=MANIFEST_STATUSES).distinct())
+    done = 0
+    for done, _ in enumerate(generate_manifests(choferes), start=1):
+        job.set_progress(done, len(choferes), message="hojas de ruta listas")
+    return {'manifests': done}
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import time
+from itertools import combinations
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from staff.models import Chofer
+
+from .manifests import MANIFEST_STALE_GRACE, _discard_stale, cache_dir
+from .models import Shipment
+from .pdf import render_manifest
+from .routing import distance_matrix, nearest_neighbour, optimize_route, route_length, two_opt, update_routes
+
+
+class UpdateRoutesTests(TestCase):
+
+    def test_unassigned_pending_shipments_lose_their_position(self):
+        pending = Shipment.objects.create(recipient='Ana', address='Calle 1', route_position=3)
+        delivered = Shipment.objects.create(
+            recipient='Luis', address='Calle 2', route_position=2, status=Shipment.Status.DELIVERED,
+        )
+
+        update_routes()
+
+        pending.refresh_from_db()
+        delivered.refresh_from_db()
+        self.assertIsNone(pending.route_position)
+        # Los ya entregados conservan el orden con el que se repartieron
+        self.assertEqual(delivered.route_position, 2)
+
+
+class RouteOptimizerTests(TestCase):
+
+    def test_distance_matrix_is_haversine_in_km(self):
+        dist = distance_matrix([(0, 0), (1, 0), (0, 1)])
+        self.assertTrue(np.allclose(dist, dist.T))
+        self.assertTrue(np.allclose(np.diag(dist), 0))
+        # Un grado sobre un meridiano o sobre el ecuador: ~111,2 km
+        self.assertAlmostEqual(dist[0, 1], 111.19, places=1)
+        self.assertAlmostEqual(dist[0, 2], 111.19, places=1)
+
+    def test_points_on_a_line_are_visited_in_order(self):
+        points = [(0, 0.3), (0, 0.1), (0, 0.4), (0, 0.2)]
+        order, km = optimize_route(points, origin=(0, 0))
+        self.assertEqual(order, [1, 3, 0, 2])
+        self.assertAlmostEqual(km, distance_matrix([(0, 0), (0, 0.4)])[0, 1])
+        self.assertEqual(optimize_route([], origin=(0, 0)), ([], 0.0))
+
+    def test_two_opt_leaves_no_improving_reversal(self):
+        points = np.random.default_rng(7).uniform(-0.1, 0.1, size=(12, 2))
+        dist = distance_matrix(points)
+        start = nearest_neighbour(dist)
+        self.assertEqual(sorted(start), list(range(12)))
+
+        route = two_opt(start, dist)
+
+        self.assertEqual(route[0], 0)
+        self.assertEqual(sorted(route), list(range(12)))
+        length = route_length(route, dist)
+        self.assertLessEqual(length, route_length(start, dist))
+        for i, j in combinations(range(1, 12), 2):
+            candidate = route.copy()
+            candidate[i:j + 1] = candidate[i:j + 1][::-1]
+            self.assertGreaterEqual(route_length(candidate, dist), length - 1e-9)
+
+    @override_settings(STORE_LOCATION=(0, 0))
+    def test_update_routes_puts_shipments_without_coordinates_last(self):
+        chofer = Chofer.objects.create(
+            nombre='Juan', apellido='Pérez', dni='1', email='juan@example.com', direccion='Calle', telefono='1',
+        )
+        far = Shipment.objects.create(recipient='A', address='Lejos', chofer=chofer, latitude=0, longitude=0.2)
+        unknown = Shipment.objects.create(recipient='B', address='Sin ubicar', chofer=chofer)
+        near = Shipment.objects.create(recipient='C', address='Cerca', chofer=chofer, latitude=0, longitude=0.1)
+
+        lengths = update_routes([chofer.pk])
+
+        self.assertAlmostEqual(lengths[chofer.pk], distance_matrix([(0, 0), (0, 0.2)])[0, 1])
+        positions = dict(Shipment.objects.values_list('pk', 'route_position'))
+        self.assertEqual([positions[s.pk] for s in (near, far, unknown)], [1, 2, 3])
+
+
+class ManifestCacheTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_override = override_settings(MANIFEST_CACHE_DIR=directory.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def test_recently_used_stale_pdfs_are_kept(self):
+        directory = cache_dir()
+        current = directory / 'chofer-1-nuevo.pdf'
+        recent, old = directory / 'chofer-1-reciente.pdf', directory / 'chofer-1-viejo.pdf'
+        for path in (current, recent, old):
+            path.write_bytes(b'%PDF')
+        expired = time.time() - MANIFEST_STALE_GRACE - 60
+        os.utime(old, (expired, expired))
+
+        _discard_stale(1, current)
+
+        self.assertEqual(sorted(path.name for path in directory.iterdir()), [current.name, recent.name])
+
+    def test_markup_in_user_data_is_escaped(self):
+        data = {
+            'chofer': {'id': 1, 'name': 'Ana & <Luis>', 'telefono': '</i> 11 & 22'},
+            'shipments': [{
+                'id': 1, 'date': '01/02/2026', 'recipient': 'R&B', 'address': 'Calle <1>',
+                'phone': '1', 'notes': '<b', 'status': 'Pendiente',
+            }],
+        }
+        self.assertTrue(render_manifest(data).startswith(b'%PDF'))
@@ -0,0 +1,15 @@
+from django.urls import path
+from . import views
+
+app_name = 'shipping'
+
+urlpatterns = [
+    path('', views.shipment_list, name='shipment_list'),
+    path('nuevo/', views.shipment_create, name='shipment_create'),
+    path('<int:pk>/editar/', views.shipment_edit, name='shipment_edit'),
+
+    # Hojas de ruta en PDF
+    path('choferes/<int:chofer_pk>/pdf/', views.manifest_pdf, name='manifest_pdf'),
+    path('choferes/pdf.zip', views.manifests_zip, name='manifests_zip'),
+    path('choferes/preparar/', views.prepare_manifests_view, name='prepare_manifests'),
+]
@@ -0,0 +1,135 @@
+from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.auth.decorators import login_required
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.text import slugify
+from django.views.decorators.http import require_POST
+from jobs.queue import enqueue
+from staff.models import Chofer
+from .forms import ShipmentForm
+from .geocoding import fill_coordinates
+from .manifests import MANIFEST_STATUSES, generate_manifests, zip_manifests
+from .models import Shipment
+from .routing import update_routes
+from .tasks import prepare_manifests
+
+
+def _manifest_filename(chofer):
+    # El id evita nombres repetidos en el ZIP cuando dos choferes se llaman igual
+    return f"envios-{slugify(str(chofer))}-{chofer.pk}-{timezone.localdate():%Y%m%d}.pdf"
+
+
+def _save_shipment(form, previous_chofer_id=None):
+    """
+    Guarda el envío con sus coordenadas (de la caché de direcciones) y, al
+    confirmar, recalcula el orden de reparto de los choferes afectados.
+    """
+    with transaction.atomic():
+        shipment = form.save(commit=False)
+        if shipment.chofer_id is None:
+            shipment.route_position = None
+        fill_coordinates([shipment])
+        shipment.save()
+        chofer_ids = {shipment.chofer_id, previous_chofer_id} - {None}
+        if chofer_ids:
+            transaction.on_commit(lambda: update_routes(chofer_ids))
+    return shipment
+
+
+@login_required
+def shipment_list(request):
+    """
+    Vista que lista los envíos pendientes y los choferes con su cantidad de envíos a repartir.
+    - Los envíos van por chofer en su orden de reparto; los sin asignar, del más
+      cercano al más lejano del local.
+    """
+    shipments = Shipment.objects.filter(status__in=MANIFEST_STATUSES).select_related('chofer').order_by(
+        F('chofer_id').asc(nulls_last=True),
+        F('route_position').asc(nulls_last=True),
+        F('store_distance').asc(nulls_last=True),
+        'scheduled_date', 'id',
+    )
+    choferes = Chofer.objects.filter(activo=True).annotate(
+        pending_count=Count('shipments', filter=Q(shipments__status__in=MANIFEST_STATUSES))
+    )
+    return render(request, 'shipping/shipment_list.html', {
+        'shipments': shipments,
+        'choferes': choferes,
+        'active_tab': 'shipments',
+    })
+
+
+@login_required
+def shipment_create(request):
+    if request.method == 'POST':
+        form = ShipmentForm(request.POST)
+        if form.is_valid():
+            _save_shipment(form)
+            messages.success(request, "Envío creado exitosamente.")
+            return redirect('shipping:shipment_list')
+    else:
+        form = ShipmentForm()
+    return render(request, 'shipping/shipment_form.html', {
+        'form': form,
+        'title': 'Nuevo Envío',
+        'active_tab': 'shipments',
+    })
+
+
+@login_required
+def shipment_edit(request, pk):
+    shipment = get_object_or_404(Shipment, pk=pk)
+    if request.method == 'POST':
+        form = ShipmentForm(request.POST, instance=shipment)
+        if form.is_valid():
+            _save_shipment(form, previous_chofer_id=shipment.chofer_id)
+            messages.success(request, "Envío actualizado exitosamente.")
+            return redirect('shipping:shipment_list')
+    else:
+        form = ShipmentForm(instance=shipment)
+    return render(request, 'shipping/shipment_form.html', {
+        'form': form,
+        'title': 'Editar Envío',
+        'active_tab': 'shipments',
+    })
+
+
+@login_required
+def manifest_pdf(request, chofer_pk):
+    """
+    Descarga la hoja de ruta en PDF de un chofer.
+    - Si sus envíos no cambiaron, el PDF se sirve desde la caché en disco.
+    """
+    chofer = get_object_or_404(Chofer, pk=chofer_pk)
+    (_, path), = generate_manifests([chofer])
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=_manifest_filename(chofer))
+
+
+@login_required
+def manifests_zip(request):
+    """
+    Descarga un ZIP con la hoja de ruta de todos los choferes activos con envíos.
+    - Los PDF se generan en paralelo y se agregan al ZIP a medida que están listos.
+    """
+    choferes = list(
+        Chofer.objects.filter(activo=True, shipments__status__in=MANIFEST_STATUSES).distinct()
+    )
+    names = {chofer.pk: _manifest_filename(chofer) for chofer in choferes}
+    response = StreamingHttpResponse(zip_manifests(choferes, names), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="envios-{timezone.localdate():%Y%m%d}.zip"'
+    return response
+
+
+@login_required
+@require_POST
+def prepare_manifests_view(request):
+    """
+    Encola la generación de todas las hojas de ruta (shipping.tasks.prepare_manifests):
+    las descargas posteriores salen de la caché sin esperar a que se armen los PDF.
+    """
+    job = enqueue(prepare_manifests, label="Preparar hojas de ruta", user=request.user)
+    messages.info(request, "Las hojas de ruta se están generando en segundo plano.")
+    return redirect('jobs:job_detail', pk=job.pk)
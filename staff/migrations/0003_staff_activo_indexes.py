@@ -0,0 +1,21 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0002_chofer_dni_vendedor_dni'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chofer',
+            index=models.Index(fields=['activo'], name='staff_chofer_activo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendedor',
+            index=models.Index(fields=['activo'], name='staff_vendedor_activo_idx'),
+        ),
+    ]
@@ -19,6 +19,10 @@ class BaseStaff(models.Model):
 
     class Meta:
         abstract = True # Indicamos que es un modelo abstracto
+        indexes = [
+            # Los listados separan activos de inactivos
+            models.Index(fields=['activo'], name='%(app_label)s_%(class)s_activo_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido}"